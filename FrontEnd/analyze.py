@@ -0,0 +1,125 @@
+# analyze.py
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+
+from data.log_analysis import load_columns, save_npz, summarize
+from data.log_reader import iter_events
+from data.time_index import RecordingIndex, index_path_for, build_index
+
+def print_summary(summary):
+    print(f"Samples: {summary['samples']}  Duration: {summary['duration']:.2f} s")
+
+    if "peak_chamber_pressure" in summary:
+        peak = summary["peak_chamber_pressure"]
+        print(f"Peak chamber pressure: {peak['value']:.1f} PSI at T+{peak['time']:.3f} s")
+        thrust = summary["max_thrust"]
+        print(f"Max thrust: {thrust['value']:.1f} N at T+{thrust['time']:.3f} s")
+
+    burn = summary.get("burn")
+    if burn:
+        print(f"Burn: T+{burn['start']:.3f} s to T+{burn['end']:.3f} s ({burn['duration']:.3f} s)")
+    else:
+        print("Burn: not detected")
+    if summary.get("total_impulse"):
+        print(f"Total impulse: {summary['total_impulse']:.1f} N*s")
+
+    print("\nValve events:")
+    for name, events in summary["valve_events"].items():
+        for t, state in events:
+            print(f"  T+{t:9.3f} s  {name.upper():6s} -> {'OPEN' if state else 'CLOSED'}")
+
+    print("\nChannels:")
+    print(f"  {'channel':16s} {'min':>12s} {'max':>12s} {'mean':>12s}")
+    for name, stats in summary["channels"].items():
+        print(f"  {name:16s} {stats['min']:12.2f} {stats['max']:12.2f} {stats['mean']:12.2f}")
+
+def print_rows_after_event(path, channel, seconds, count):
+    """Seek via the sidecar index and print rows after a channel opened"""
+    if not os.path.exists(index_path_for(path)):
+        print("No time index found, building one...")
+        build_index(path)
+    index = RecordingIndex(path)
+    rows = list(itertools.islice(index.rows_after_event(channel, seconds, state=1), count))
+    if not rows:
+        print(f"No {channel.upper()} open event found")
+        return
+    for row in rows:
+        print(",".join(row.values()))
+
+def format_event(event):
+    detail = " ".join(f"{key}={value}" for key, value in event["detail"].items())
+    return f"  T+{event['elapsed_time']:9.3f} s  {event['kind']:9s} {event['name']:14s} {detail}"
+
+def print_events(path):
+    """Print the commands, acks and operator actions logged with a recording"""
+    events = list(iter_events(path))
+    if not events:
+        print("No events recorded")
+        return
+    for event in events:
+        print(format_event(event))
+
+def print_timeline(path, start, end):
+    """Print telemetry rows and events between two elapsed times, merged in order"""
+    if not os.path.exists(index_path_for(path)):
+        print("No time index found, building one...")
+        build_index(path)
+    index = RecordingIndex(path)
+    for kind, item in index.timeline(start, end):
+        if kind == "event":
+            print(format_event(item))
+        else:
+            print(",".join(item.values()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Post-test analysis of recorded telemetry")
+    parser.add_argument("log", help="Recording to analyze (.csv, .manifest.json or .npz)")
+    parser.add_argument("--npz", help="Export column arrays to this .npz file")
+    parser.add_argument("--compress", action="store_true", help="Compress the .npz export")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--after-open", metavar="CHANNEL",
+                        help="Print rows after a valve opened, e.g. mpv_p (uses the time index)")
+    parser.add_argument("--offset", type=float, default=0.0, help="Seconds after the event (with --after-open)")
+    parser.add_argument("--rows", type=int, default=10, help="Rows to print (with --after-open)")
+    parser.add_argument("--events", action="store_true", help="Print the recorded commands, acks and operator actions")
+    parser.add_argument("--timeline", nargs=2, type=float, metavar=("START", "END"),
+                        help="Print rows and events between two elapsed times, in order")
+    args = parser.parse_args()
+
+    if args.events:
+        print_events(args.log)
+        return 0
+
+    if args.timeline:
+        print_timeline(args.log, *args.timeline)
+        return 0
+
+    if args.after_open:
+        print_rows_after_event(args.log, args.after_open, args.offset, args.rows)
+        return 0
+
+    start = time.perf_counter()
+    columns = load_columns(args.log)
+    load_time = time.perf_counter() - start
+
+    if not columns:
+        print("No telemetry rows found.")
+        return 1
+
+    if args.npz:
+        save_npz(columns, args.npz, compress=args.compress)
+
+    summary = summarize(columns)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"Loaded {args.log} in {load_time:.2f} s")
+        print_summary(summary)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,83 @@
+# command_bench.py
+import sys
+import time
+import argparse
+import threading
+
+from network.command_sender import CommandSender
+from simulator import RocketSimulator
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100.0))
+    return sorted_values[index]
+
+def run_clients(sender, clients, commands, timeout):
+    """Send commands from several threads at once; returns (results, seconds)."""
+    results = []
+    lock = threading.Lock()
+
+    def client(index):
+        local = []
+        for n in range(commands):
+            # Alternate a solenoid open/closed so the state really changes
+            ack = sender.send_command(0x01, 1 + index % 3, n % 2, timeout=timeout)
+            local.append(ack)
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the command path with concurrent CommandSenders")
+    parser.add_argument("--host", default=None, help="Target host; default starts a local simulator")
+    parser.add_argument("--port", type=int, default=5556)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent sending threads")
+    parser.add_argument("--commands", type=int, default=200, help="Commands per client")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Per-command timeout in seconds")
+    parser.add_argument("--command-latency", type=float, default=0.0, help="Local simulator ack delay, in ms")
+    parser.add_argument("--command-jitter", type=float, default=0.0, help="Local simulator ack jitter, in ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Local simulator failed-ack fraction")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Local simulator dropped-ack fraction")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    simulator = None
+    host, port = args.host, args.port
+    if host is None:
+        # Port 0 picks a free port for the in-process simulator
+        simulator = RocketSimulator(command_port=0,
+                                    command_latency=args.command_latency / 1000.0,
+                                    command_jitter=args.command_jitter / 1000.0,
+                                    failure_rate=args.failure_rate, drop_rate=args.drop_rate,
+                                    seed=args.seed, verbose=False)
+        host, port = "127.0.0.1", simulator.command_socket.getsockname()[1]
+
+    sender = CommandSender(host, port)
+    results, seconds = run_clients(sender, args.clients, args.commands, args.timeout)
+    if simulator:
+        simulator.stop()
+
+    acked = sorted(ack["rtt_ms"] for ack in results if "status_code" in ack)
+    ok = sum(1 for ack in results if ack["status"] == "OK")
+    timed_out = sum(1 for ack in results if ack.get("timed_out"))
+    print(f"{len(results)} commands from {args.clients} clients in {seconds:.2f} s "
+          f"({len(results) / seconds:.0f} commands/s)")
+    print(f"  ok={ok} acked_with_error={len(acked) - ok} timed_out={timed_out} "
+          f"other_errors={len(results) - len(acked) - timed_out}")
+    if acked:
+        print(f"  rtt ms: p50={percentile(acked, 50):.2f} p95={percentile(acked, 95):.2f} "
+              f"p99={percentile(acked, 99):.2f} max={acked[-1]:.2f}")
+    if simulator:
+        print(f"  simulator processed {simulator.commands_processed} commands")
+    return 0 if results else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,245 @@
+# data/checkpoint.py
+import os
+import json
+import time
+import zlib
+import struct
+from itertools import islice
+
+import numpy as np
+
+MAGIC = b"SEDSCKPT"
+VERSION = 1
+# Magic, version, layout JSON length; the layout follows, padded to LAYOUT_BYTES
+FILE_HEADER = struct.Struct("<8sII")
+LAYOUT_BYTES = 16384
+# Two alternating state slots, each: write sequence, JSON length, CRC32 of the JSON
+SLOT_HEADER = struct.Struct("<QII")
+SLOT_BYTES = 65536
+
+# Older checkpoints are from an earlier session, not a restart mid-test
+RESTORE_MAX_AGE = 600.0
+
+
+class StoreCheckpoint:
+    """Memory-mapped checkpoint of a DataStore's history and derived state.
+
+    The file mirrors the tiered history: the raw samples and each rollup
+    tier are fixed-size rings of float64 rows, tagged with the row's
+    index, the same length as the deques they copy. A write adds only the
+    rows appended since the last one, so its cost follows the data rate,
+    not the history size. Everything else (the partial rollup buckets,
+    performance state, packet counters and the latest sample) is small and
+    goes as JSON into one of two state slots, alternately, each with a
+    CRC; the slot names the row counts it covers. A write torn by a crash
+    leaves the other slot intact, and ring rows overwritten since then
+    fail their index check and are dropped.
+
+    Writes land in the page cache and survive the app crashing, which is
+    what this is for; recordings are the durable copy. The file is rebuilt
+    in full when the history's channels change.
+    """
+
+    def __init__(self, path, interval=1.0, max_age=RESTORE_MAX_AGE):
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self.map = None
+        self.layout = None
+        self.regions = {}  # name -> float64 view [row][column]
+        self.written = {}  # name -> rows written so far
+        self.sequence = 0
+        self.last_write = 0.0
+
+    def due(self, now):
+        return now - self.last_write >= self.interval
+
+    def layout_for(self, history):
+        channels = len(history.channel_names)
+        regions = [{"name": "raw", "capacity": history.raw.maxlen, "width": 2 + channels}]
+        for tier in history.tiers:
+            regions.append({"name": f"tier_{tier.bucket_seconds}", "seconds": tier.bucket_seconds,
+                            "capacity": tier.buckets.maxlen, "width": 3 + 3 * channels})
+        offset = FILE_HEADER.size + LAYOUT_BYTES + 2 * SLOT_BYTES
+        for region in regions:
+            region["offset"] = offset
+            offset += region["capacity"] * region["width"] * 8
+        return {"channels": history.channels, "regions": regions, "size": offset}
+
+    def sources(self, history):
+        # (region name, deque of rows, rows ever appended) in layout order
+        return [("raw", history.raw, history.appended)] + \
+               [(f"tier_{tier.bucket_seconds}", tier.buckets, tier.finalized) for tier in history.tiers]
+
+    def open_map(self, layout):
+        self.close()
+        self.map = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(layout["size"],))
+        self.layout = layout
+        self.regions = {}
+        for region in layout["regions"]:
+            start = region["offset"]
+            end = start + region["capacity"] * region["width"] * 8
+            self.regions[region["name"]] = self.map[start:end].view(np.float64).reshape(
+                region["capacity"], region["width"])
+
+    def create(self, history):
+        """Start a new file for the history's current layout; the next write fills it."""
+        self.close()
+        layout = self.layout_for(history)
+        encoded = json.dumps(layout).encode()
+        if len(encoded) > LAYOUT_BYTES:
+            raise ValueError("checkpoint layout too large")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(FILE_HEADER.pack(MAGIC, VERSION, len(encoded)) + encoded)
+            f.truncate(layout["size"])
+        self.open_map(layout)
+        # Everything still held counts as new
+        self.written = {name: appended - len(rows) for name, rows, appended in self.sources(history)}
+
+    def write(self, store, now=None):
+        """Append the store's new history rows and save its state. Receiver thread only."""
+        history = store.history
+        if not history.channel_names:
+            return
+        try:
+            if self.layout is None or self.layout["channels"] != history.channels:
+                self.create(history)
+            for name, rows, appended in self.sources(history):
+                self.write_rows(name, rows, appended)
+            self.sequence += 1
+            self.write_state(self.state(store))
+        except (OSError, ValueError) as e:
+            print(f"Error writing checkpoint {self.path}: {e}")
+            self.close()
+        self.last_write = time.time() if now is None else now
+
+    def write_rows(self, name, rows, appended):
+        count = min(appended - self.written[name], len(rows))
+        if count <= 0:
+            return
+        newest = list(islice(reversed(rows), count))[::-1]
+        if name == "raw":
+            values = [(t,) + sample for t, sample in newest]
+        else:
+            values = [(start, n) + mins + maxs + sums for start, n, mins, maxs, sums in newest]
+        region = self.regions[name]
+        indices = np.arange(appended - count, appended)
+        block = np.empty((count, region.shape[1]))
+        block[:, 0] = indices
+        block[:, 1:] = values
+        region[indices % len(region)] = block
+        self.written[name] = appended
+
+    def state(self, store):
+        sequence, telemetry, receive_time = store.snapshot()
+        return {
+            "time": time.time(),
+            "written": self.written,
+            "tiers": [{"bucket_start": tier.bucket_start, "count": tier.count, "sums": tier.sums,
+                       "mins": tier.mins, "maxs": tier.maxs} for tier in store.history.tiers],
+            "performance": store.performance.state(),
+            "packets_lost": store.packets_lost,
+            "last_packet_counter": store.last_packet_counter,
+            "latest": [sequence, telemetry, receive_time]
+        }
+
+    def write_state(self, state):
+        encoded = json.dumps(state).encode()
+        if len(encoded) > SLOT_BYTES - SLOT_HEADER.size:
+            raise ValueError("checkpoint state too large")
+        start = FILE_HEADER.size + LAYOUT_BYTES + (self.sequence % 2) * SLOT_BYTES
+        header = SLOT_HEADER.pack(self.sequence, len(encoded), zlib.crc32(encoded))
+        slot = self.map[start:start + SLOT_HEADER.size + len(encoded)]
+        # Body first: the header's sequence only becomes newest once its JSON is in place
+        slot[SLOT_HEADER.size:] = np.frombuffer(encoded, dtype=np.uint8)
+        slot[:SLOT_HEADER.size] = np.frombuffer(header, dtype=np.uint8)
+
+    def read_state(self):
+        """The newest intact state slot as (sequence, state), or (0, None)."""
+        best = (0, None)
+        for slot in range(2):
+            start = FILE_HEADER.size + LAYOUT_BYTES + slot * SLOT_BYTES
+            sequence, length, crc = SLOT_HEADER.unpack(self.map[start:start + SLOT_HEADER.size].tobytes())
+            if not sequence or length > SLOT_BYTES - SLOT_HEADER.size or sequence <= best[0]:
+                continue
+            encoded = self.map[start + SLOT_HEADER.size:start + SLOT_HEADER.size + length].tobytes()
+            if zlib.crc32(encoded) == crc:
+                best = (sequence, json.loads(encoded))
+        return best
+
+    def read_rows(self, name, written):
+        """Rows still intact in a region, oldest first, as lists without the index."""
+        region = self.regions[name]
+        indices = np.arange(max(written - len(region), 0), written)
+        rows = region[indices % len(region)]
+        return rows[rows[:, 0] == indices, 1:].tolist()
+
+    def restore(self, store):
+        """Load a recent checkpoint into a store that hasn't received anything yet.
+
+        Returns the number of raw samples restored; 0 if there was no
+        usable checkpoint, and then the next write starts a new file.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, length = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError("not a checkpoint file")
+                layout = json.loads(f.read(length))
+            if os.path.getsize(self.path) != layout["size"]:
+                raise ValueError("truncated")
+            self.open_map(layout)
+            sequence, state = self.read_state()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring checkpoint {self.path}: {e}")
+            self.close()
+            return 0
+
+        history = store.history
+        if state is None or time.time() - state["time"] > self.max_age or \
+                [(r["capacity"], r.get("seconds")) for r in layout["regions"]] != \
+                [(r["capacity"], r.get("seconds")) for r in self.layout_for(history)["regions"]]:
+            # Stale, or from a differently sized history
+            self.close()
+            return 0
+
+        history.set_channels(layout["channels"])
+        written = state["written"]
+        history.raw.extend((row[0], tuple(row[1:])) for row in self.read_rows("raw", written["raw"]))
+        history.appended = written["raw"]
+        channels = len(history.channel_names)
+        for tier, partial in zip(history.tiers, state["tiers"]):
+            for row in self.read_rows(f"tier_{tier.bucket_seconds}", written[f"tier_{tier.bucket_seconds}"]):
+                values = row[2:]
+                tier.buckets.append((row[0], int(row[1]), tuple(values[:channels]),
+                                     tuple(values[channels:2 * channels]), tuple(values[2 * channels:])))
+            tier.finalized = written[f"tier_{tier.bucket_seconds}"]
+            tier.bucket_start = partial["bucket_start"]
+            tier.count = partial["count"]
+            tier.sums = partial["sums"]
+            tier.mins = partial["mins"]
+            tier.maxs = partial["maxs"]
+
+        store.performance.restore(state["performance"])
+        store.packets_lost = state["packets_lost"]
+        store.last_packet_counter = state["last_packet_counter"]
+        latest_sequence, telemetry, receive_time = state["latest"]
+        if telemetry:
+            store.telemetry_history.append(telemetry)
+            store._snapshot = (latest_sequence, telemetry, receive_time)
+
+        self.written = dict(written)
+        self.sequence = sequence
+        return len(history.raw)
+
+    def close(self):
+        if self.map is not None:
+            self.map.flush()
+        self.map = None
+        self.layout = None
+        self.regions = {}
\ No newline at end of file
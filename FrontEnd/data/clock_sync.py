@@ -0,0 +1,138 @@
+# data/clock_sync.py
+import time
+from collections import deque
+
+# Counter widths the device clock can wrap at, in ms
+DEVICE_CLOCK_MODULI = (1 << 32,)
+
+
+class ClockAligner:
+    """Map the device's millisecond counter onto the ground clock.
+
+    The counter is unwrapped into a continuous device time. A backwards
+    jump of more than wrap_threshold_ms is a wrap: exact if it matches one
+    of DEVICE_CLOCK_MODULI, otherwise (a reboot, or a simulator wrapping at
+    some other period) the device time carries on from the ground clock.
+
+    Ground receive time is fitted against device time by exponentially
+    weighted least squares with a half-life in device seconds, giving
+    offset and drift. A packet's residual over the fit is its receive
+    delay up to a constant; the smallest residual in a recent window is the
+    fastest path, so residual minus that minimum is the packet's queuing
+    delay. One-way traffic can't reveal the constant part of the link
+    delay, so base_latency (e.g. half the command round trip) is added to
+    latency estimates and taken off measurement times.
+    """
+
+    def __init__(self, half_life=300.0, window=1000, wrap_threshold_ms=1000, base_latency=0.0):
+        self.half_life = half_life
+        self.window = window
+        self.wrap_threshold_ms = wrap_threshold_ms
+        self.base_latency = base_latency
+        # Fixed once, so corrected wall times from one aligner share a timeline
+        self.wall_offset = time.time() - time.monotonic()
+        self.reset()
+
+    def reset(self):
+        self.last_raw = None
+        self.last_ground = None
+        self.wrap_offset = 0
+        self.wraps = 0
+        self.count = 0
+        # The fit is centred on the first sample to keep the sums small
+        self.origin = None
+        self.last_x = None
+        self.weight = 0.0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxx = 0.0
+        self.cxy = 0.0
+        self.slope = 1.0
+        # (sample number, residual), increasing residuals: a sliding-window minimum
+        self.minima = deque()
+        self.latency = None
+        self.jitter = 0.0
+        self.last_transit = None
+
+    def unwrap(self, device_ms, ground):
+        """Return the continuous device time in ms for a raw counter value."""
+        if self.last_raw is not None and device_ms < self.last_raw - self.wrap_threshold_ms:
+            previous = self.last_raw + self.wrap_offset
+            expected = previous + (ground - self.last_ground) * 1000.0 / self.slope
+            estimate = int(round(expected)) - device_ms
+            for modulus in DEVICE_CLOCK_MODULI:
+                if abs(estimate - (self.wrap_offset + modulus)) <= self.wrap_threshold_ms:
+                    estimate = self.wrap_offset + modulus
+                    break
+            self.wrap_offset = estimate
+            self.wraps += 1
+        self.last_raw = device_ms
+        self.last_ground = ground
+        return device_ms + self.wrap_offset
+
+    def update(self, device_ms, ground=None):
+        """Add one packet's device timestamp and ground monotonic receive time.
+
+        Returns (unwrapped device ms, estimated wall time of measurement).
+        """
+        if ground is None:
+            ground = time.monotonic()
+        device_ms = self.unwrap(device_ms, ground)
+        if self.origin is None:
+            self.origin = (device_ms / 1000.0, ground)
+        x = device_ms / 1000.0 - self.origin[0]
+        y = ground - self.origin[1]
+
+        # Weighted incremental update of means and co-moments; old samples
+        # fade with device time, not sample count, so the rate doesn't matter
+        decay = 0.5 ** (max(x - self.last_x, 0.0) / self.half_life) if self.last_x is not None else 0.0
+        self.last_x = x
+        self.weight = self.weight * decay + 1.0
+        dx = x - self.mean_x
+        self.mean_x += dx / self.weight
+        self.mean_y += (y - self.mean_y) / self.weight
+        self.cxx = self.cxx * decay + dx * (x - self.mean_x)
+        self.cxy = self.cxy * decay + dx * (y - self.mean_y)
+        if self.cxx > 1e-9:
+            self.slope = self.cxy / self.cxx
+        self.count += 1
+
+        residual = y - self.predict(x)
+        while self.minima and self.minima[-1][1] >= residual:
+            self.minima.pop()
+        self.minima.append((self.count, residual))
+        while self.minima[0][0] <= self.count - self.window:
+            self.minima.popleft()
+        fastest = self.minima[0][1]
+        self.latency = residual - fastest + self.base_latency
+
+        # RFC 3550 interarrival jitter on the transit time
+        transit = y - x
+        if self.last_transit is not None:
+            self.jitter += (abs(transit - self.last_transit) - self.jitter) / 16.0
+        self.last_transit = transit
+
+        measured = self.predict(x) + fastest - self.base_latency
+        return device_ms, measured + self.origin[1] + self.wall_offset
+
+    def predict(self, x):
+        # Ground time (relative to the origin) of a zero-residual packet sent at device time x
+        return self.mean_y + self.slope * (x - self.mean_x)
+
+    def stats(self):
+        """Current estimates in ms and ppm, or None before the first packet."""
+        if self.origin is None:
+            return None
+        x = self.last_x
+        # Wall clock minus device clock at the latest packet
+        offset = self.predict(x) + self.minima[0][1] - self.base_latency + self.origin[1] + self.wall_offset \
+            - (x + self.origin[0])
+        return {
+            "offset_ms": offset * 1000.0,
+            # How fast the device clock runs against the ground clock
+            "drift_ppm": (1.0 / self.slope - 1.0) * 1e6,
+            "latency_ms": self.latency * 1000.0,
+            "jitter_ms": self.jitter * 1000.0,
+            "wraps": self.wraps,
+            "samples": self.count
+        }
\ No newline at end of file
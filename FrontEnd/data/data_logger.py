@@ -1,128 +1,467 @@
-import os
-import time
-import csv
-import threading
-from datetime import datetime
-
-class DataLogger:
-    def __init__(self, log_directory="logs"):
-        self.log_directory = log_directory
-        self.recording = False
-        self.log_file = None
-        self.csv_writer = None
-        self.lock = threading.Lock()
-        
-        # Create logs directory if it doesn't exist
-        if not os.path.exists(log_directory):
-            os.makedirs(log_directory)
-    
-    def start_recording(self):
-        """Start recording telemetry data to a CSV file."""
-        with self.lock:
-            if self.recording:
-                return False  # Already recording
-            
-            # Create a timestamp-based filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"rocket_telemetry_{timestamp}.csv"
-            filepath = os.path.join(self.log_directory, filename)
-            
-            try:
-                self.log_file = open(filepath, 'w', newline='')
-                self.csv_writer = csv.writer(self.log_file)
-                
-                # Write header row with column names
-                header = [
-                    "timestamp", "elapsed_time",
-                    # Pressure sensors
-                    "pt_o1_3", "pt_o2_2", "pt_p1_6", "pt_f2_4", "pt_f1_5", "pt_f2_4_engine",
-                    # Load cells
-                    "lc_1", "lc_2", "lc_3", "lc_4",
-                    # Temperature
-                    "tc_1",
-                    # Valve states
-                    "rvv_o", "mpv_p", "rvv_f",
-                    # Servo positions
-                    "dot_oxidizer", "mpf_f", "oxidizer_engine",
-                    # System status
-                    "armed", "error"
-                ]
-                self.csv_writer.writerow(header)
-                self.recording = True
-                self.start_time = time.time()
-                return True
-            except Exception as e:
-                print(f"Error starting recording: {e}")
-                if self.log_file:
-                    self.log_file.close()
-                    self.log_file = None
-                return False
-    
-    def stop_recording(self):
-        """Stop recording and close the file."""
-        with self.lock:
-            if not self.recording:
-                return False  # Not recording
-            
-            try:
-                if self.log_file:
-                    self.log_file.close()
-                self.log_file = None
-                self.csv_writer = None
-                self.recording = False
-                return True
-            except Exception as e:
-                print(f"Error stopping recording: {e}")
-                return False
-    
-    def log_telemetry(self, telemetry):
-        """Write a telemetry data point to the CSV file."""
-        with self.lock:
-            if not self.recording or not self.csv_writer:
-                return False
-            
-            try:
-                # Get current timestamp and calculate elapsed time
-                current_time = time.time()
-                elapsed_time = current_time - self.start_time
-                
-                # Extract values from telemetry dictionary
-                row = [
-                    int(current_time * 1000),  # millisecond timestamp
-                    elapsed_time,
-                    # Pressure values
-                    telemetry["pressure"]["pt_o1_3"],
-                    telemetry["pressure"]["pt_o2_2"],
-                    telemetry["pressure"]["pt_p1_6"],
-                    telemetry["pressure"]["pt_f2_4"],
-                    telemetry["pressure"]["pt_f1_5"],
-                    telemetry["pressure"]["pt_f2_4_engine"],
-                    # Load cell values
-                    telemetry["load_cells"]["lc_1"],
-                    telemetry["load_cells"]["lc_2"],
-                    telemetry["load_cells"]["lc_3"],
-                    telemetry["load_cells"]["lc_4"],
-                    # Temperature
-                    telemetry["temperature"]["tc_1"],
-                    # Valve states
-                    int(telemetry["solenoid_states"]["rvv_o"]),
-                    int(telemetry["solenoid_states"]["mpv_p"]),
-                    int(telemetry["solenoid_states"]["rvv_f"]),
-                    # Servo positions
-                    telemetry["servo_positions"]["dot_oxidizer"],
-                    telemetry["servo_positions"]["mpf_f"],
-                    telemetry["servo_positions"]["oxidizer_engine"],
-                    # System status
-                    int(telemetry["system_status"]["armed"]),
-                    int(telemetry["system_status"]["error"])
-                ]
-                
-                self.csv_writer.writerow(row)
-                return True
-            except Exception as e:
-                print(f"Error logging telemetry: {e}")
-                return False
-    
-    def is_recording(self):
-        """Return whether recording is active."""
-        return self.recording
\ No newline at end of file
+import os
+import time
+import csv
+import json
+import gzip
+import lzma
+import queue
+import threading
+from datetime import datetime
+
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+# Column names written at the top of every CSV segment; the sensor
+# columns come from the telemetry schema. timestamp is the ground write
+# time, device_ms the unwrapped device clock and measured_timestamp the
+# ground time the device sampled the row at (all in ms)
+CSV_HEADER = ["timestamp", "elapsed_time", "device_ms", "measured_timestamp"] + TELEMETRY_SCHEMA.log_header
+
+# Running engine performance from data.performance, after the sensor columns
+DERIVED_COLUMNS = ["thrust_n", "total_impulse_ns", "mass_flow_kg_s", "burn_phase"]
+CSV_HEADER += DERIVED_COLUMNS
+
+# Discrete columns whose changes are recorded as events in the time index
+EVENT_COLUMNS = [name for _, name, flag in TELEMETRY_SCHEMA.log_columns if flag]
+
+# Columns of the sidecar time index; "point" rows are written every
+# index_interval rows, "event" rows whenever an EVENT_COLUMNS value changes
+INDEX_HEADER = ["kind", "timestamp", "elapsed_time", "segment", "offset", "channel", "state"]
+
+# Columns of the sidecar event log: commands, acks and operator actions on
+# the telemetry clock. segment/offset locate the next telemetry row written
+# after the event, and detail is a JSON object (or empty)
+EVENT_LOG_HEADER = ["timestamp", "elapsed_time", "segment", "offset", "kind", "name", "detail"]
+
+# Supported segment compression: name -> (file extension, opener)
+COMPRESSORS = {
+    "gzip": (".gz", gzip.open),
+    "lzma": (".xz", lzma.open)
+}
+
+# A compressed segment is a series of independent streams (gzip members,
+# xz streams), a new one every RESTART_BYTES of CSV; the manifest lists
+# where each starts so a seek decompresses at most this much
+RESTART_BYTES = 256 * 1024
+
+def write_manifest(path, manifest, durable=False):
+    """Write a session manifest atomically so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def fsync_path(path):
+    """fsync a file that is not open."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class DataLogger:
+    def __init__(self, log_directory="logs", rotate_bytes=64 * 1024 * 1024,
+                 rotate_seconds=None, compression="gzip", index_interval=100, source_name=None,
+                 sync_interval=None, sync_rows=None):
+        self.log_directory = log_directory
+        self.source_name = source_name
+        self.recording = False
+        self.log_file = None
+        self.csv_writer = None
+        self.lock = threading.Lock()
+
+        # Segment rotation and compression settings (None disables each)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.compression = compression
+
+        # Sidecar time index: one seek point every index_interval rows
+        self.index_interval = index_interval
+        self.index_file = None
+        self.index_writer = None
+        self.events_file = None
+        self.events_writer = None
+        self.event_positions = [CSV_HEADER.index(name) for name in EVENT_COLUMNS]
+        self.last_event_values = None
+
+        # Durability mode (group commit): a background thread flushes and
+        # fsyncs the open files every sync_interval seconds, or sooner once
+        # sync_rows rows are pending. A crash loses at most the rows written
+        # since the last completed sync; see loss_bound(). None disables each.
+        self.sync_interval = sync_interval
+        self.sync_rows = sync_rows
+        self.durable = bool(sync_interval or sync_rows)
+        self.sync_requested = threading.Event()
+        self.sync_stop = None
+        self.rows_written = 0
+        self.durable_rows = 0
+        self.syncs = 0
+        self.last_sync_time = None
+        self.max_sync_seconds = 0.0
+
+        # Session state
+        self.session_name = None
+        self.manifest_path = None
+        self.manifest = None
+        self.manifest_lock = threading.Lock()
+        self.segment_index = 0
+        self.segment_rows = 0
+        self.segment_start_time = 0
+
+        # Finished segments are compressed on a background thread
+        self.compress_queue = queue.Queue()
+        self.compress_thread = None
+
+        # Create logs directory if it doesn't exist
+        if not os.path.exists(log_directory):
+            os.makedirs(log_directory)
+
+    def start_recording(self):
+        """Start recording telemetry data to a segmented CSV session."""
+        with self.lock:
+            if self.recording:
+                return False  # Already recording
+
+            # Create a timestamp-based session name
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if self.source_name:
+                self.session_name = f"rocket_telemetry_{self.source_name}_{timestamp}"
+            else:
+                self.session_name = f"rocket_telemetry_{timestamp}"
+            self.manifest_path = os.path.join(self.log_directory, f"{self.session_name}.manifest.json")
+            index_name = f"{self.session_name}.index.csv"
+            events_name = f"{self.session_name}.events.csv"
+            self.manifest = {
+                "session": self.session_name,
+                "columns": CSV_HEADER,
+                "index": index_name,
+                "events": events_name,
+                "compression": self.compression,
+                "rotate_bytes": self.rotate_bytes,
+                "rotate_seconds": self.rotate_seconds,
+                "durability": {"sync_interval": self.sync_interval, "sync_rows": self.sync_rows}
+                              if self.durable else None,
+                "complete": False,
+                "segments": []
+            }
+            self.segment_index = 0
+
+            try:
+                self.index_file = open(os.path.join(self.log_directory, index_name), 'w', newline='')
+                self.index_writer = csv.writer(self.index_file)
+                self.index_writer.writerow(INDEX_HEADER)
+                self.last_event_values = None
+                self.events_file = open(os.path.join(self.log_directory, events_name), 'w', newline='')
+                self.events_writer = csv.writer(self.events_file)
+                self.events_writer.writerow(EVENT_LOG_HEADER)
+
+                self.start_time = time.time()
+                self.rows_written = 0
+                self.durable_rows = 0
+                self._open_segment()
+                self.recording = True
+                self._write_event(self.start_time, "recording", "start")
+                if self.durable:
+                    self._start_sync_thread()
+                return True
+            except Exception as e:
+                print(f"Error starting recording: {e}")
+                if self.log_file:
+                    self.log_file.close()
+                    self.log_file = None
+                if self.index_file:
+                    self.index_file.close()
+                    self.index_file = None
+                if self.events_file:
+                    self.events_file.close()
+                    self.events_file = None
+                return False
+
+    def stop_recording(self):
+        """Stop recording and close the file."""
+        with self.lock:
+            if not self.recording:
+                return False  # Not recording
+
+            try:
+                if self.sync_stop:
+                    self.sync_stop.set()
+                    self.sync_requested.set()
+                self._write_event(time.time(), "recording", "stop")
+                self._close_segment()
+                if self.index_file:
+                    self.index_file.close()
+                self.index_file = None
+                self.index_writer = None
+                if self.events_file:
+                    self.events_file.close()
+                self.events_file = None
+                self.events_writer = None
+                with self.manifest_lock:
+                    self.manifest["complete"] = True
+                    self._write_manifest()
+                self.recording = False
+                return True
+            except Exception as e:
+                print(f"Error stopping recording: {e}")
+                return False
+
+    def log_telemetry(self, telemetry, device_ms=None, measured_time=None, derived=None):
+        """Write a telemetry data point to the CSV file.
+        
+        device_ms and measured_time (epoch seconds) come from a ClockAligner;
+        without one the raw device counter and the write time are logged.
+        derived holds the DERIVED_COLUMNS values; missing ones are logged as 0.
+        """
+        with self.lock:
+            if not self.recording or not self.csv_writer:
+                return False
+
+            try:
+                # Get current timestamp and calculate elapsed time
+                current_time = time.time()
+                elapsed_time = current_time - self.start_time
+
+                # Extract values from telemetry dictionary (columns follow the schema)
+                row = [int(current_time * 1000), elapsed_time]  # millisecond timestamp
+                row.append(telemetry["timestamp"] if device_ms is None else device_ms)
+                row.append(round((current_time if measured_time is None else measured_time) * 1000, 2))
+                row += TELEMETRY_SCHEMA.log_row(telemetry)
+                derived = derived or {}
+                row += [round(derived.get(name, 0), 3) for name in DERIVED_COLUMNS]
+
+                self._index_row(row)
+                self.csv_writer.writerow(row)
+                self.segment_rows += 1
+                if self.segment_rows == 1:
+                    self.segment_first_timestamp = row[0]
+                self.segment_last_timestamp = row[0]
+                self.rows_written += 1
+                if self.sync_rows and self.rows_written % self.sync_rows == 0:
+                    self.sync_requested.set()
+
+                if self._should_rotate(current_time):
+                    self._close_segment()
+                    self._open_segment()
+                return True
+            except Exception as e:
+                print(f"Error logging telemetry: {e}")
+                return False
+
+    def log_event(self, kind, name, detail=None, event_time=None):
+        """Record a command, ack or operator action on the telemetry clock.
+        
+        detail is an optional dict of JSON-serializable values. event_time
+        is when it happened, if not now (e.g. relayed from another process).
+        """
+        with self.lock:
+            if not self.recording or not self.events_writer:
+                return False
+            
+            try:
+                self._write_event(event_time or time.time(), kind, name, detail)
+                return True
+            except Exception as e:
+                print(f"Error logging event: {e}")
+                return False
+    
+    def is_recording(self):
+        """Return whether recording is active."""
+        return self.recording
+
+    def sync(self):
+        """Flush and fsync everything logged so far; returns the rows now on disk."""
+        return self._sync(None)
+
+    def loss_bound(self):
+        """Worst case a crash can lose right now, as {"seconds", "rows"}, or None if not durable.
+
+        Rows are durable once a sync completes, so the window is one sync
+        interval plus the slowest fsync seen. With a rows trigger it is
+        sync_rows plus whatever arrives during one fsync, since the rows
+        keep being logged while it runs. Either bound may be None when
+        only the other is set.
+        """
+        if not self.durable:
+            return None
+        seconds = self.sync_interval + self.max_sync_seconds if self.sync_interval else None
+        return {"seconds": seconds, "rows": self.sync_rows}
+
+    def _start_sync_thread(self):
+        # Caller must hold self.lock; each session gets its own stop flag so
+        # a thread left over from the previous session can never sync this one
+        self.sync_stop = threading.Event()
+        self.sync_requested.clear()
+        threading.Thread(target=self._sync_worker, args=(self.sync_stop,), daemon=True).start()
+
+    def _sync_worker(self, stop):
+        while not stop.is_set():
+            self.sync_requested.wait(self.sync_interval)
+            self.sync_requested.clear()
+            try:
+                self._sync(stop)
+            except Exception as e:
+                print(f"Error syncing recording: {e}")
+
+    def _sync(self, stop):
+        with self.lock:
+            if not self.recording or (stop is not None and stop.is_set()):
+                return self.durable_rows
+            started = time.perf_counter()
+            files = [f for f in (self.log_file, self.index_file, self.events_file) if f]
+            for f in files:
+                f.flush()
+            # fsync duplicates outside the lock so logging carries on meanwhile
+            # and a rotation can close the originals
+            fds = [os.dup(f.fileno()) for f in files]
+            rows = self.rows_written
+        try:
+            for fd in fds:
+                os.fsync(fd)
+        finally:
+            for fd in fds:
+                os.close(fd)
+        self.durable_rows = max(self.durable_rows, rows)
+        self.syncs += 1
+        self.last_sync_time = time.time()
+        self.max_sync_seconds = max(self.max_sync_seconds, time.perf_counter() - started)
+        return rows
+
+    def wait_for_compression(self, timeout=None):
+        """Block until every finished segment has been compressed."""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.compress_queue.unfinished_tasks:
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _should_rotate(self, current_time):
+        if self.rotate_seconds and current_time - self.segment_start_time >= self.rotate_seconds:
+            return True
+        # Checking the file position is cheap but not free, so only do it periodically
+        if self.rotate_bytes and self.segment_rows % 256 == 0:
+            return self.log_file.tell() >= self.rotate_bytes
+        return False
+
+    def _write_event(self, current_time, kind, name, detail=None):
+        # Caller must hold self.lock; the offset is where the next row will start
+        offset = self.log_file.tell() if self.log_file else 0
+        self.events_writer.writerow([int(current_time * 1000), current_time - self.start_time,
+                                     self.segment_index, offset, kind, name,
+                                     json.dumps(detail, separators=(",", ":")) if detail else ""])
+
+    def _index_row(self, row):
+        # Caller must hold self.lock; called before the row is written so
+        # the recorded offset points at the start of the row
+        offset = None
+        if self.segment_rows % self.index_interval == 0:
+            offset = self.log_file.tell()
+            self.index_writer.writerow(["point", row[0], row[1], self.segment_index, offset, "", ""])
+
+        values = [row[i] for i in self.event_positions]
+        if self.last_event_values is not None and values != self.last_event_values:
+            if offset is None:
+                offset = self.log_file.tell()
+            for name, old, new in zip(EVENT_COLUMNS, self.last_event_values, values):
+                if old != new:
+                    self.index_writer.writerow(["event", row[0], row[1], self.segment_index, offset, name, new])
+        self.last_event_values = values
+
+    def _open_segment(self):
+        # Caller must hold self.lock
+        self.segment_index += 1
+        filename = f"{self.session_name}_{self.segment_index:03d}.csv"
+        self.segment_path = os.path.join(self.log_directory, filename)
+        self.log_file = open(self.segment_path, 'w', newline='')
+        self.csv_writer = csv.writer(self.log_file)
+
+        # Every segment carries its own header so it can be read on its own
+        self.csv_writer.writerow(CSV_HEADER)
+        self.segment_rows = 0
+        self.segment_first_timestamp = None
+        self.segment_last_timestamp = None
+        self.segment_start_time = time.time()
+
+        with self.manifest_lock:
+            self.manifest["segments"].append({
+                "file": filename,
+                "rows": 0,
+                "first_timestamp": None,
+                "last_timestamp": None,
+                "compressed": False
+            })
+            self._write_manifest()
+
+    def _close_segment(self):
+        # Caller must hold self.lock
+        if not self.log_file:
+            return
+        files = (self.log_file, self.index_file, self.events_file)
+        for f in files:
+            f.flush()
+        if self.durable:
+            # A finished segment is always fully on disk before the manifest says so
+            for f in files:
+                os.fsync(f.fileno())
+            self.durable_rows = self.rows_written
+        self.log_file.close()
+        self.log_file = None
+        self.csv_writer = None
+
+        with self.manifest_lock:
+            entry = self.manifest["segments"][-1]
+            entry["rows"] = self.segment_rows
+            entry["first_timestamp"] = self.segment_first_timestamp
+            entry["last_timestamp"] = self.segment_last_timestamp
+            self._write_manifest()
+
+        if self.compression:
+            self._start_compressor()
+            self.compress_queue.put((self.manifest_path, self.manifest, entry))
+
+    def _write_manifest(self):
+        # Caller must hold self.manifest_lock
+        write_manifest(self.manifest_path, self.manifest, self.durable)
+
+    def _start_compressor(self):
+        if self.compress_thread is None or not self.compress_thread.is_alive():
+            self.compress_thread = threading.Thread(target=self._compress_worker, daemon=True)
+            self.compress_thread.start()
+
+    def _compress_worker(self):
+        while True:
+            manifest_path, manifest, entry = self.compress_queue.get()
+            try:
+                extension, opener = COMPRESSORS[manifest["compression"]]
+                directory = os.path.dirname(manifest_path)
+                source = os.path.join(directory, entry["file"])
+                target = source + extension
+
+                # One stream per block, noting [CSV offset, compressed offset] of each
+                restarts = []
+                with open(source, 'rb') as src, open(target, 'wb') as dst:
+                    offset = 0
+                    for block in iter(lambda: src.read(RESTART_BYTES), b""):
+                        restarts.append([offset, dst.tell()])
+                        with opener(dst, 'wb') as stream:
+                            stream.write(block)
+                        offset += len(block)
+                if self.durable:
+                    # Never remove the plain segment before its replacement is on disk
+                    fsync_path(target)
+
+                with self.manifest_lock:
+                    entry["file"] = os.path.basename(target)
+                    entry["compressed"] = True
+                    entry["restarts"] = restarts
+                    write_manifest(manifest_path, manifest, self.durable)
+                os.remove(source)
+            except Exception as e:
+                print(f"Error compressing segment {entry['file']}: {e}")
+            finally:
+                self.compress_queue.task_done()
\ No newline at end of file
@@ -1,41 +1,233 @@
-# data/data_store.py
-import time
-from collections import deque
-from data.data_logger import DataLogger
-
-class DataStore:
-    def __init__(self, history_length=100):
-        self.latest_telemetry = None
-        self.history_length = history_length
-        self.telemetry_history = deque(maxlen=history_length)
-        self.connected = False
-        self.last_update_time = 0
-        self.data_logger = DataLogger()
-        
-    def update_telemetry(self, telemetry):
-        self.latest_telemetry = telemetry
-        self.telemetry_history.append(telemetry)
-        self.last_update_time = time.time()
-        self.connected = True
-        
-        # Log telemetry if recording is active
-        if self.data_logger.is_recording():
-            self.data_logger.log_telemetry(telemetry)
-    
-    def start_recording(self):
-        """Start recording telemetry data."""
-        return self.data_logger.start_recording()
-    
-    def stop_recording(self):
-        """Stop recording telemetry data."""
-        return self.data_logger.stop_recording()
-    
-    def is_recording(self):
-        """Check if recording is active."""
-        return self.data_logger.is_recording()
-    
-    def check_connection(self, timeout=2.0):
-        # If no telemetry for 2 seconds, consider disconnected
-        if time.time() - self.last_update_time > timeout:
-            self.connected = False
-        return self.connected
\ No newline at end of file
+# data/data_store.py
+import time
+import threading
+from collections import deque
+from data.data_logger import DataLogger
+from data.history_store import TieredHistory, HISTORY_CHANNELS
+from data.spsc_ring import SPSCRing
+from data.clock_sync import ClockAligner
+from data.spectral import SpectralMonitor
+from data.performance import PerformanceCalculator
+
+class DataStore:
+    """Latest telemetry and history for one source.
+
+    The receiver thread is the only writer. Readers on other threads get a
+    consistent view through snapshot(), which returns one immutable tuple
+    swapped in with a single assignment, and the UI drains every new sample
+    through consume_samples(). Neither side takes a lock, so the receiver
+    never waits on the UI.
+
+    Consumers register the channels they read with subscribe(), and only
+    subscribed work is done per sample: the long-term history keeps just
+    the channels someone reads back, samples go to the ring only when
+    someone consumes them (decimated to the fastest rate asked for), and
+    the spectral monitor runs only while its outputs are subscribed. Every
+    channel is still logged when recording.
+    
+    With a checkpoint (data.checkpoint.StoreCheckpoint) the history and
+    derived state are saved every checkpoint.interval seconds, and a recent
+    checkpoint is restored on creation, so a restarted app picks up where
+    it left off.
+    
+    With performance_events=False burn phase changes are not logged; a
+    store fed from the shared bus leaves that to the ingest process, which
+    computes the same events from the same samples.
+    """
+    
+    def __init__(self, history_length=100, name=None, data_logger=None, ring_capacity=4096, checkpoint=None,
+                 performance_events=True):
+        self.name = name
+        self.history_length = history_length
+        self.telemetry_history = deque(maxlen=history_length)
+        self.data_logger = data_logger or DataLogger(source_name=name)
+        
+        # Link quality, from gaps in the 16-bit packet counter
+        self.packets_lost = 0
+        self.last_packet_counter = None
+        
+        # Whole-session history with fixed memory per tier, of subscribed channels
+        self.history = TieredHistory(channels={})
+        
+        # Device clock -> ground clock, for measurement times and link latency
+        self.clock = ClockAligner()
+        
+        # Pressure spectra for instability monitoring; frames go to the
+        # waterfall, peak frequencies and amplitudes become derived channels
+        self.spectral = SpectralMonitor()
+        
+        # Thrust, total impulse and propellant flow; burn phase changes go
+        # to the recording's event log
+        self.performance = PerformanceCalculator(event_sink=self.log_event if performance_events else None)
+        
+        # (sequence, telemetry, receive time), replaced as a whole on every update
+        self._snapshot = (0, None, 0)
+        # Receiver -> UI handoff of every sample, not just the latest
+        self.samples = SPSCRing(ring_capacity)
+        
+        # consumer -> (channel names, reads history, samples per second or None for all)
+        self.subscriptions = {}
+        self.subscription_lock = threading.Lock()
+        # What the receiver does per sample, rebuilt on every subscription
+        # change and applied by the receiver thread itself:
+        # (history channels by group, publish samples, min device ms between samples, run spectral)
+        self._plan = ({}, False, 0.0, False)
+        self._applied_plan = None
+        self.last_published = None
+        
+        self.checkpoint = checkpoint
+        if checkpoint:
+            restored = checkpoint.restore(self)
+            if restored:
+                print(f"Restored {restored} samples for {name} from {checkpoint.path}")
+        
+    def update_telemetry(self, telemetry):
+        self.track_packet_loss(telemetry["packet_counter"])
+        update_time = time.time()
+        device_ms, measured_time = self.clock.update(telemetry["timestamp"])
+        plan = self._plan
+        if plan is not self._applied_plan:
+            self.apply_plan(plan)
+        history_channels, publish, interval, spectral = plan
+        self.performance.update(telemetry, device_ms)
+        if spectral:
+            self.spectral.add(telemetry, device_ms)
+        self.telemetry_history.append(telemetry)
+        if history_channels:
+            self.history.append(update_time, telemetry)
+        # Decimated on the device clock, the samples' own timebase
+        if publish and (self.last_published is None or device_ms - self.last_published >= interval):
+            self.samples.publish((update_time, telemetry, measured_time))
+            self.last_published = device_ms
+        # Publish the new state last so readers never see it half updated
+        self._snapshot = (self._snapshot[0] + 1, telemetry, update_time)
+        if self.checkpoint and self.checkpoint.due(update_time):
+            self.checkpoint.write(self, update_time)
+        
+        # Log telemetry if recording is active
+        if self.data_logger.is_recording():
+            self.data_logger.log_telemetry(telemetry, device_ms, measured_time, self.performance.derived)
+    
+    def snapshot(self):
+        """Return (sequence, telemetry, receive time) from a single update."""
+        return self._snapshot
+    
+    @property
+    def latest_telemetry(self):
+        return self._snapshot[1]
+    
+    @property
+    def last_update_time(self):
+        return self._snapshot[2]
+    
+    @property
+    def derived(self):
+        """Latest derived channel values by name.
+        
+        Each calculator replaces its own dict as a whole, so this is safe
+        from any thread; merging here keeps the copy off the receive path.
+        """
+        return {**self.spectral.derived, **self.performance.derived}
+    
+    def consume_samples(self, max_items=None):
+        """Return [(receive time, telemetry, measured time), ...] published since the last call.
+        
+        Samples are published only while a subscriber takes them, at most
+        at the fastest subscribed rate.
+        
+        The measured time is the ground wall-clock time the device sampled
+        the packet at, from the clock aligner.
+        
+        Only one thread (the UI) may consume from a store.
+        """
+        return self.samples.consume(max_items)
+    
+    def subscribe(self, consumer, channels, history=False, rate=None):
+        """Register (or replace) what a consumer reads; safe from any thread.
+        
+        channels are telemetry or derived channel names. history means the
+        consumer reads them back from self.history. rate is the most samples
+        per second it takes from consume_samples(): None for every sample,
+        0 if it doesn't consume samples at all.
+        """
+        with self.subscription_lock:
+            self.subscriptions[consumer] = (frozenset(channels), history, rate)
+            self._plan = self.plan()
+    
+    def unsubscribe(self, consumer):
+        with self.subscription_lock:
+            self.subscriptions.pop(consumer, None)
+            self._plan = self.plan()
+    
+    def subscribed_channels(self):
+        """Every channel some consumer reads."""
+        with self.subscription_lock:
+            return set().union(*(channels for channels, _, _ in self.subscriptions.values()))
+    
+    def plan(self):
+        # Caller holds subscription_lock
+        subscribed = set()
+        kept = set()
+        rates = []
+        for channels, history, rate in self.subscriptions.values():
+            subscribed |= channels
+            if history:
+                kept |= channels
+            if rate != 0:
+                rates.append(rate)
+        # Packet order, so the history layout doesn't depend on subscription order
+        history_channels = {}
+        for group, names in HISTORY_CHANNELS.items():
+            names = [name for name in names if name in kept]
+            if names:
+                history_channels[group] = names
+        if None in rates or not rates:
+            interval = 0.0
+        else:
+            interval = 1000.0 / max(rates)
+        spectral = not subscribed.isdisjoint(self.spectral.outputs)
+        return (history_channels, bool(rates), interval, spectral)
+    
+    def apply_plan(self, plan):
+        # Receiver thread only, so the history and monitors have a single writer
+        history_channels, publish, interval, spectral = plan
+        if history_channels != self.history.channels:
+            self.history.set_channels(history_channels)
+        previous = self._applied_plan
+        if spectral != bool(previous and previous[3]):
+            # Drop stale peaks, and restart from an empty window rather than across the gap
+            self.spectral.reset()
+            self.spectral.derived = {}
+        self.last_published = None
+        self._applied_plan = plan
+    
+    def track_packet_loss(self, counter):
+        if self.last_packet_counter is not None:
+            gap = (counter - self.last_packet_counter - 1) % 65536
+            # A huge gap means the sender restarted or packets arrived out of order
+            if gap < 1000:
+                self.packets_lost += gap
+        self.last_packet_counter = counter
+    
+    def log_event(self, kind, name, detail=None):
+        """Record an event alongside the telemetry if recording is active."""
+        if self.data_logger.is_recording():
+            return self.data_logger.log_event(kind, name, detail)
+        return False
+    
+    def start_recording(self):
+        """Start recording telemetry data."""
+        return self.data_logger.start_recording()
+    
+    def stop_recording(self):
+        """Stop recording telemetry data."""
+        return self.data_logger.stop_recording()
+    
+    def is_recording(self):
+        """Check if recording is active."""
+        return self.data_logger.is_recording()
+    
+    def check_connection(self, timeout=2.0):
+        # If no telemetry for 2 seconds, consider disconnected
+        last_update_time = self.last_update_time
+        return bool(last_update_time) and time.time() - last_update_time <= timeout
\ No newline at end of file
@@ -0,0 +1,192 @@
+# data/filters.py
+from collections import deque
+
+import numpy as np
+
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+# Filter chain for each channel group, applied in order. Stage specs:
+#   ("moving_average", samples)
+#   ("exponential", alpha)
+#   ("lowpass", cutoff_hz[, q])
+#   ("notch", frequency_hz[, q])
+FILTER_CONFIG = {
+    "pressure": [("lowpass", 10.0)],
+    "load_cells": [("moving_average", 5), ("lowpass", 5.0)],
+    "temperature": [("exponential", 0.1)]
+}
+
+def lowpass_coefficients(cutoff, rate, q=0.7071):
+    """Biquad low-pass (RBJ cookbook); returns (b, a)."""
+    w0 = 2 * np.pi * cutoff / rate
+    alpha = np.sin(w0) / (2 * q)
+    cos = np.cos(w0)
+    return [(1 - cos) / 2, 1 - cos, (1 - cos) / 2], [1 + alpha, -2 * cos, 1 - alpha]
+
+def notch_coefficients(frequency, rate, q=10.0):
+    """Biquad notch (RBJ cookbook); returns (b, a)."""
+    w0 = 2 * np.pi * frequency / rate
+    alpha = np.sin(w0) / (2 * q)
+    cos = np.cos(w0)
+    return [1, -2 * cos, 1], [1 + alpha, -2 * cos, 1 - alpha]
+
+def stage_coefficients(spec, rate):
+    """(b, a) for one stage spec from FILTER_CONFIG."""
+    kind, *params = spec
+    if kind in ("lowpass", "notch"):
+        # Keep the design frequency below Nyquist for slow sources
+        params[0] = min(params[0], 0.45 * rate)
+    if kind == "moving_average":
+        return [1.0 / params[0]] * params[0], [1.0]
+    if kind == "exponential":
+        return [params[0]], [1.0, params[0] - 1.0]
+    if kind == "lowpass":
+        return lowpass_coefficients(params[0], rate, *params[1:])
+    if kind == "notch":
+        return notch_coefficients(params[0], rate, *params[1:])
+    raise ValueError(f"Unknown filter stage: {kind}")
+
+
+class LinearFilter:
+    """One IIR or FIR stage run over blocks of many channels at once.
+
+    The filter is put in state-space form (transposed direct form II).
+    Over a block of m samples the outputs and the final state are linear in
+    the inputs and the starting state:
+
+        y  = x H^T + s G^T        s' = s (A^m)^T + x F^T
+
+    where H is the impulse response as a lower-triangular Toeplitz matrix.
+    These are precomputed up to max_block samples, so a block of any number
+    of channels is a few matrix products, and the state carries over
+    exactly from block to block. Each channel's state starts at the steady
+    state for its first sample, so there is no start-up ramp.
+    """
+
+    def __init__(self, b, a, max_block=256):
+        b = np.asarray(b, dtype=float)
+        a = np.asarray(a, dtype=float)
+        b, a = b / a[0], a / a[0]
+        order = max(len(a), len(b)) - 1
+        b = np.pad(b, (0, order + 1 - len(b)))
+        a = np.pad(a, (0, order + 1 - len(a)))
+        self.order = order
+        self.max_block = max_block
+        self.gain = b[0]
+        self.state = None
+        if order == 0:
+            return
+
+        A = np.zeros((order, order))
+        A[:, 0] = -a[1:]
+        A[:-1, 1:] = np.eye(order - 1)
+        B = b[1:] - a[1:] * b[0]
+
+        # powers[j] = A^j for j = 0..max_block
+        powers = [np.eye(order)]
+        for _ in range(max_block):
+            powers.append(powers[-1] @ A)
+        self.powers = np.array(powers)
+        # AB[j] = A^j B; the output reads the first state element
+        self.AB = self.powers[:max_block] @ B
+        self.G = self.powers[:max_block, 0, :]
+        impulse = np.concatenate(([b[0]], self.AB[:max_block - 1, 0]))
+        lags = np.arange(max_block)[:, None] - np.arange(max_block)[None, :]
+        self.H = np.where(lags >= 0, impulse[np.clip(lags, 0, None)], 0.0)
+        # State that holds the output at a constant input of 1
+        self.steady_state = np.linalg.solve(np.eye(order) - A, B)
+
+    def reset(self):
+        self.state = None
+
+    def process(self, x):
+        """Filter x [channel][sample]; returns an array of the same shape."""
+        if self.order == 0:
+            return x * self.gain
+        if self.state is None:
+            self.state = x[:, :1] * self.steady_state
+        if x.shape[1] > self.max_block:
+            return np.concatenate([self.process(x[:, start:start + self.max_block])
+                                   for start in range(0, x.shape[1], self.max_block)], axis=1)
+        m = x.shape[1]
+        y = x @ self.H[:m, :m].T + self.state @ self.G[:m].T
+        self.state = self.state @ self.powers[m].T + x @ self.AB[m - 1::-1]
+        return y
+
+
+class FilterBank:
+    """Filter chains for groups of telemetry channels, with state carried across batches.
+
+    Every channel in a group shares its chain's coefficients, so one block
+    holds the whole group and each stage runs once per batch. Given sample
+    times, the bank checks the sample rate (from the median of the last
+    rate_samples intervals, which lost packets barely move) at most once
+    every rate_period seconds, and redesigns the chains when it is more
+    than 20% off the rate they were designed for.
+    """
+
+    def __init__(self, config=None, rate=100.0, max_block=256, rate_samples=64, rate_period=1.0):
+        self.config = config or FILTER_CONFIG
+        self.max_block = max_block
+        self.rate_period = rate_period
+        self.intervals = deque(maxlen=rate_samples)
+        self.last_time = None
+        self.rate_checked = None
+        self.design(rate)
+        self.channels = [name for _, names, _ in self.groups for name in names]
+
+    def design(self, rate):
+        self.rate = rate
+        self.groups = []
+        for group, stages in self.config.items():
+            names = TELEMETRY_SCHEMA.channels(group)
+            chain = [LinearFilter(*stage_coefficients(spec, rate), max_block=self.max_block) for spec in stages]
+            self.groups.append((group, names, chain))
+
+    def reset(self):
+        for _, _, chain in self.groups:
+            for stage in chain:
+                stage.reset()
+        self.intervals.clear()
+        self.last_time = None
+        self.rate_checked = None
+
+    def track_rate(self, times):
+        # Only the newest intervals can stay in the window
+        times = np.asarray(times[-self.intervals.maxlen - 1:], dtype=float)
+        if self.last_time is not None:
+            times = np.concatenate(([self.last_time], times))
+        self.last_time = times[-1]
+        intervals = np.diff(times)
+        self.intervals.extend(intervals[intervals > 0].tolist())
+        if len(self.intervals) < self.intervals.maxlen:
+            return
+        if self.rate_checked is not None and 0 <= self.last_time - self.rate_checked < self.rate_period:
+            return
+        self.rate_checked = self.last_time
+        rate = 1.0 / float(np.median(self.intervals))
+        if abs(rate - self.rate) > 0.2 * self.rate:
+            # New coefficients; each channel restarts from its steady state
+            self.design(rate)
+
+    def process_block(self, group_index, block):
+        """Run one group's chain over block [channel][sample]."""
+        for stage in self.groups[group_index][2]:
+            block = stage.process(block)
+        return block
+
+    def process(self, samples, times=None):
+        """Filter a batch of parsed telemetry dicts; returns {channel: array of filtered values}.
+
+        times, if given, are the samples' times in seconds for rate tracking.
+        """
+        filtered = {}
+        if not samples:
+            return filtered
+        if times is not None:
+            self.track_rate(times)
+        for index, (group, names, _) in enumerate(self.groups):
+            block = np.array([[telemetry[group][name] for name in names] for telemetry in samples]).T
+            for name, values in zip(names, self.process_block(index, block)):
+                filtered[name] = values
+        return filtered
\ No newline at end of file
@@ -0,0 +1,216 @@
+# data/history_store.py
+from collections import deque
+
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+# Channels kept in the long-term history: every analog channel, keyed by group
+HISTORY_CHANNELS = TELEMETRY_SCHEMA.analog_channels()
+
+
+class _RollupTier:
+    """One fixed-size tier of min/max/mean buckets at a given resolution."""
+
+    def __init__(self, bucket_seconds, max_buckets, channel_count):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = deque(maxlen=max_buckets)
+        self.channel_count = channel_count
+        self.finalized = 0  # buckets ever finalized, for incremental checkpoints
+        self._reset(None)
+
+    def _reset(self, bucket_start):
+        self.bucket_start = bucket_start
+        self.count = 0
+        self.sums = [0.0] * self.channel_count
+        self.mins = [float("inf")] * self.channel_count
+        self.maxs = [float("-inf")] * self.channel_count
+
+    def add(self, t, mins, maxs, sums, count):
+        """Fold a sample (or finer bucket) into the tier.
+
+        Returns the finalized bucket if this one started a new bucket, else None.
+        """
+        bucket_start = t - (t % self.bucket_seconds)
+        finished = None
+        if self.bucket_start is not None and bucket_start != self.bucket_start:
+            finished = self._finalize()
+        if self.bucket_start is None or finished is not None:
+            self._reset(bucket_start)
+
+        for i in range(self.channel_count):
+            self.sums[i] += sums[i]
+            if mins[i] < self.mins[i]:
+                self.mins[i] = mins[i]
+            if maxs[i] > self.maxs[i]:
+                self.maxs[i] = maxs[i]
+        self.count += count
+        return finished
+
+    def _finalize(self):
+        # Bucket layout: (start, count, mins, maxs, sums)
+        bucket = (self.bucket_start, self.count, tuple(self.mins), tuple(self.maxs), tuple(self.sums))
+        self.buckets.append(bucket)
+        self.finalized += 1
+        return bucket
+
+    def oldest_time(self):
+        if self.buckets:
+            return self.buckets[0][0]
+        return self.bucket_start
+
+    def iter_buckets(self):
+        """Yield finalized buckets followed by the partial bucket in progress.
+
+        The buckets are copied first (one step under the GIL), so the
+        receiver thread can keep appending while another thread iterates.
+        """
+        for bucket in list(self.buckets):
+            yield bucket
+        if self.count:
+            yield (self.bucket_start, self.count, tuple(self.mins), tuple(self.maxs), tuple(self.sums))
+
+
+class TieredHistory:
+    """Whole-session telemetry history with bounded memory.
+
+    Recent samples are kept raw; older data survives as min/max/mean rollups
+    at progressively coarser resolutions. Every tier is a fixed-length deque,
+    so memory does not grow with session length.
+    """
+
+    def __init__(self, channels=None, raw_length=30000,
+                 tiers=((1, 3600), (10, 2160), (60, 1440))):
+        # Default: 5 min raw at 100 Hz, 1 s for 1 h, 10 s for 6 h, 60 s for 24 h
+        self.channels = HISTORY_CHANNELS if channels is None else channels
+        self.channel_names = [name for group in self.channels.values() for name in group]
+        self.channel_index = {name: i for i, name in enumerate(self.channel_names)}
+        self.raw = deque(maxlen=raw_length)
+        self.appended = 0  # raw samples ever appended, for incremental checkpoints
+        self.tiers = [_RollupTier(seconds, length, len(self.channel_names))
+                      for seconds, length in tiers]
+
+    def append(self, t, telemetry):
+        """Add one parsed telemetry sample measured at time t (seconds)."""
+        values = tuple(telemetry[group][name]
+                       for group, names in self.channels.items()
+                       for name in names)
+        self.raw.append((t, values))
+        self.appended += 1
+
+        # Cascade: each finished bucket is folded into the next coarser tier
+        finished = self.tiers[0].add(t, values, values, values, 1) if self.tiers else None
+        for tier in self.tiers[1:]:
+            if finished is None:
+                break
+            start, count, mins, maxs, sums = finished
+            finished = tier.add(start, mins, maxs, sums, count)
+
+    def set_channels(self, channels):
+        """Change which channels are kept ({group: [names]}), remapping stored data.
+
+        Channels kept before keep their history; new ones are NaN, and left
+        out of queries, until their first samples. New containers replace
+        the old ones, so a reader iterating the old ones is unaffected.
+        """
+        names = [name for group in channels.values() for name in group]
+        positions = [self.channel_index.get(name) for name in names]
+        nan = float("nan")
+
+        def remap(values):
+            return tuple(values[p] if p is not None else nan for p in positions)
+
+        raw = deque(((t, remap(values)) for t, values in self.raw), maxlen=self.raw.maxlen)
+        tiers = []
+        for tier in self.tiers:
+            new = _RollupTier(tier.bucket_seconds, tier.buckets.maxlen, len(names))
+            new.buckets.extend((start, count, remap(mins), remap(maxs), remap(sums))
+                               for start, count, mins, maxs, sums in tier.buckets)
+            new.finalized = tier.finalized
+            new.bucket_start = tier.bucket_start
+            new.count = tier.count
+            new.sums = list(remap(tier.sums))
+            new.mins = list(remap(tier.mins))
+            new.maxs = list(remap(tier.maxs))
+            tiers.append(new)
+
+        self.channels = channels
+        self.channel_names = names
+        self.channel_index = {name: i for i, name in enumerate(names)}
+        self.raw = raw
+        self.tiers = tiers
+
+    def clear(self):
+        self.raw.clear()
+        for tier in self.tiers:
+            tier.buckets.clear()
+            tier._reset(None)
+
+    def _covers(self, tier, t_start):
+        if tier is None:
+            return bool(self.raw) and self.raw[0][0] <= t_start
+        oldest = tier.oldest_time()
+        return oldest is not None and oldest <= t_start
+
+    def select_tier(self, t_start, t_end, max_points):
+        """Pick the coarsest tier that still gives one point per pixel.
+
+        Returns a tier object, or None for the raw samples.
+        """
+        resolution = (t_end - t_start) / max(max_points, 1)
+        for tier in reversed(self.tiers):
+            if tier.bucket_seconds <= resolution and self._covers(tier, t_start):
+                return tier
+
+        # Nothing coarse enough reaches back far enough; use the finest
+        # level that covers the window, or failing that the longest one
+        if self._covers(None, t_start):
+            return None
+        for tier in self.tiers:
+            if self._covers(tier, t_start):
+                return tier
+        return self.tiers[-1] if self.tiers else None
+
+    def query(self, channel, t_start, t_end, max_points=1000):
+        """Return (times, mins, maxs, means) for a channel over [t_start, t_end].
+
+        A channel that isn't kept, or times before it was, give no points.
+        Safe to call from another thread while the receiver appends: it
+        reads a copy of the samples.
+        """
+        times, mins, maxs, means = [], [], [], []
+        i = self.channel_index.get(channel)
+        if i is None:
+            return times, mins, maxs, means
+        tier = self.select_tier(t_start, t_end, max_points)
+
+        if tier is None:
+            for t, values in list(self.raw):
+                # NaN != NaN: the channel wasn't kept yet
+                if t_start <= t <= t_end and values[i] == values[i]:
+                    times.append(t)
+                    mins.append(values[i])
+                    maxs.append(values[i])
+                    means.append(values[i])
+            return times, mins, maxs, means
+
+        for start, count, b_mins, b_maxs, b_sums in tier.iter_buckets():
+            if start + tier.bucket_seconds < t_start or start > t_end or b_sums[i] != b_sums[i]:
+                continue
+            times.append(start)
+            mins.append(b_mins[i])
+            maxs.append(b_maxs[i])
+            means.append(b_sums[i] / count)
+        return times, mins, maxs, means
+
+    def time_span(self):
+        """Return (oldest, newest) sample times held in any tier."""
+        if not self.raw:
+            return None, None
+        oldest = self.raw[0][0]
+        if self.appended <= len(self.raw):
+            # Nothing has left the raw samples; the rollups' bucket starts are floored before it
+            return oldest, self.raw[-1][0]
+        for tier in self.tiers:
+            tier_oldest = tier.oldest_time()
+            if tier_oldest is not None and tier_oldest < oldest:
+                oldest = tier_oldest
+        return oldest, self.raw[-1][0]
\ No newline at end of file
@@ -0,0 +1,181 @@
+# data/log_analysis.py
+import os
+
+import numpy as np
+
+from data.data_logger import COMPRESSORS, EVENT_COLUMNS
+from data.log_reader import segment_paths, load_manifest
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+# Storage type per logged column; anything not listed is float32
+COLUMN_DTYPES = {
+    "timestamp": np.float64,  # epoch milliseconds fit exactly in a double
+    "elapsed_time": np.float64,
+    "device_ms": np.float64,
+    "measured_timestamp": np.float64,
+    "total_impulse_ns": np.float64,
+    "burn_phase": np.uint8
+}
+for _group, _name, _flag in TELEMETRY_SCHEMA.log_columns:
+    if _flag or TELEMETRY_SCHEMA.codes[_name] == "B":
+        COLUMN_DTYPES[_name] = np.uint8
+
+# Load cells that carry engine thrust (matches the engine tab)
+THRUST_CHANNELS = ["lc_1", "lc_2"]
+
+def _open_binary(path):
+    """Open a segment for binary reading, decompressing if needed."""
+    for extension, opener in COMPRESSORS.values():
+        if path.endswith(extension):
+            return opener(path, 'rb')
+    return open(path, 'rb')
+
+def _count_rows(path):
+    """Count data rows in a segment by scanning raw bytes for newlines."""
+    count = 0
+    with _open_binary(path) as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            count += block.count(b"\n")
+    return max(count - 1, 0)  # minus the header row
+
+def _line_blocks(f, block_bytes):
+    """Yield about block_bytes of whole lines at a time from a binary file."""
+    rest = b""
+    for block in iter(lambda: f.read(block_bytes), b""):
+        block = rest + block
+        cut = block.rfind(b"\n") + 1
+        rest = block[cut:]
+        if cut:
+            yield block[:cut]
+    if rest.strip():
+        yield rest
+
+def _segment_row_counts(path, segments):
+    # Prefer the row counts the logger recorded in the manifest
+    if path.endswith(".manifest.json"):
+        entries = load_manifest(path)["segments"]
+        if len(entries) == len(segments) and all(entry["rows"] for entry in entries):
+            return [entry["rows"] for entry in entries]
+    return [_count_rows(segment) for segment in segments]
+
+def load_log(path, block_bytes=1024 * 1024):
+    """Load a DataLogger recording into a dict of NumPy column arrays.
+
+    The file is parsed a block of bytes at a time, with no per-row Python
+    objects, straight into preallocated columns, so peak memory is the
+    output arrays plus a few copies of one block.
+    """
+    segments = segment_paths(path)
+    counts = _segment_row_counts(path, segments)
+    total = sum(counts)
+
+    columns = None
+    offset = 0
+    for segment in segments:
+        with _open_binary(segment) as f:
+            header = f.readline().decode().strip().split(",")
+            if columns is None:
+                columns = {name: np.empty(total, dtype=COLUMN_DTYPES.get(name, np.float32))
+                           for name in header}
+            for text in _line_blocks(f, block_bytes):
+                # Line ends become separators, so the block is one run of numbers
+                values = np.fromstring(text.replace(b"\r\n", b",").replace(b"\n", b","), sep=",")
+                if len(values) % len(header) or len(values) < text.count(b"\n") * len(header):
+                    raise ValueError(f"Malformed rows in {segment}")
+                block = values.reshape(-1, len(header))
+                end = min(offset + len(block), total)
+                for i, name in enumerate(header):
+                    if name in columns:
+                        columns[name][offset:end] = block[:end - offset, i]
+                offset = end
+
+    if columns is None:
+        return {}
+    # Trim in case a segment held fewer rows than recorded
+    return {name: values[:offset] for name, values in columns.items()}
+
+def save_npz(columns, path, compress=False):
+    """Save column arrays to an .npz file for fast reopening."""
+    if compress:
+        np.savez_compressed(path, **columns)
+    else:
+        np.savez(path, **columns)
+
+def load_npz(path):
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+def load_columns(path):
+    """Load columns from either an .npz export or a recording."""
+    if os.path.splitext(path)[1] == ".npz":
+        return load_npz(path)
+    return load_log(path)
+
+def valve_events(columns):
+    """Return {channel: [(elapsed_time, new_state), ...]} for discrete channels."""
+    t = columns["elapsed_time"]
+    events = {}
+    for name in EVENT_COLUMNS:
+        if name not in columns or len(columns[name]) == 0:
+            continue
+        values = columns[name]
+        changes = np.flatnonzero(np.diff(values.astype(np.int8))) + 1
+        events[name] = [(float(t[i]), int(values[i])) for i in changes]
+    return events
+
+def burn_window(columns, threshold=0.1, min_rise=100.0):
+    """Estimate burn start/end from summed thrust rising above baseline.
+
+    The burn is where thrust exceeds the baseline by more than the given
+    fraction of the peak rise. Rises smaller than min_rise (N) are treated
+    as noise. Returns (start, end) elapsed times or None.
+    """
+    thrust = sum(columns[name].astype(np.float64) for name in THRUST_CHANNELS)
+    if len(thrust) == 0:
+        return None
+    baseline = np.median(thrust[:min(len(thrust), 100)])
+    rise = thrust.max() - baseline
+    if rise < min_rise:
+        return None
+    above = np.flatnonzero(thrust - baseline > threshold * rise)
+    if len(above) == 0:
+        return None
+    t = columns["elapsed_time"]
+    return float(t[above[0]]), float(t[above[-1]])
+
+def summarize(columns):
+    """Compute per-channel statistics and key test metrics."""
+    t = columns["elapsed_time"]
+    summary = {"samples": int(len(t)), "duration": float(t[-1] - t[0]) if len(t) else 0.0}
+
+    channels = {}
+    for name, values in columns.items():
+        if name in ("timestamp", "elapsed_time") or len(values) == 0:
+            continue
+        channels[name] = {
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": float(values.mean(dtype=np.float64))
+        }
+    summary["channels"] = channels
+
+    if len(t):
+        chamber = columns["pt_f2_4_engine"]
+        peak = int(np.argmax(chamber))
+        summary["peak_chamber_pressure"] = {"value": float(chamber[peak]), "time": float(t[peak])}
+
+        thrust = sum(columns[name].astype(np.float64) for name in THRUST_CHANNELS)
+        peak = int(np.argmax(thrust))
+        summary["max_thrust"] = {"value": float(thrust[peak]), "time": float(t[peak])}
+
+        # Running total from the live performance calculator, if recorded
+        if "total_impulse_ns" in columns:
+            summary["total_impulse"] = float(columns["total_impulse_ns"].max())
+        
+        window = burn_window(columns)
+        summary["burn"] = None if window is None else {
+            "start": window[0], "end": window[1], "duration": window[1] - window[0]
+        }
+
+    summary["valve_events"] = valve_events(columns)
+    return summary
\ No newline at end of file
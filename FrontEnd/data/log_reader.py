@@ -0,0 +1,132 @@
+# data/log_reader.py
+import os
+import csv
+import json
+import io
+import heapq
+from bisect import bisect_right
+from contextlib import contextmanager
+
+from data.data_logger import COMPRESSORS
+
+def open_segment(path):
+    """Open a CSV segment for text reading, decompressing if needed."""
+    for extension, opener in COMPRESSORS.values():
+        if path.endswith(extension):
+            return io.TextIOWrapper(opener(path, 'rb'), newline='')
+    return open(path, 'r', newline='')
+
+@contextmanager
+def open_segment_at(path, offset, restarts=None):
+    """Open a segment for text reading positioned at a byte offset.
+
+    Offsets are positions in the uncompressed CSV. Plain segments seek
+    directly. Compressed ones start decompressing at the last restart
+    point (from the segment's manifest entry) at or before the offset, or
+    at the start of the file without them, and skip forward from there.
+    """
+    with open(path, 'rb') as raw:
+        for extension, opener in COMPRESSORS.values():
+            if path.endswith(extension):
+                start, position = 0, 0
+                if restarts:
+                    i = bisect_right([restart[0] for restart in restarts], offset) - 1
+                    start, position = restarts[max(i, 0)]
+                raw.seek(position)
+                with opener(raw, 'rb') as stream:
+                    stream.seek(offset - start)
+                    yield io.TextIOWrapper(stream, newline='')
+                return
+        raw.seek(offset)
+        yield io.TextIOWrapper(raw, newline='')
+
+def load_manifest(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def segment_paths(path):
+    """Return the ordered segment files for a recording.
+
+    Accepts a session manifest or a single (optionally compressed) CSV file.
+    """
+    if not path.endswith(".manifest.json"):
+        return [path]
+
+    manifest = load_manifest(path)
+    directory = os.path.dirname(path)
+    paths = []
+    for entry in manifest["segments"]:
+        segment = os.path.join(directory, entry["file"])
+        if not os.path.exists(segment):
+            # The compressor may have finished after the manifest was read
+            for extension, _ in COMPRESSORS.values():
+                if os.path.exists(segment + extension):
+                    segment += extension
+                    break
+        paths.append(segment)
+    return paths
+
+def segment_restarts(path):
+    """Return each segment's compressed restart points, in segment order; None where unknown."""
+    if not path.endswith(".manifest.json"):
+        return [None]
+    return [entry.get("restarts") for entry in load_manifest(path)["segments"]]
+
+def iter_rows(path):
+    """Yield (header, row) for every data row across all segments of a recording."""
+    for segment in segment_paths(path):
+        with open_segment(segment) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                continue
+            for row in reader:
+                yield header, row
+
+def iter_records(path):
+    """Yield each data row of a recording as a dict keyed by column name."""
+    for header, row in iter_rows(path):
+        yield dict(zip(header, row))
+
+def events_path_for(path):
+    """Return the event log of a recording, or None if it has none."""
+    if not path.endswith(".manifest.json"):
+        return None
+    manifest = load_manifest(path)
+    if not manifest.get("events"):
+        return None  # recorded before the logger kept an event log
+    return os.path.join(os.path.dirname(path), manifest["events"])
+
+def iter_events(path):
+    """Yield each event of a recording as a dict, in time order."""
+    events_path = events_path_for(path)
+    if events_path is None or not os.path.exists(events_path):
+        return
+    with open(events_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for timestamp, elapsed, segment, offset, kind, name, detail in reader:
+            yield {
+                "timestamp": int(timestamp),
+                "elapsed_time": float(elapsed),
+                "location": (int(segment), int(offset)),
+                "kind": kind,
+                "name": name,
+                "detail": json.loads(detail) if detail else {}
+            }
+
+def merge_timeline(records, events):
+    """Merge time-ordered telemetry records and events into one stream.
+
+    Yields ("sample", record) and ("event", event) by elapsed_time; an
+    event sorts before a sample with the same time, since the logger
+    writes it ahead of the next row.
+    """
+    samples = ((float(record["elapsed_time"]), 1, "sample", record) for record in records)
+    marks = ((event["elapsed_time"], 0, "event", event) for event in events)
+    for _, _, kind, item in heapq.merge(samples, marks, key=lambda entry: entry[:2]):
+        yield kind, item
+
+def iter_timeline(path):
+    """Yield every telemetry row and event of a recording in time order."""
+    return merge_timeline(iter_records(path), iter_events(path))
\ No newline at end of file
@@ -0,0 +1,178 @@
+# data/performance.py
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+G0 = 9.80665  # m/s^2, for weight -> mass and specific impulse
+
+# Load cell calibration to newtons: force = gain * reading + offset
+LOAD_CELL_CALIBRATION = {name: (1.0, 0.0) for name in TELEMETRY_SCHEMA.channels("load_cells")}
+
+# Cells under the engine test stand, and cells weighing the oxidizer tank
+THRUST_CELLS = ["lc_1", "lc_2"]
+TANK_CELLS = ["lc_3", "lc_4"]
+
+# burn_phase values, as logged
+BURN_PHASES = ["idle", "burn", "tail_off", "burnout"]
+
+# Derived channels, in the order of PerformanceCalculator.values
+PERFORMANCE_CHANNELS = ["thrust_n", "peak_thrust_n", "total_impulse_ns", "burn_time_s", "tank_mass_kg",
+                        "mass_flow_kg_s", "propellant_used_kg", "isp_s", "burn_phase"]
+
+# Attributes carried from sample to sample, as saved in checkpoints
+STATE_FIELDS = ["phase", "tare", "last_time", "thrust", "impulse", "peak_thrust", "burn_start", "burn_time",
+                "below_since", "start_mass", "origin", "weight", "mean_t", "mean_m", "ctt", "ctm", "mass",
+                "mass_flow", "values"]
+
+
+class PerformanceCalculator:
+    """Thrust, total impulse and propellant flow, updated in O(1) per sample.
+
+    Thrust is the calibrated sum of the thrust cells less a tare: the stand
+    preload, followed as an exponential mean with a time constant of
+    tare_time while no burn is in progress. A burn starts when thrust
+    exceeds start_threshold; it is in tail-off once thrust falls below
+    end_threshold and burnt out after staying there for `hold` seconds.
+    Total impulse is integrated with the trapezoidal rule over the device
+    clock from the start of the burn to burnout.
+
+    Tank mass is the calibrated weight on the tank cells over g. Mass flow
+    is the slope of an exponentially weighted least-squares line through
+    tank mass against time (half-life flow_half_life), which smooths the
+    cell noise without keeping any history. Propellant used and average
+    specific impulse are relative to the tank mass at burn start.
+
+    The latest results are `values`, a tuple in PERFORMANCE_CHANNELS order
+    replaced as a whole on every sample, so other threads always read one
+    sample's results; `derived` gives them by name. Phase changes are
+    passed to event_sink(kind, name, detail), e.g. to put them in the
+    recording's event log.
+    """
+
+    def __init__(self, calibration=None, thrust_cells=None, tank_cells=None, start_threshold=200.0,
+                 end_threshold=100.0, hold=0.2, tare_time=2.0, flow_half_life=0.5, event_sink=None):
+        self.calibration = calibration or LOAD_CELL_CALIBRATION
+        self.thrust_cells = thrust_cells or THRUST_CELLS
+        self.tank_cells = tank_cells or TANK_CELLS
+        self.start_threshold = start_threshold
+        self.end_threshold = end_threshold
+        self.hold = hold
+        self.tare_time = tare_time
+        self.flow_half_life = flow_half_life
+        self.event_sink = event_sink
+        self.reset()
+
+    def reset(self):
+        self.phase = "idle"
+        self.tare = None
+        self.last_time = None
+        self.thrust = 0.0
+        self.impulse = 0.0
+        self.peak_thrust = 0.0
+        self.burn_start = None
+        self.burn_time = 0.0
+        self.below_since = None
+        self.start_mass = None
+        # Weighted fit of tank mass against time, centred on the first sample
+        self.origin = None
+        self.weight = 0.0
+        self.mean_t = 0.0
+        self.mean_m = 0.0
+        self.ctt = 0.0
+        self.ctm = 0.0
+        self.mass = 0.0
+        self.mass_flow = 0.0
+        self.values = None
+
+    def force(self, load_cells, names):
+        total = 0.0
+        for name in names:
+            gain, offset = self.calibration[name]
+            total += gain * load_cells[name] + offset
+        return total
+
+    def update(self, telemetry, device_ms):
+        """Add one sample at device time device_ms (unwrapped); returns the new values."""
+        t = device_ms / 1000.0
+        load_cells = telemetry["load_cells"]
+        stand = self.force(load_cells, self.thrust_cells)
+        self.mass = self.force(load_cells, self.tank_cells) / G0
+        dt = t - self.last_time if self.last_time is not None else 0.0
+        if dt < 0:
+            dt = 0.0  # device clock reset; treat as simultaneous
+        self.last_time = t
+
+        burning = self.phase in ("burn", "tail_off")
+        if self.tare is None:
+            self.tare = stand
+        elif not burning:
+            self.tare += (stand - self.tare) * min(dt / self.tare_time, 1.0)
+        last_thrust = self.thrust
+        self.thrust = stand - self.tare
+
+        if not burning and self.thrust > self.start_threshold:
+            self.phase = "burn"
+            self.burn_start = t - dt
+            self.impulse = 0.0
+            self.peak_thrust = 0.0
+            self.start_mass = self.mass
+            burning = True
+            self.notify()
+        if burning:
+            self.impulse += 0.5 * (self.thrust + last_thrust) * dt
+            self.peak_thrust = max(self.peak_thrust, self.thrust)
+            self.burn_time = t - self.burn_start
+            if self.thrust >= self.end_threshold:
+                if self.phase == "tail_off":
+                    self.phase = "burn"
+            elif self.phase == "burn":
+                self.phase = "tail_off"
+                self.below_since = t
+                self.notify()
+            elif t - self.below_since >= self.hold:
+                self.phase = "burnout"
+                self.burn_time = self.below_since - self.burn_start
+                self.notify()
+
+        self.fit_mass(t, dt)
+        used = self.start_mass - self.mass if self.start_mass is not None else 0.0
+        isp = self.impulse / (used * G0) if used > 0.1 else 0.0
+        self.values = (self.thrust, self.peak_thrust, self.impulse, self.burn_time, self.mass,
+                       self.mass_flow, used, isp, BURN_PHASES.index(self.phase))
+        return self.values
+
+    def state(self):
+        """Everything update() carries between samples, for checkpoints."""
+        return {name: getattr(self, name) for name in STATE_FIELDS}
+
+    def restore(self, state):
+        for name in STATE_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        if self.values is not None:
+            self.values = tuple(self.values)
+
+    @property
+    def derived(self):
+        """The latest values by channel name; empty before the first sample."""
+        values = self.values
+        return dict(zip(PERFORMANCE_CHANNELS, values)) if values else {}
+
+    def fit_mass(self, t, dt):
+        # Weighted incremental means and co-moments; old samples fade with time
+        if self.origin is None:
+            self.origin = t
+        x = t - self.origin
+        decay = 0.5 ** (dt / self.flow_half_life)
+        self.weight = self.weight * decay + 1.0
+        dx = x - self.mean_t
+        self.mean_t += dx / self.weight
+        self.mean_m += (self.mass - self.mean_m) / self.weight
+        self.ctt = self.ctt * decay + dx * (x - self.mean_t)
+        self.ctm = self.ctm * decay + dx * (self.mass - self.mean_m)
+        if self.ctt > 1e-9:
+            self.mass_flow = -self.ctm / self.ctt
+
+    def notify(self):
+        if self.event_sink:
+            self.event_sink("burn", self.phase, {"thrust_n": round(self.thrust, 1),
+                                                 "total_impulse_ns": round(self.impulse, 1),
+                                                 "burn_time_s": round(self.burn_time, 3)})
\ No newline at end of file
@@ -0,0 +1,169 @@
+# data/recovery.py
+import os
+import csv
+import glob
+import json
+import time
+
+from data.data_logger import COMPRESSORS, fsync_path, write_manifest
+from data.log_reader import load_manifest
+
+def _plain_name(filename):
+    for extension, _ in COMPRESSORS.values():
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+def _truncate(path, size):
+    with open(path, 'r+b') as f:
+        f.truncate(size)
+    fsync_path(path)
+
+def scan_segment(path, columns):
+    """Find the intact prefix of a plain CSV segment.
+
+    Rows are self-delimiting: a row is intact if it ends in a newline, has
+    one field per column and starts with a numeric timestamp and elapsed
+    time. Everything from the first bad row on (a torn write, or the
+    zero-filled blocks a power cut can leave) is dropped.
+
+    Returns (header_ok, good_bytes, rows, first_timestamp, last_timestamp).
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        if not header.endswith(b"\n") or header.rstrip(b"\r\n").decode(errors="replace").split(",") != columns:
+            return False, 0, 0, None, None
+        good = len(header)
+        rows = 0
+        first = last = None
+        for line in f:
+            fields = line.rstrip(b"\r\n").split(b",")
+            if not line.endswith(b"\n") or len(fields) != len(columns):
+                break
+            try:
+                timestamp = int(fields[0])
+                float(fields[1])
+            except ValueError:
+                break
+            if first is None:
+                first = timestamp
+            last = timestamp
+            good += len(line)
+            rows += 1
+    return True, good, rows, first, last
+
+def _cut_sidecar(path, field_count, keep):
+    """Truncate a CSV sidecar at its first torn line or first line keep() rejects.
+
+    Returns the number of bytes dropped.
+    """
+    if not os.path.exists(path):
+        return 0
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        good = len(f.readline())
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                fields = next(csv.reader([line.decode()]))
+                if len(fields) != field_count or not keep(fields):
+                    break
+            except (ValueError, StopIteration, csv.Error):
+                break
+            good += len(line)
+    if good < size:
+        _truncate(path, good)
+    return size - good
+
+def recover_session(manifest_path):
+    """Repair a recording that was never stopped cleanly.
+
+    Cuts each segment back to its intact rows, finishes or undoes an
+    interrupted compression, trims the index and event log to the data that
+    survived, and marks the manifest complete. Returns a report dict, or
+    None if the session was already complete.
+    """
+    manifest = load_manifest(manifest_path)
+    if manifest.get("complete"):
+        return None
+    directory = os.path.dirname(manifest_path)
+    columns = manifest["columns"]
+    report = {"session": manifest["session"], "segments": 0, "rows": 0, "bytes_dropped": 0}
+
+    # A segment file created just before the crash may not be listed yet
+    listed = {_plain_name(entry["file"]) for entry in manifest["segments"]}
+    for path in sorted(glob.glob(os.path.join(directory, f"{manifest['session']}_[0-9][0-9][0-9].csv"))):
+        if os.path.basename(path) not in listed:
+            manifest["segments"].append({"file": os.path.basename(path), "rows": 0, "first_timestamp": None,
+                                         "last_timestamp": None, "compressed": False})
+
+    # Bytes of intact data per segment number, for trimming the sidecars
+    segment_sizes = {}
+    for number, entry in enumerate(manifest["segments"], start=1):
+        plain = os.path.join(directory, _plain_name(entry["file"]))
+        if entry.get("compressed"):
+            # The compressed copy was synced before the manifest named it
+            if os.path.exists(plain):
+                os.remove(plain)
+            segment_sizes[number] = float("inf")
+        else:
+            # A half-written compressed copy is worthless; the plain file is the data
+            for extension, _ in COMPRESSORS.values():
+                if os.path.exists(plain + extension):
+                    os.remove(plain + extension)
+            entry["file"] = os.path.basename(plain)
+            if not os.path.exists(plain):
+                open(plain, 'wb').close()
+            header_ok, good, rows, first, last = scan_segment(plain, columns)
+            size = os.path.getsize(plain)
+            if not header_ok:
+                # Torn header: keep an empty but readable segment so numbering holds
+                with open(plain, 'w', newline='') as f:
+                    f.write(",".join(columns) + "\r\n")
+                fsync_path(plain)
+                good = os.path.getsize(plain)
+            elif good < size:
+                _truncate(plain, good)
+            report["bytes_dropped"] += max(size - good, 0) if header_ok else size
+            entry.update({"rows": rows, "first_timestamp": first, "last_timestamp": last})
+            segment_sizes[number] = good
+        report["segments"] += 1
+        report["rows"] += entry["rows"]
+
+    # Index and event rows may only point at data that survived
+    def located(segment, offset):
+        return int(offset) < segment_sizes.get(int(segment), -1)
+
+    if manifest.get("index"):
+        report["bytes_dropped"] += _cut_sidecar(os.path.join(directory, manifest["index"]), 7,
+                                                lambda fields: located(fields[3], fields[4]))
+    if manifest.get("events"):
+        # An event may sit at the very end of the data it precedes
+        def event_ok(fields):
+            json.loads(fields[6]) if fields[6] else None
+            segment, offset = int(fields[2]), int(fields[3])
+            return segment in segment_sizes and offset <= segment_sizes[segment]
+        report["bytes_dropped"] += _cut_sidecar(os.path.join(directory, manifest["events"]), 7, event_ok)
+
+    manifest["complete"] = True
+    manifest["recovered"] = {"time": time.time(), "rows": report["rows"], "bytes_dropped": report["bytes_dropped"]}
+    write_manifest(manifest_path, manifest, durable=True)
+    return report
+
+def recover_directory(log_directory):
+    """Repair every incomplete recording in a log directory; returns the reports.
+
+    Call before any logger in this directory starts recording, since a
+    session being written right now also looks incomplete.
+    """
+    reports = []
+    for manifest_path in sorted(glob.glob(os.path.join(log_directory, "*.manifest.json"))):
+        try:
+            report = recover_session(manifest_path)
+        except Exception as e:
+            print(f"Error recovering {manifest_path}: {e}")
+            continue
+        if report:
+            reports.append(report)
+    return reports
\ No newline at end of file
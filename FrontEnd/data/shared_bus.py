@@ -0,0 +1,284 @@
+# data/shared_bus.py
+import time
+import json
+import struct
+import threading
+from multiprocessing import shared_memory, resource_tracker
+
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+# Header: magic, capacity, record size, write sequence,
+# recording request (UI -> ingest), recording state (ingest -> UI), ingest heartbeat,
+# then in the padding, a stop request (launcher -> ingest)
+HEADER = struct.Struct("<QQQQQQd")
+HEADER_SIZE = 64  # padded so slots stay 8-byte aligned
+MAGIC = 0x5345445342555332  # "SEDSBUS2"
+
+WRITE_SEQ_OFFSET = 24
+RECORD_REQUEST_OFFSET = 32
+RECORDING_STATE_OFFSET = 40
+HEARTBEAT_OFFSET = 48
+STOP_REQUEST_OFFSET = 56
+
+# One decoded sample: source index, receive time, then every schema field
+# in its wire type (bitfields stay packed)
+RECORD = struct.Struct("<Qd" + TELEMETRY_SCHEMA.format[1:-1])
+SEQ = struct.Struct("<Q")
+SLOT_SIZE = SEQ.size + (RECORD.size + 7) // 8 * 8  # keep sequence words 8-byte aligned
+
+# Events (commands, acks, operator actions) from the UI process to the
+# ingest process's recordings, after the sample ring: an event write
+# sequence, then slots of sequence, source index, event time, JSON length
+# and [kind, name, detail] as JSON
+EVENT_CAPACITY = 256
+EVENT_SLOT_SIZE = 1024
+EVENT_HEADER = struct.Struct("<QQdI")
+EVENT_PAYLOAD = EVENT_SLOT_SIZE - EVENT_HEADER.size
+
+def encode_record(source_index, receive_time, telemetry):
+    return [source_index, receive_time] + TELEMETRY_SCHEMA.flatten(telemetry)
+
+def decode_record(values):
+    """Rebuild (source_index, receive_time, telemetry dict) from a record."""
+    return values[0], values[1], TELEMETRY_SCHEMA.unflatten(values[2:])
+
+
+class SharedTelemetryBus:
+    """Single-writer ring of decoded samples in shared memory.
+
+    The ingest process owns the segment and publishes; any number of
+    readers attach by name. Each slot carries the sequence number of the
+    sample in it. The writer zeroes that first, writes the record, then
+    stores the sequence, and finally advances the header write sequence.
+    A reader accepts a slot only if its sequence matches before and after
+    unpacking, so a slot overwritten mid-read is detected and skipped.
+
+    Events go the other way, from the UI process to the ingest process,
+    through a smaller ring after the samples that works the same way;
+    the UI process is its only writer.
+    """
+
+    def __init__(self, name, capacity=8192, create=False):
+        self.capacity = capacity
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.size(capacity))
+            self.buf = self.shm.buf
+            HEADER.pack_into(self.buf, 0, MAGIC, capacity, RECORD.size, 0, 0, 0, 0.0)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Only the owner should unlink the segment when it exits
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+            self.buf = self.shm.buf
+            magic, self.capacity, record_size = HEADER.unpack_from(self.buf, 0)[:3]
+            if magic != MAGIC or record_size != RECORD.size:
+                raise ValueError(f"Shared memory '{name}' is not a telemetry bus")
+        self.owner = create
+        self.name = name
+        self.event_offset = HEADER_SIZE + self.capacity * SLOT_SIZE
+        self.event_lock = threading.Lock()  # threads of the UI process share the event ring
+
+    @staticmethod
+    def size(capacity):
+        return HEADER_SIZE + capacity * SLOT_SIZE + SEQ.size + EVENT_CAPACITY * EVENT_SLOT_SIZE
+
+    @classmethod
+    def attach(cls, name, timeout=10.0):
+        """Attach to an existing bus, waiting for the ingest process to create it."""
+        deadline = time.time() + timeout
+        while True:
+            try:
+                return cls(name)
+            except FileNotFoundError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    def _get(self, offset):
+        return SEQ.unpack_from(self.buf, offset)[0]
+
+    def _set(self, offset, value):
+        SEQ.pack_into(self.buf, offset, value)
+
+    def write_sequence(self):
+        return self._get(WRITE_SEQ_OFFSET)
+
+    def publish(self, source_index, receive_time, telemetry):
+        """Append one sample. Only one process may publish."""
+        seq = self._get(WRITE_SEQ_OFFSET) + 1
+        offset = HEADER_SIZE + (seq % self.capacity) * SLOT_SIZE
+        self._set(offset, 0)
+        RECORD.pack_into(self.buf, offset + SEQ.size, *encode_record(source_index, receive_time, telemetry))
+        self._set(offset, seq)
+        self._set(WRITE_SEQ_OFFSET, seq)
+
+    def read_since(self, last_seq):
+        """Return (new_last_seq, records, lost) for samples published after last_seq.
+
+        Records are unpacked straight from the shared buffer. If the reader
+        fell more than a full ring behind, the overwritten samples are
+        counted as lost.
+        """
+        write_seq = self._get(WRITE_SEQ_OFFSET)
+        lost = 0
+        if write_seq - last_seq > self.capacity:
+            lost = write_seq - last_seq - self.capacity
+            last_seq = write_seq - self.capacity
+
+        records = []
+        for seq in range(last_seq + 1, write_seq + 1):
+            offset = HEADER_SIZE + (seq % self.capacity) * SLOT_SIZE
+            if self._get(offset) != seq:
+                lost += 1
+                continue
+            values = RECORD.unpack_from(self.buf, offset + SEQ.size)
+            if self._get(offset) != seq:
+                lost += 1  # overwritten while we were reading it
+                continue
+            records.append(values)
+        return write_seq, records, lost
+
+    def publish_event(self, source_index, event_time, kind, name, detail=None):
+        """Append one event for a source's recording. Only one process may publish events."""
+        payload = json.dumps([kind, name, detail], separators=(",", ":")).encode()
+        if len(payload) > EVENT_PAYLOAD:
+            payload = json.dumps([kind, name, {"truncated": True}], separators=(",", ":")).encode()
+        with self.event_lock:
+            seq = self._get(self.event_offset) + 1
+            offset = self.event_offset + SEQ.size + (seq % EVENT_CAPACITY) * EVENT_SLOT_SIZE
+            self._set(offset, 0)
+            EVENT_HEADER.pack_into(self.buf, offset, 0, source_index, event_time, len(payload))
+            self.buf[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + len(payload)] = payload
+            self._set(offset, seq)
+            self._set(self.event_offset, seq)
+
+    def event_sequence(self):
+        return self._get(self.event_offset)
+
+    def read_events(self, last_seq):
+        """Return (new_last_seq, [(source_index, event_time, kind, name, detail)], lost)."""
+        write_seq = self._get(self.event_offset)
+        lost = 0
+        if write_seq - last_seq > EVENT_CAPACITY:
+            lost = write_seq - last_seq - EVENT_CAPACITY
+            last_seq = write_seq - EVENT_CAPACITY
+
+        events = []
+        for seq in range(last_seq + 1, write_seq + 1):
+            offset = self.event_offset + SEQ.size + (seq % EVENT_CAPACITY) * EVENT_SLOT_SIZE
+            if self._get(offset) != seq:
+                lost += 1
+                continue
+            _, source_index, event_time, length = EVENT_HEADER.unpack_from(self.buf, offset)
+            payload = bytes(self.buf[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length])
+            if self._get(offset) != seq:
+                lost += 1
+                continue
+            kind, name, detail = json.loads(payload)
+            events.append((source_index, event_time, kind, name, detail))
+        return write_seq, events, lost
+
+    # Recording control, shared through the header
+    def request_recording(self, enabled):
+        self._set(RECORD_REQUEST_OFFSET, 1 if enabled else 0)
+
+    def recording_requested(self):
+        return bool(self._get(RECORD_REQUEST_OFFSET))
+
+    def set_recording_state(self, recording):
+        self._set(RECORDING_STATE_OFFSET, 1 if recording else 0)
+
+    def recording_state(self):
+        return bool(self._get(RECORDING_STATE_OFFSET))
+
+    def request_stop(self):
+        """Ask the ingest process to shut down cleanly, e.g. from the launcher."""
+        self._set(STOP_REQUEST_OFFSET, 1)
+
+    def stop_requested(self):
+        return bool(self._get(STOP_REQUEST_OFFSET))
+
+    def heartbeat(self):
+        struct.pack_into("<d", self.buf, HEARTBEAT_OFFSET, time.time())
+
+    def last_heartbeat(self):
+        return struct.unpack_from("<d", self.buf, HEARTBEAT_OFFSET)[0]
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class BusRecordingControl:
+    """Stands in for a DataStore's DataLogger when logging runs in the ingest process.
+
+    source_index is the store's source, in the order both processes were
+    given them, so its events reach that source's recording. Only events
+    raised in this process belong here: build the store with
+    performance_events=False, as ingest logs the burn events it derives.
+    """
+
+    def __init__(self, bus, source_index=0, timeout=2.0):
+        self.bus = bus
+        self.source_index = source_index
+        self.timeout = timeout
+
+    def _request(self, enabled):
+        if self.bus.recording_state() == enabled:
+            return True
+        self.bus.request_recording(enabled)
+        deadline = time.time() + self.timeout
+        while time.time() < deadline:
+            if self.bus.recording_state() == enabled:
+                return True
+            time.sleep(0.02)
+        return False
+
+    def start_recording(self):
+        return self._request(True)
+
+    def stop_recording(self):
+        return self._request(False)
+
+    def is_recording(self):
+        return self.bus.recording_state()
+
+    def log_telemetry(self, telemetry, device_ms=None, measured_time=None, derived=None):
+        return False  # the ingest process does the logging
+
+    def log_event(self, kind, name, detail=None):
+        # The ingest process writes it to the recording, with this time
+        self.bus.publish_event(self.source_index, time.time(), kind, name, detail)
+        return True
+
+
+class BusFeeder:
+    """Feed samples from the bus into per-source DataStores in the UI process."""
+
+    def __init__(self, bus, data_stores, poll_interval=0.005):
+        self.bus = bus
+        self.data_stores = data_stores  # indexed by source index
+        self.poll_interval = poll_interval
+        self.last_seq = bus.write_sequence()
+        self.lost = 0
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def run(self):
+        while self.running:
+            self.last_seq, records, lost = self.bus.read_since(self.last_seq)
+            self.lost += lost
+            for values in records:
+                source_index, receive_time, telemetry = decode_record(values)
+                if source_index < len(self.data_stores):
+                    self.data_stores[source_index].update_telemetry(telemetry)
+            if not records:
+                time.sleep(self.poll_interval)
\ No newline at end of file
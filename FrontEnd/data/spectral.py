@@ -0,0 +1,121 @@
+# data/spectral.py
+import numpy as np
+
+from data.spsc_ring import SPSCRing
+
+# Chamber pressure and the propellant feed lines: where combustion
+# instability shows up first
+SPECTRAL_CHANNELS = ["pt_f2_4_engine", "pt_f2_4", "pt_f1_5", "pt_o1_3", "pt_o2_2"]
+
+def spectral_outputs(channels):
+    """Names of the derived channels a monitor of these channels produces."""
+    return [f"{name}_peak_{kind}" for name in channels for kind in ("hz", "amp")]
+
+SPECTRAL_OUTPUTS = spectral_outputs(SPECTRAL_CHANNELS)
+
+
+class SpectralMonitor:
+    """Sliding-window spectra of pressure channels, updated incrementally.
+
+    Samples are collected in blocks of `hop`. Each block advances every
+    channel's window-length DFT with one sliding-DFT step: the spectrum is
+    rotated by the block length and the difference between the entering
+    and leaving samples is added through a precomputed twiddle matrix, a
+    single matrix product per block instead of a new FFT per frame. A full
+    rfft every resync_frames frames removes accumulated rounding error.
+
+    After each block a Hann-windowed amplitude spectrum of every channel is
+    published to `frames` as (device time in s, sample rate, bin amplitudes
+    [channel][bin]) for the waterfall. `derived` holds each channel's
+    dominant frequency and amplitude above min_hz as <channel>_peak_hz and
+    <channel>_peak_amp.
+    """
+
+    def __init__(self, channels=None, window=256, hop=32, min_hz=5.0, resync_frames=256, frame_capacity=256):
+        self.channels = channels or SPECTRAL_CHANNELS
+        self.outputs = spectral_outputs(self.channels)
+        self.window = window
+        self.hop = hop
+        self.min_hz = min_hz
+        self.resync_frames = resync_frames
+        self.bins = window // 2 + 1
+
+        # powers[j, k] = exp(2*pi*i*k*j/N): rotation of bin k after j samples
+        k = np.arange(self.bins)
+        j = np.arange(window + 1)[:, None]
+        self.powers = np.exp(2j * np.pi * k * j / window)
+
+        self.frames = SPSCRing(frame_capacity)
+        self.derived = {}
+        self.reset()
+
+    def reset(self):
+        self.buffer = np.zeros((len(self.channels), self.window))
+        self.times = np.zeros(self.window)
+        self.spectrum = np.zeros((len(self.channels), self.bins), dtype=complex)
+        self.pending = []
+        self.pending_times = []
+        self.samples = 0
+        self.frame_count = 0
+
+    def add(self, telemetry, device_ms):
+        """Add one sample; returns True when it completed a block and a new frame."""
+        pressure = telemetry["pressure"]
+        self.pending.append([pressure[name] for name in self.channels])
+        self.pending_times.append(device_ms / 1000.0)
+        if len(self.pending) < self.hop:
+            return False
+        block = np.array(self.pending).T
+        times = np.array(self.pending_times)
+        self.pending = []
+        self.pending_times = []
+        self.advance(block, times)
+        return self.samples >= self.window
+
+    def advance(self, block, times):
+        """Slide the window forward over block [channel][sample] (at most one window long)."""
+        m = block.shape[1]
+        delta = block - self.buffer[:, :m]
+        self.buffer = np.concatenate((self.buffer[:, m:], block), axis=1)
+        self.times = np.concatenate((self.times[m:], times))
+        self.samples += m
+        self.frame_count += 1
+
+        if self.frame_count % self.resync_frames == 0:
+            self.spectrum = np.fft.rfft(self.buffer, axis=1)
+        else:
+            # X <- X * W^m + sum_i delta_i * W^(m - i)
+            self.spectrum = self.spectrum * self.powers[m] + delta @ self.powers[m:0:-1]
+
+        if self.samples >= self.window:
+            self.publish()
+
+    def amplitudes(self):
+        """Hann-windowed amplitude of every bin, in channel units."""
+        X = self.spectrum
+        # The Hann window in the frequency domain: 0.5 X[k] - 0.25 (X[k-1] + X[k+1]),
+        # with the neighbours past either end mirrored from the conjugate spectrum
+        below = np.concatenate((np.conj(X[:, 1:2]), X[:, :-1]), axis=1)
+        above = np.concatenate((X[:, 1:], np.conj(X[:, -2:-1])), axis=1)
+        windowed = 0.5 * X - 0.25 * (below + above)
+        # A sine of amplitude A gives A*N/4 in its Hann-windowed bin
+        return np.abs(windowed) * (4.0 / self.window)
+
+    def sample_rate(self):
+        span = self.times[-1] - self.times[0]
+        return (self.window - 1) / span if span > 0 else 0.0
+
+    def publish(self):
+        amplitudes = self.amplitudes().astype(np.float32)
+        rate = self.sample_rate()
+        self.frames.publish((self.times[-1], rate, amplitudes))
+
+        first = int(np.ceil(self.min_hz * self.window / rate)) if rate else 1
+        first = min(max(first, 1), self.bins - 1)
+        peaks = first + np.argmax(amplitudes[:, first:], axis=1)
+        derived = {}
+        for name, peak, row in zip(self.channels, peaks, amplitudes):
+            derived[f"{name}_peak_hz"] = float(peak * rate / self.window)
+            derived[f"{name}_peak_amp"] = float(row[peak])
+        # Replaced as a whole so readers on other threads see one frame's values
+        self.derived = derived
\ No newline at end of file
@@ -0,0 +1,51 @@
+# data/spsc_ring.py
+
+class SPSCRing:
+    """Single-producer/single-consumer ring with publish/consume sequence counters.
+
+    Concurrency contract: exactly one thread calls publish() and exactly one
+    thread calls consume(). The producer never blocks or waits on the
+    consumer - when the ring is full the oldest items are overwritten and
+    the consumer counts them as dropped. Only the producer writes
+    `published` and the slots; only the consumer writes `consumed`. Each of
+    those is a single reference assignment, which is atomic in CPython.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.published = 0  # written by the producer only
+        self.consumed = 0   # written by the consumer only
+        self.dropped = 0    # written by the consumer only
+
+    def publish(self, item):
+        seq = self.published
+        self.slots[seq % self.capacity] = item
+        # Make the item visible only after the slot holds it
+        self.published = seq + 1
+
+    def consume(self, max_items=None):
+        """Return every item published since the last call, oldest first."""
+        published = self.published
+        start = self.consumed
+        if published - start > self.capacity:
+            self.dropped += published - start - self.capacity
+            start = published - self.capacity
+        if max_items is not None:
+            published = min(published, start + max_items)
+
+        items = [self.slots[seq % self.capacity] for seq in range(start, published)]
+
+        # The producer may have lapped us while copying. It writes slot
+        # published % capacity before advancing published, so the item a
+        # full ring behind its current position may already be replaced too
+        overwritten = min(self.published - self.capacity + 1 - start, len(items))
+        if overwritten > 0:
+            items = items[overwritten:]
+            self.dropped += overwritten
+
+        self.consumed = published
+        return items
+
+    def pending(self):
+        return self.published - self.consumed
\ No newline at end of file
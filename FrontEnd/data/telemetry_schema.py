@@ -0,0 +1,193 @@
+# data/telemetry_schema.py
+import struct
+
+class Field:
+    """One value in the telemetry packet."""
+
+    def __init__(self, name, group, code, unit="", logged=True):
+        self.name = name
+        self.group = group  # key of the nested dict in parsed telemetry, None for top level
+        self.code = code    # struct format character
+        self.unit = unit
+        self.logged = logged
+
+
+class Bitfield:
+    """One packed byte of boolean flags, decoded into its own dict."""
+
+    def __init__(self, group, code, bits, logged=()):
+        self.name = group
+        self.group = group
+        self.code = code
+        self.bits = bits      # [(name, mask), ...]
+        self.logged = logged  # names of the flags written to recordings
+
+
+# The telemetry packet layout, in wire order. Everything else - the parser,
+# the simulator's encoder, the logger columns and the UI channel lists - is
+# generated from this table. The packet ends with a uint32 checksum.
+TELEMETRY_LAYOUT = [
+    Field("timestamp", None, "I", "ms", logged=False),
+    Field("packet_counter", None, "H", logged=False),
+    # Pressure transducers
+    Field("pt_o1_3", "pressure", "f", "PSI"),
+    Field("pt_o2_2", "pressure", "f", "PSI"),
+    Field("pt_p1_6", "pressure", "f", "PSI"),
+    Field("pt_f2_4", "pressure", "f", "PSI"),
+    Field("pt_f1_5", "pressure", "f", "PSI"),
+    Field("pt_f2_4_engine", "pressure", "f", "PSI"),
+    # Load cells
+    Field("lc_1", "load_cells", "f", "N"),
+    Field("lc_2", "load_cells", "f", "N"),
+    Field("lc_3", "load_cells", "f", "N"),
+    Field("lc_4", "load_cells", "f", "N"),
+    # Temperature
+    Field("tc_1", "temperature", "f", "°C"),
+    # Valve states
+    Bitfield("solenoid_states", "B", [("rvv_o", 0x01), ("mpv_p", 0x02), ("rvv_f", 0x04)],
+             logged=("rvv_o", "mpv_p", "rvv_f")),
+    # Servo positions
+    Field("dot_oxidizer", "servo_positions", "B"),
+    Field("mpf_f", "servo_positions", "B"),
+    Field("oxidizer_engine", "servo_positions", "B"),
+    # Injector/actuator positions
+    Field("in_1", "actuator_positions", "B", logged=False),
+    Field("ac_1", "actuator_positions", "B", logged=False),
+    Field("ac_2", "actuator_positions", "B", logged=False),
+    # System status
+    Bitfield("system_status", "B", [("armed", 0x01), ("recording", 0x02), ("error", 0x04)],
+             logged=("armed", "error")),
+]
+
+
+class TelemetrySchema:
+    """Codec and metadata generated from a packet layout.
+
+    decode/encode/flatten/unflatten/log_row are compiled once from the
+    layout, so the hot path is a single unpack_from/pack_into plus a dict
+    or list literal.
+    """
+
+    def __init__(self, layout=TELEMETRY_LAYOUT):
+        self.layout = layout
+        self.format = "<" + "".join(item.code for item in layout) + "I"
+        self.packet = struct.Struct(self.format)
+        self.size = self.packet.size
+        self.checksum = struct.Struct("<I")
+        self.checksum_offset = self.size - self.checksum.size
+
+        # Metadata for the logger and UI
+        self.groups = {}
+        self.units = {}
+        self.codes = {}
+        self.log_columns = []
+        for item in layout:
+            if isinstance(item, Bitfield):
+                self.groups[item.group] = [name for name, _ in item.bits]
+                self.log_columns += [(item.group, name, True) for name, _ in item.bits if name in item.logged]
+            else:
+                if item.group:
+                    self.groups.setdefault(item.group, []).append(item.name)
+                self.units[item.name] = item.unit
+                self.codes[item.name] = item.code
+                if item.logged:
+                    self.log_columns.append((item.group, item.name, False))
+        self.log_header = [name for _, name, _ in self.log_columns]
+
+        self._compile()
+
+    def channels(self, group):
+        """Names of the channels in a group, in packet order."""
+        return list(self.groups.get(group, []))
+
+    def analog_channels(self):
+        """{group: [names]} for every float channel."""
+        analog = {}
+        for item in self.layout:
+            if isinstance(item, Field) and item.code == "f":
+                analog.setdefault(item.group, []).append(item.name)
+        return analog
+
+    def _compile(self):
+        count = len(self.layout)
+        names = [f"v{i}" for i in range(count)]
+
+        # Nested dict literal from unpacked values v0..vN
+        top = []
+        groups = {}
+        for var, item in zip(names, self.layout):
+            if isinstance(item, Bitfield):
+                flags = ", ".join(f"{name!r}: bool({var} & {mask})" for name, mask in item.bits)
+                groups.setdefault(item.group, []).append(flags)
+            elif item.group is None:
+                top.append(f"{item.name!r}: {var}")
+            else:
+                groups.setdefault(item.group, []).append(f"{item.name!r}: {var}")
+        entries = top + [f"{group!r}: {{{', '.join(parts)}}}" for group, parts in groups.items()]
+        dict_literal = "{" + ", ".join(entries + ["'checksum': checksum"]) + "}"
+
+        # Expressions pulling each packed value back out of a telemetry dict
+        getters = []
+        for item in self.layout:
+            if isinstance(item, Bitfield):
+                bits = " | ".join(f"({mask} if t[{item.group!r}][{name!r}] else 0)" for name, mask in item.bits)
+                getters.append(f"({bits})")
+            elif item.group is None:
+                getters.append(f"t[{item.name!r}]")
+            else:
+                getters.append(f"t[{item.group!r}][{item.name!r}]")
+
+        # Recording row values; flags are logged as 0/1
+        log_values = [f"int(t[{group!r}][{name!r}])" if flag else f"t[{group!r}][{name!r}]"
+                      for group, name, flag in self.log_columns]
+
+        unpacked = ", ".join(names) + ", checksum"
+        values = ", ".join(names)
+        source = f"""
+def decode(buffer, offset=0):
+    {unpacked} = unpack_from(buffer, offset)
+    return {dict_literal}
+
+def unflatten(values, checksum=0):
+    {values}, = values
+    return {dict_literal}
+
+def flatten(t):
+    return [{", ".join(getters)}]
+
+def encode_into(buffer, offset, t):
+    pack_into(buffer, offset, {", ".join(getters)}, 0)
+
+def log_row(t):
+    return [{", ".join(log_values)}]
+"""
+        namespace = {"unpack_from": self.packet.unpack_from, "pack_into": self.packet.pack_into}
+        exec(source, namespace)
+        self.decode = namespace["decode"]
+        self.unflatten = namespace["unflatten"]
+        self.flatten = namespace["flatten"]
+        self._encode_into = namespace["encode_into"]
+        self.log_row = namespace["log_row"]
+
+    @staticmethod
+    def calculate_checksum(data):
+        # Simple additive checksum used by the avionics board
+        return sum(data) & 0xFFFFFFFF
+
+    def received_checksum(self, buffer):
+        return self.checksum.unpack_from(buffer, self.checksum_offset)[0]
+
+    def encode_into(self, buffer, offset, telemetry):
+        """Pack telemetry and its checksum into a writable buffer."""
+        self._encode_into(buffer, offset, telemetry)
+        view = memoryview(buffer)[offset:offset + self.checksum_offset]
+        self.checksum.pack_into(buffer, offset + self.checksum_offset, self.calculate_checksum(view))
+
+    def encode(self, telemetry):
+        buffer = bytearray(self.size)
+        self.encode_into(buffer, 0, telemetry)
+        return bytes(buffer)
+
+
+# Shared instance for the whole application
+TELEMETRY_SCHEMA = TelemetrySchema()
\ No newline at end of file
@@ -0,0 +1,165 @@
+# data/time_index.py
+import os
+import csv
+import itertools
+from bisect import bisect_left, bisect_right
+
+from data.data_logger import EVENT_COLUMNS, INDEX_HEADER
+from data.log_reader import (segment_paths, segment_restarts, load_manifest, open_segment, open_segment_at,
+                             iter_events, merge_timeline)
+
+def index_path_for(path):
+    """Return the sidecar index path for a recording (manifest or CSV)."""
+    if path.endswith(".manifest.json"):
+        manifest = load_manifest(path)
+        if manifest.get("index"):
+            return os.path.join(os.path.dirname(path), manifest["index"])
+        return path[:-len(".manifest.json")] + ".index.csv"
+    return path + ".index.csv"
+
+def build_index(path, index_interval=100):
+    """Scan an unindexed recording once and write its sidecar index.
+
+    Useful for logs recorded before the logger maintained an index.
+    """
+    index_path = index_path_for(path)
+    with open(index_path, 'w', newline='') as out:
+        writer = csv.writer(out)
+        writer.writerow(INDEX_HEADER)
+        for segment_number, segment in enumerate(segment_paths(path), start=1):
+            with open_segment(segment) as f:
+                header_line = f.readline()
+                header = header_line.strip().split(",")
+                t_col, e_col = header.index("timestamp"), header.index("elapsed_time")
+                event_cols = [(name, header.index(name)) for name in EVENT_COLUMNS if name in header]
+                last = None
+                offset = len(header_line.encode())
+                row_number = 0
+                for line in iter(f.readline, ""):
+                    row = line.rstrip("\r\n").split(",")
+                    if row_number % index_interval == 0:
+                        writer.writerow(["point", row[t_col], row[e_col], segment_number, offset, "", ""])
+                    values = [row[i] for _, i in event_cols]
+                    if last is not None:
+                        for (name, _), old, new in zip(event_cols, last, values):
+                            if old != new:
+                                writer.writerow(["event", row[t_col], row[e_col], segment_number, offset, name, new])
+                    last = values
+                    offset += len(line.encode())
+                    row_number += 1
+    return index_path
+
+
+class RecordingIndex:
+    """Sparse time index over a recording for O(log n) seeking.
+
+    Seek points map timestamp and elapsed_time to (segment, byte offset);
+    events record each change of a valve or system status channel, and
+    log_events hold the recording's commands, acks and operator actions.
+    A seek into a compressed segment decompresses from the nearest restart
+    point, at most data_logger.RESTART_BYTES before the row.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.segments = segment_paths(path)
+        self.restarts = segment_restarts(path)
+        self.headers = {}  # segment number -> CSV header, once read
+        self.point_elapsed = []
+        self.point_timestamps = []
+        self.point_locations = []
+        self.events = []
+
+        with open(index_path_for(path), 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for kind, timestamp, elapsed, segment, offset, channel, state in reader:
+                location = (int(segment), int(offset))
+                if kind == "point":
+                    self.point_timestamps.append(float(timestamp))
+                    self.point_elapsed.append(float(elapsed))
+                    self.point_locations.append(location)
+                else:
+                    self.events.append({
+                        "timestamp": float(timestamp),
+                        "elapsed_time": float(elapsed),
+                        "channel": channel,
+                        "state": int(state),
+                        "location": location
+                    })
+        self.log_events = list(iter_events(path))
+        self.log_event_elapsed = [event["elapsed_time"] for event in self.log_events]
+
+    def locate_elapsed(self, elapsed_time):
+        """Return the (segment, offset) of the last seek point at or before elapsed_time."""
+        i = bisect_right(self.point_elapsed, elapsed_time) - 1
+        return self.point_locations[max(i, 0)]
+
+    def locate_timestamp(self, timestamp):
+        """Return the (segment, offset) of the last seek point at or before a ms timestamp."""
+        i = bisect_right(self.point_timestamps, timestamp) - 1
+        return self.point_locations[max(i, 0)]
+
+    def find_event(self, channel, state=None, occurrence=0):
+        """Return the nth change of a channel (optionally to a given state), or None."""
+        matches = [event for event in self.events
+                   if event["channel"] == channel and (state is None or event["state"] == state)]
+        if occurrence < len(matches):
+            return matches[occurrence]
+        return None
+
+    def rows_from(self, elapsed_time):
+        """Yield rows as dicts starting at the first row with elapsed_time >= the target.
+
+        Only the rows between the nearest seek point and the target are read
+        and skipped; reading continues across later segments.
+        """
+        if not self.point_locations:
+            return
+        segment, offset = self.locate_elapsed(elapsed_time)
+        for number in range(segment, len(self.segments) + 1):
+            path = self.segments[number - 1]
+            start = offset if number == segment else 0
+            with open_segment_at(path, start, self.restarts[number - 1]) as f:
+                reader = csv.reader(f)
+                if start:
+                    header = self.headers.get(number) or self.header(number)
+                else:
+                    header = self.headers[number] = next(reader, None)
+                    if header is None:
+                        continue
+                e_col = header.index("elapsed_time")
+                for row in reader:
+                    if float(row[e_col]) >= elapsed_time:
+                        yield dict(zip(header, row))
+
+    def header(self, number):
+        # Only the first block of a compressed segment is decompressed
+        with open_segment(self.segments[number - 1]) as f:
+            self.headers[number] = next(csv.reader(f))
+        return self.headers[number]
+
+    def find_log_event(self, name, kind=None, occurrence=0):
+        """Return the nth logged event with a name (e.g. "abort"), or None."""
+        matches = [event for event in self.log_events
+                   if event["name"] == name and (kind is None or event["kind"] == kind)]
+        if occurrence < len(matches):
+            return matches[occurrence]
+        return None
+
+    def timeline(self, start, end):
+        """Yield ("sample", row) and ("event", event) between two elapsed times, in order.
+
+        Seeks to the first row via the index, so only the window is read.
+        """
+        first = bisect_left(self.log_event_elapsed, start)
+        last = bisect_right(self.log_event_elapsed, end)
+        rows = itertools.takewhile(lambda row: float(row["elapsed_time"]) <= end, self.rows_from(start))
+        return merge_timeline(rows, self.log_events[first:last])
+
+    def rows_after_event(self, channel, seconds, state=None, occurrence=0):
+        """Yield rows starting a number of seconds after a channel event, e.g. T+12.5 s after MPV-P opened."""
+        event = self.find_event(channel, state, occurrence)
+        if event is None:
+            return iter(())
+        return self.rows_from(event["elapsed_time"] + seconds)
\ No newline at end of file
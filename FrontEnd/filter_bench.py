@@ -0,0 +1,48 @@
+# filter_bench.py
+import sys
+import time
+import argparse
+
+from data.packet_parser import PacketParser
+from data.filters import FilterBank
+from scenario import ScenarioRunner, hot_fire_scenario
+
+def run_rate(samples, rate, frame_rate):
+    """Filter samples in the batches a display at frame_rate sees from a rate Hz source.
+
+    Returns (samples per second, fraction of one core needed in real time).
+    """
+    bank = FilterBank(rate=rate)
+    batch = max(int(rate / frame_rate), 1)
+    started = time.perf_counter()
+    for start in range(0, len(samples), batch):
+        bank.process(samples[start:start + batch])
+    elapsed = time.perf_counter() - started
+    return len(samples) / elapsed, elapsed / (len(samples) / rate)
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the display filter chains")
+    parser.add_argument("--samples", type=int, default=20000, help="Samples filtered per rate")
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 1000, 5000, 10000],
+                        help="Source rates in Hz")
+    parser.add_argument("--frame-rate", type=float, default=30.0, help="Display frames per second")
+    args = parser.parse_args()
+
+    packets = []
+    ScenarioRunner(hot_fire_scenario(args.samples / 100.0), seed=1, rate=100).run(
+        lambda packet, t: packets.append(packet), duration=args.samples / 100.0)
+    packet_parser = PacketParser()
+    samples = [packet_parser.parse_telemetry(packet) for packet in packets]
+    channels = len(FilterBank().channels)
+
+    print(f"{len(samples)} samples, {channels} channels, batches per {1000 / args.frame_rate:.0f} ms frame")
+    print(f"{'rate Hz':>8} {'batch':>6} {'samples/s':>12} {'channel-samples/s':>18} {'core use':>9}")
+    for rate in args.rates:
+        samples_per_second, load = run_rate(samples, rate, args.frame_rate)
+        batch = max(int(rate / args.frame_rate), 1)
+        print(f"{rate:8,.0f} {batch:6d} {samples_per_second:12,.0f} {samples_per_second * channels:18,.0f} "
+              f"{load:9.1%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,111 @@
+# ingest.py
+import sys
+import time
+import argparse
+import threading
+
+from network.multi_receiver import MultiSourceReceiver, TelemetrySource
+from network.telemetry_relay import TelemetryRelay
+from network.telemetry_http import TelemetryHTTPServer
+from network.source_config import add_ingest_arguments, finish_ingest_arguments
+from data.packet_parser import PacketParser
+from data.data_store import DataStore
+from data.data_logger import DataLogger
+from data.recovery import recover_directory
+from data.shared_bus import SharedTelemetryBus
+
+class IngestProcess:
+    """Receive, log and publish telemetry in its own process.
+
+    Decoded samples go into a shared-memory bus that the UI process
+    (main.py --bus NAME) reads, so heavy repaints cannot delay recvfrom.
+    """
+
+    def __init__(self, bus_name, sources, relay_port=None, relay_multicast=None, sync_interval=None,
+                 http_port=None, http_address="127.0.0.1"):
+        self.bus = SharedTelemetryBus(bus_name, create=True)
+
+        # Repair recordings cut short by a crash before starting new ones
+        for report in recover_directory("logs"):
+            print(f"Recovered {report['session']}: {report['rows']} rows, "
+                  f"{report['bytes_dropped']} torn bytes dropped")
+        self.sources = [TelemetrySource(name, port, address,
+                                        DataStore(name=name, data_logger=DataLogger(source_name=name,
+                                                                                    sync_interval=sync_interval)))
+                        for name, port, address in sources]
+
+        self.relay = None
+        if relay_port is not None or relay_multicast:
+            self.relay = TelemetryRelay(port=relay_port or 5565, multicast_group=relay_multicast)
+            self.relay.start()
+
+        self.receiver = MultiSourceReceiver(PacketParser(), self.sources, relay=self.relay, bus=self.bus)
+
+        # Optional JSON endpoint for dashboards and overlays that don't run the UI
+        self.http_server = None
+        if http_port is not None:
+            self.http_server = TelemetryHTTPServer(self.receiver, ip=http_address, port=http_port, relay=self.relay)
+            self.http_server.start()
+        self.running = False
+
+    def run(self):
+        self.running = True
+        event_seq = self.bus.event_sequence()
+        receiver_thread = threading.Thread(target=self.receiver.start_receiving, daemon=True)
+        receiver_thread.start()
+
+        try:
+            # Follow recording requests from the UI and publish a heartbeat
+            while self.running and not self.bus.stop_requested():
+                self.bus.heartbeat()
+                # Commands, acks and operator actions from the UI process, before any
+                # recording change so the last ones make it into the recording
+                event_seq, events, lost = self.bus.read_events(event_seq)
+                if lost:
+                    print(f"{lost} events from the UI were overwritten before they were recorded")
+                for source_index, event_time, kind, name, detail in events:
+                    if source_index < len(self.sources):
+                        self.sources[source_index].data_store.data_logger.log_event(kind, name, detail,
+                                                                                    event_time=event_time)
+                requested = self.bus.recording_requested()
+                if requested != self.bus.recording_state():
+                    for source in self.sources:
+                        if requested:
+                            source.data_store.start_recording()
+                        else:
+                            source.data_store.stop_recording()
+                    self.bus.set_recording_state(requested)
+                    print("Recording started" if requested else "Recording stopped")
+                time.sleep(0.05)
+        finally:
+            if self.http_server:
+                self.http_server.stop()
+            self.receiver.stop_receiving()
+            for source in self.sources:
+                source.data_store.stop_recording()
+                source.data_store.data_logger.wait_for_compression(timeout=30)
+            self.bus.close()
+
+    def stop(self):
+        self.running = False
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry ingest process")
+    add_ingest_arguments(parser)
+    # run.py passes its arguments to both processes; the UI's own options are not ours
+    args, _ = parser.parse_known_args()
+    args = finish_ingest_arguments(args)
+    if not args.bus:
+        parser.error("--bus is required")
+
+    ingest = IngestProcess(args.bus, args.sources, args.relay_port, args.relay_multicast, args.sync_interval,
+                           args.http_port, args.http_address)
+    try:
+        print(f"Ingest process publishing to shared memory '{args.bus}'")
+        ingest.run()
+    except KeyboardInterrupt:
+        print("Stopping ingest process...")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
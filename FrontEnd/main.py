@@ -1,67 +1,132 @@
-# main.py
-import sys
-import threading
-import socket
-import struct
-import time
-from PyQt5.QtWidgets import QApplication, QMainWindow
-from PyQt5.QtCore import QTimer
-
-# Custom modules
-from ui.main_window import MainWindow
-from network.telemetry_receiver import TelemetryReceiver
-from network.command_sender import CommandSender
-from data.packet_parser import PacketParser
-from data.data_store import DataStore
-from PyQt5.QtGui import QPalette, QColor
-
-class RocketMonitorApp:
-    def __init__(self):
-        # Create the Qt application
-        self.app = QApplication(sys.argv)
-
-        self.app.setStyle("Fusion")
-        palette = QPalette()
-        palette.setColor(QPalette.Window, QColor(255, 255, 255))
-        palette.setColor(QPalette.WindowText, QColor(0, 0, 0))
-        palette.setColor(QPalette.Base, QColor(255, 255, 255))
-        palette.setColor(QPalette.AlternateBase, QColor(245, 245, 245))
-        palette.setColor(QPalette.ToolTipBase, QColor(255, 255, 255))
-        palette.setColor(QPalette.ToolTipText, QColor(0, 0, 0))
-        palette.setColor(QPalette.Text, QColor(0, 0, 0))
-        palette.setColor(QPalette.Button, QColor(240, 240, 240))
-        palette.setColor(QPalette.ButtonText, QColor(0, 0, 0))
-        palette.setColor(QPalette.BrightText, QColor(255, 0, 0))
-        palette.setColor(QPalette.Highlight, QColor(76, 163, 224))
-        palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
-        self.app.setPalette(palette)
-        
-        # Initialize data store
-        self.data_store = DataStore()
-        
-        # Initialize packet parser
-        self.packet_parser = PacketParser()
-        
-        # Initialize network components
-        self.telemetry_receiver = TelemetryReceiver(self.packet_parser, self.data_store)
-        self.command_sender = CommandSender()
-        
-        # Create main window
-        self.main_window = MainWindow(self.command_sender, self.data_store)
-        
-        # Start the telemetry receiver thread
-        self.telemetry_thread = threading.Thread(target=self.telemetry_receiver.start_receiving, daemon=True)
-        self.telemetry_thread.start()
-        
-        # Setup UI update timer (20 Hz)
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.main_window.update_ui)
-        self.update_timer.start(50)  # 50ms = 20Hz
-
-    def run(self):
-        self.main_window.show()
-        return self.app.exec_()
-
-if __name__ == "__main__":
-    app = RocketMonitorApp()
+# main.py
+import os
+import sys
+import threading
+import socket
+import struct
+import time
+import argparse
+from PyQt5.QtWidgets import QApplication, QMainWindow
+
+# Custom modules
+from ui.main_window import MainWindow
+from network.multi_receiver import MultiSourceReceiver, TelemetrySource
+from network.telemetry_relay import TelemetryRelay
+from network.telemetry_http import TelemetryHTTPServer
+from network.source_config import add_ingest_arguments, finish_ingest_arguments, DEFAULT_SOURCES
+from network.command_sender import CommandSender
+from data.packet_parser import PacketParser
+from data.data_store import DataStore
+from data.data_logger import DataLogger
+from data.recovery import recover_directory
+from data.checkpoint import StoreCheckpoint
+from data.shared_bus import SharedTelemetryBus, BusRecordingControl, BusFeeder
+from PyQt5.QtGui import QPalette, QColor
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Rocket Monitoring System")
+    add_ingest_arguments(parser)
+    parser.add_argument("--checkpoint-seconds", type=float, default=1.0,
+                        help="Checkpoint plot history this often so a restart restores it (0 disables)")
+    args, _ = parser.parse_known_args(argv)
+    return finish_ingest_arguments(args)
+
+class RocketMonitorApp:
+    def __init__(self, sources=None, relay_port=None, relay_multicast=None, bus_name=None, sync_interval=None,
+                 http_port=None, http_address="127.0.0.1", checkpoint_interval=1.0):
+        # Create the Qt application
+        self.app = QApplication(sys.argv)
+
+        self.app.setStyle("Fusion")
+        palette = QPalette()
+        palette.setColor(QPalette.Window, QColor(255, 255, 255))
+        palette.setColor(QPalette.WindowText, QColor(0, 0, 0))
+        palette.setColor(QPalette.Base, QColor(255, 255, 255))
+        palette.setColor(QPalette.AlternateBase, QColor(245, 245, 245))
+        palette.setColor(QPalette.ToolTipBase, QColor(255, 255, 255))
+        palette.setColor(QPalette.ToolTipText, QColor(0, 0, 0))
+        palette.setColor(QPalette.Text, QColor(0, 0, 0))
+        palette.setColor(QPalette.Button, QColor(240, 240, 240))
+        palette.setColor(QPalette.ButtonText, QColor(0, 0, 0))
+        palette.setColor(QPalette.BrightText, QColor(255, 0, 0))
+        palette.setColor(QPalette.Highlight, QColor(76, 163, 224))
+        palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
+        self.app.setPalette(palette)
+        
+        sources = sources or DEFAULT_SOURCES
+        self.relay = None
+        self.bus = None
+        self.http_server = None
+        
+        # Per-source checkpoints in logs/, so a restarted app comes back with its plots
+        def checkpoint(name):
+            if not checkpoint_interval:
+                return None
+            return StoreCheckpoint(os.path.join("logs", f"checkpoint_{name}.bin"), interval=checkpoint_interval)
+        
+        if bus_name:
+            # Ingest and logging run in a separate process (ingest.py); this
+            # process only reads decoded samples from the shared-memory bus
+            self.bus = SharedTelemetryBus.attach(bus_name)
+            # Only operator events (commands, acks, notes) go back over the bus;
+            # ingest derives the burn events itself
+            self.data_stores = {name: DataStore(name=name, data_logger=BusRecordingControl(self.bus, index),
+                                                checkpoint=checkpoint(name), performance_events=False)
+                                for index, (name, port, address) in enumerate(sources)}
+            self.telemetry_receiver = None
+            self.bus_feeder = BusFeeder(self.bus, list(self.data_stores.values()))
+        else:
+            # Repair recordings cut short by a crash before starting new ones
+            for report in recover_directory("logs"):
+                print(f"Recovered {report['session']}: {report['rows']} rows, "
+                      f"{report['bytes_dropped']} torn bytes dropped")
+            
+            # Initialize one data store per telemetry source
+            self.sources = [TelemetrySource(name, port, address,
+                                            DataStore(name=name, data_logger=DataLogger(source_name=name,
+                                                                                        sync_interval=sync_interval),
+                                                      checkpoint=checkpoint(name)))
+                            for name, port, address in sources]
+            self.data_stores = {source.name: source.data_store for source in self.sources}
+            
+            # Initialize packet parser
+            self.packet_parser = PacketParser()
+            
+            # Optional relay so other consoles can watch without binding the telemetry port
+            if relay_port is not None or relay_multicast:
+                self.relay = TelemetryRelay(port=relay_port or 5565, multicast_group=relay_multicast)
+                self.relay.start()
+            
+            # Initialize network components - all sources share one receiver thread
+            self.telemetry_receiver = MultiSourceReceiver(self.packet_parser, self.sources, relay=self.relay)
+            
+            # Optional JSON endpoint; with --bus the ingest process serves it instead
+            if http_port is not None:
+                self.http_server = TelemetryHTTPServer(self.telemetry_receiver, ip=http_address,
+                                                       port=http_port, relay=self.relay)
+                self.http_server.start()
+        
+        self.data_store = next(iter(self.data_stores.values()))
+        self.command_sender = CommandSender()
+        
+        # Create main window
+        self.main_window = MainWindow(self.command_sender, self.data_store,
+                                      data_stores=self.data_stores,
+                                      telemetry_receiver=self.telemetry_receiver)
+        
+        # Start the telemetry receiver thread (or the bus reader)
+        if self.bus:
+            self.bus_feeder.start()
+        else:
+            self.telemetry_thread = threading.Thread(target=self.telemetry_receiver.start_receiving, daemon=True)
+            self.telemetry_thread.start()
+
+    def run(self):
+        self.main_window.show()
+        return self.app.exec_()
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    app = RocketMonitorApp(args.sources, args.relay_port, args.relay_multicast, args.bus, args.sync_interval,
+                           args.http_port, args.http_address, args.checkpoint_seconds)
     sys.exit(app.run())
\ No newline at end of file
@@ -0,0 +1,184 @@
+# memory_bench.py
+import os
+import sys
+import gc
+import json
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+
+from data.packet_parser import PacketParser
+from data.data_store import DataStore
+from data.data_logger import DataLogger
+from data.telemetry_schema import TELEMETRY_SCHEMA
+from scenario import ScenarioRunner, hot_fire_scenario
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_baseline.json")
+
+def make_packets(count, rate):
+    """Deterministic packets from the scripted hot fire scenario."""
+    packets = []
+    runner = ScenarioRunner(hot_fire_scenario(count / rate), seed=1, rate=rate)
+    runner.run(lambda packet, t: packets.append(packet), duration=count / rate)
+    return packets
+
+def retained_bytes(action, count):
+    """Bytes still allocated after calling action(i) for i in range(count), per call."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    blocks_before = sys.getallocatedblocks()
+    keep = [action(i) for i in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+    # Don't charge the benchmark's own list of results to the stage
+    list_bytes = sys.getsizeof(keep)
+    del keep
+    return (after - before - list_bytes) / count, blocks / count
+
+def measure_parsed_sample(packets):
+    parser = PacketParser()
+    per_sample, _ = retained_bytes(lambda i: parser.parse_telemetry(packets[i]), len(packets))
+    return per_sample
+
+def subscribe_like_ui(store):
+    """Subscribe a store as the UI does, with every analog channel kept and every sample taken."""
+    analog = [name for names in TELEMETRY_SCHEMA.analog_channels().values() for name in names]
+    store.subscribe("history", analog, history=True, rate=0)
+    store.subscribe("display", analog, rate=None)
+
+def measure_data_store_sample(packets, log_directory):
+    # Stay under every cap (ring, raw history) so each sample is fully retained
+    parser = PacketParser()
+    store = DataStore(name="bench", data_logger=DataLogger(log_directory=log_directory))
+    subscribe_like_ui(store)
+    count = min(len(packets), store.samples.capacity - 1)
+
+    def ingest(i):
+        store.update_telemetry(parser.parse_telemetry(packets[i]))
+
+    per_sample, blocks = retained_bytes(ingest, count)
+    return per_sample, blocks
+
+def measure_ui_series_sample(packets):
+    """Bytes per sample of MainWindow's plotted series, via MainWindow.append_sample."""
+    try:
+        from ui.main_window import MainWindow
+    except ImportError as e:
+        print(f"Skipping UI series stage: {e}")
+        return None
+
+    class Series:
+        pass
+
+    series = Series()
+    series.start_time = 0.0
+    # The default tab, with the most series
+    series.live_tab = "Overview"
+    series.time_data = []
+    series.pressure_data = {name: [] for name in TELEMETRY_SCHEMA.channels("pressure")}
+    series.engine_data = {"pressure": [], "load": {"lc_1": [], "lc_2": []}, "temp": []}
+    series.tank_data = {"ox_pressure": [], "ox_load": [], "fuel_pressure": [], "press_pressure": []}
+
+    parser = PacketParser()
+    parsed = [parser.parse_telemetry(packet) for packet in packets]
+    per_sample, _ = retained_bytes(lambda i: MainWindow.append_sample(series, i * 0.01, parsed[i]), len(parsed))
+    return per_sample
+
+def measure_ingest(packets, log_directory):
+    """Peak and final traced memory for pushing every packet through parser and DataStore."""
+    parser = PacketParser()
+    gc.collect()
+    tracemalloc.start()
+    store = DataStore(name="bench", data_logger=DataLogger(log_directory=log_directory))
+    subscribe_like_ui(store)
+    transient = 0
+    for n, packet in enumerate(packets):
+        if n % 1000 == 0 and n:
+            # Sample the hot path's short-lived allocations on one packet in a
+            # thousand; the first packet also applies the subscriptions, once
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            store.update_telemetry(parser.parse_telemetry(packet))
+            transient = max(transient, tracemalloc.get_traced_memory()[1] - current)
+        else:
+            store.update_telemetry(parser.parse_telemetry(packet))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, current, transient
+
+def run(minutes, rate):
+    count = int(minutes * 60 * rate)
+    print(f"Generating {count} packets ({minutes} min at {rate} Hz)...")
+    packets = make_packets(count, rate)
+    log_directory = tempfile.mkdtemp(prefix="memory_bench_")
+    try:
+        sample_packets = packets[:4000]
+        results = {}
+        results["parsed_sample_bytes"] = measure_parsed_sample(sample_packets)
+        results["data_store_sample_bytes"], results["retained_blocks_per_packet"] = \
+            measure_data_store_sample(sample_packets, log_directory)
+        ui_bytes = measure_ui_series_sample(sample_packets)
+        if ui_bytes is not None:
+            results["ui_series_sample_bytes"] = ui_bytes
+        peak, final, transient = measure_ingest(packets, log_directory)
+        results["ingest_peak_bytes"] = peak
+        results["ingest_final_bytes"] = final
+        results["transient_bytes_per_packet"] = transient
+    finally:
+        shutil.rmtree(log_directory, ignore_errors=True)
+    return results
+
+def compare(results, baseline, tolerance, compare_totals):
+    """Print each metric against its baseline; returns False if any regressed."""
+    ok = True
+    for name, value in results.items():
+        reference = baseline.get("metrics", {}).get(name)
+        if name.startswith("ingest_") and not compare_totals:
+            reference = None  # totals depend on duration and rate
+        if reference is None:
+            print(f"  {name:32} {value:14,.1f}")
+            continue
+        limit = reference * (1 + tolerance)
+        status = "OK" if value <= limit else "REGRESSION"
+        ok = ok and value <= limit
+        print(f"  {name:32} {value:14,.1f}   baseline {reference:14,.1f}   {status}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory footprint benchmarks for the telemetry path")
+    parser.add_argument("--minutes", type=float, default=None, help="Minutes of ingest for the peak measurement")
+    parser.add_argument("--rate", type=float, default=None, help="Telemetry rate in Hz")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=None, help="Allowed growth over baseline, e.g. 0.1")
+    parser.add_argument("--update-baseline", action="store_true", help="Record these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    minutes = args.minutes or baseline.get("minutes", 10)
+    rate = args.rate or baseline.get("rate", 100)
+    tolerance = args.tolerance if args.tolerance is not None else baseline.get("tolerance", 0.1)
+
+    results = run(minutes, rate)
+    compare_totals = minutes == baseline.get("minutes") and rate == baseline.get("rate")
+    ok = compare(results, baseline, tolerance, compare_totals)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"minutes": minutes, "rate": rate, "tolerance": tolerance,
+                       "python": sys.version.split()[0], "metrics": results}, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not ok:
+        print("Memory use regressed beyond the baseline")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,247 @@
+# network/command_tracker.py
+import time
+import queue
+import threading
+from collections import deque
+
+# Command types as sent by CommandSender
+COMMAND_TYPES = {
+    0x01: "Solenoid",
+    0x02: "Servo",
+    0x03: "Actuator",
+    0x04: "Arm",
+    0x05: "Start",
+    0x06: "Abort"
+}
+
+# Commands that set a state, so sending them twice is harmless. Start is
+# never retried: a lost ack does not mean the sequence didn't start.
+IDEMPOTENT_COMMANDS = {0x01, 0x02, 0x03, 0x04, 0x06}
+
+# Upper bounds of the round-trip histogram buckets, in ms; one more bucket catches the rest
+RTT_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+class LatencyHistogram:
+    """Round-trip times for one command type, in fixed log-spaced buckets."""
+
+    def __init__(self, bounds=RTT_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.timeouts = 0
+        self.failures = 0
+
+    def record(self, rtt_ms):
+        index = 0
+        while index < len(self.bounds) and rtt_ms > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += rtt_ms
+        self.minimum = rtt_ms if self.minimum is None else min(self.minimum, rtt_ms)
+        self.maximum = rtt_ms if self.maximum is None else max(self.maximum, rtt_ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile."""
+        if not self.count:
+            return None
+        target = self.count * p / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else self.maximum
+        return self.maximum
+
+    def labels(self):
+        return [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else None,
+            "min_ms": self.minimum,
+            "max_ms": self.maximum,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "timeouts": self.timeouts,
+            "failures": self.failures
+        }
+
+
+class CommandTracker:
+    """Send commands through a CommandSender and keep track of the outcome.
+
+    Every ack is checked against the id that was sent (CommandSender
+    verifies the id and checksum). Commands that got no valid answer -
+    timeout, refused connection, bad ack - are retried with exponential
+    backoff if they are idempotent. A rejection from the device is an
+    answer and is never retried. Round-trip times are kept per command
+    type, and the recent results are kept for display.
+
+    If given, event_sink(kind, name, detail) is called from the sending
+    thread with a "command" event before each send and an "ack" event
+    with the result, so they can be recorded with the telemetry.
+
+    Ordinary commands are queued and sent in order on one worker thread.
+    Safety commands (abort, emergency stop) skip the queue: submit_safety()
+    drops everything still queued, stops the command in flight from
+    retrying, and sends them at once on a thread of their own, so they
+    never wait behind a dead link's timeouts or behind each other.
+    """
+
+    def __init__(self, command_sender, timeout=1.0, retries=2, backoff=0.05,
+                 timeouts=None, history_length=50, event_sink=None):
+        self.command_sender = command_sender
+        self.event_sink = event_sink
+        self.timeout = timeout
+        self.timeouts = timeouts or {}  # per command type overrides, in seconds
+        self.retries = retries
+        self.backoff = backoff
+        self.histograms = {name: LatencyHistogram() for name in COMMAND_TYPES.values()}
+        self.recent = deque(maxlen=history_length)
+        self.version = 0  # bumped on every result so the UI can tell when to redraw
+        self.lock = threading.Lock()
+
+        # Queued commands are sent in order on one worker thread. Each
+        # carries the generation it was queued in; a safety action starts a
+        # new one, which cancels everything older
+        self.queue = queue.Queue()
+        self.worker = None
+        self.generation = 0
+        self.cancel_reason = None
+
+    def submit(self, command_type, device_id, command_value):
+        """Queue a command without blocking the caller."""
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._run, daemon=True)
+            self.worker.start()
+        self.queue.put((command_type, device_id, command_value, self.generation))
+
+    def submit_safety(self, commands, reason):
+        """Send [(command_type, device_id, command_value), ...] now, ahead of anything queued.
+
+        Queued commands are dropped, and the one being sent is not retried.
+        """
+        with self.lock:
+            self.generation += 1
+            self.cancel_reason = reason
+        try:
+            while True:
+                self.cancel(*self.queue.get_nowait()[:3], reason)
+        except queue.Empty:
+            pass
+        thread = threading.Thread(target=self._send_all, args=(commands,), daemon=True)
+        thread.start()
+        return thread
+
+    def _send_all(self, commands):
+        for command in commands:
+            self.send(*command)
+
+    def _run(self):
+        while True:
+            command_type, device_id, command_value, generation = self.queue.get()
+            if generation != self.generation:
+                self.cancel(command_type, device_id, command_value, self.cancel_reason)
+                continue
+            self.send(command_type, device_id, command_value, generation)
+
+    def cancel(self, command_type, device_id, command_value, reason):
+        """Record a queued command that was dropped without being sent."""
+        name = COMMAND_TYPES.get(command_type, f"Type {command_type}")
+        result = {
+            "time": time.time(),
+            "type": name,
+            "device_id": device_id,
+            "value": command_value,
+            "command_id": None,
+            "attempts": 0,
+            "status": "CANCELLED",
+            "message": f"Dropped for {reason}",
+            "rtt_ms": None,
+            "timed_out": False
+        }
+        with self.lock:
+            self.recent.append(result)
+            self.version += 1
+        if self.event_sink:
+            self.event_sink("cancelled", name, {key: result[key] for key in ("device_id", "value", "message")})
+        print(f"Command {name} device={device_id} value={command_value}: {describe_result(result)}")
+
+    def send(self, command_type, device_id, command_value, generation=None):
+        """Send a command, retrying if allowed, and return the result.
+
+        A command queued in an earlier generation than the current one
+        (a safety action came since) is not retried.
+        """
+        name = COMMAND_TYPES.get(command_type, f"Type {command_type}")
+        timeout = self.timeouts.get(command_type, self.timeout)
+        attempts = 1 + (self.retries if command_type in IDEMPOTENT_COMMANDS else 0)
+        if self.event_sink:
+            self.event_sink("command", name, {"device_id": device_id, "value": command_value})
+
+        for attempt in range(1, attempts + 1):
+            ack = self.command_sender.send_command(command_type, device_id, command_value, timeout=timeout)
+            if "status_code" in ack:
+                break  # the device answered, even if it said no
+            if generation is not None and generation != self.generation:
+                ack["message"] += f"; not retried after {self.cancel_reason}"
+                break
+            if attempt < attempts:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+        result = {
+            "time": time.time(),
+            "type": name,
+            "device_id": device_id,
+            "value": command_value,
+            "command_id": ack["sent_command_id"],
+            "attempts": attempt,
+            "status": ack["status"],
+            "message": ack["message"],
+            "rtt_ms": ack["rtt_ms"] if "status_code" in ack else None,
+            "timed_out": ack.get("timed_out", False)
+        }
+
+        with self.lock:
+            histogram = self.histograms.setdefault(name, LatencyHistogram())
+            if "status_code" in ack:
+                histogram.record(ack["rtt_ms"])
+            elif result["timed_out"]:
+                histogram.timeouts += 1
+            else:
+                histogram.failures += 1
+            self.recent.append(result)
+            self.version += 1
+
+        if self.event_sink:
+            self.event_sink("ack", name, {key: result[key] for key in
+                                          ("device_id", "value", "command_id", "attempts", "status",
+                                           "message", "rtt_ms", "timed_out")})
+
+        print(f"Command {name} device={device_id} value={command_value}: {describe_result(result)}")
+        return result
+
+    def snapshot(self):
+        """Return (version, recent results, {type: (labels, counts, summary)})."""
+        with self.lock:
+            histograms = {name: (histogram.labels(), list(histogram.counts), histogram.summary())
+                          for name, histogram in self.histograms.items()}
+            return self.version, list(self.recent), histograms
+
+
+def describe_result(result):
+    """One line for operators, e.g. 'OK in 4.2 ms' or 'timed out after 3 attempts'."""
+    if result["status"] == "CANCELLED":
+        return f"not sent, {result['message'].lower()}"
+    tries = f" after {result['attempts']} attempts" if result["attempts"] > 1 else ""
+    if result["rtt_ms"] is not None:
+        return f"{result['status']} ({result['message']}) in {result['rtt_ms']:.1f} ms{tries}"
+    if result["timed_out"]:
+        return f"timed out{tries}"
+    return f"failed: {result['message']}{tries}"
\ No newline at end of file
@@ -0,0 +1,145 @@
+# network/multi_receiver.py
+import socket
+import selectors
+
+from data.data_store import DataStore
+
+class TelemetrySource:
+    """One telemetry source: a port, optionally narrowed to a sender address."""
+
+    def __init__(self, name, port, address=None, data_store=None):
+        self.name = name
+        self.port = port
+        self.address = address  # None accepts any sender on the port
+        self.index = 0
+        self.data_store = data_store or DataStore(name=name)
+        self.packets_received = 0
+        self.invalid_packets = 0
+        self.processing_errors = 0
+        self.bytes_received = 0
+        self.last_sender = None
+
+    def status(self):
+        store = self.data_store
+        clock = store.clock.stats() or {}
+        return {
+            "name": self.name,
+            "port": self.port,
+            "address": self.address,
+            "connected": store.check_connection(),
+            "packets_received": self.packets_received,
+            "invalid_packets": self.invalid_packets,
+            "processing_errors": self.processing_errors,
+            "packets_lost": store.packets_lost,
+            "bytes_received": self.bytes_received,
+            "last_sender": self.last_sender,
+            "last_update_time": store.last_update_time,
+            "latency_ms": clock.get("latency_ms"),
+            "jitter_ms": clock.get("jitter_ms")
+        }
+
+
+class MultiSourceReceiver:
+    """Receive telemetry from several sources on a single thread.
+
+    All sockets are registered with one selector (epoll on Linux), and each
+    datagram is routed to its source's DataStore by local port and sender
+    address.
+    """
+
+    def __init__(self, packet_parser, sources, ip="0.0.0.0", relay=None, bus=None):
+        self.ip = ip
+        self.packet_parser = packet_parser
+        self.relay = relay  # optional TelemetryRelay for secondary displays
+        self.bus = bus  # optional SharedTelemetryBus when running as the ingest process
+        self.sources = {source.name: source for source in sources}
+        for index, source in enumerate(sources):
+            source.index = index
+        self.running = False
+        self.selector = None
+        self.sockets = []
+
+        # port -> {address or None: source}
+        self.routes = {}
+        for source in sources:
+            self.routes.setdefault(source.port, {})[source.address] = source
+
+    def data_stores(self):
+        return {name: source.data_store for name, source in self.sources.items()}
+
+    def source_status(self):
+        return [source.status() for source in self.sources.values()]
+
+    def start_receiving(self):
+        self.running = True
+        self.selector = selectors.DefaultSelector()
+        for port in self.routes:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind((self.ip, port))
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, port)
+            self.sockets.append(sock)
+            print(f"Telemetry receiver listening on {self.ip}:{port}")
+
+        while self.running:
+            try:
+                events = self.selector.select(timeout=0.5)
+            except Exception as e:
+                if self.running:
+                    print(f"Error waiting for telemetry: {e}")
+                continue
+
+            for key, _ in events:
+                self._drain(key.fileobj, key.data)
+
+    def _drain(self, sock, port):
+        # Read everything queued on the socket before going back to select
+        while True:
+            try:
+                data, addr = sock.recvfrom(1024)
+            except BlockingIOError:
+                return
+            except Exception as e:
+                if self.running:
+                    print(f"Error receiving telemetry: {e}")
+                return
+
+            source = self._route(port, addr[0])
+            if source is None:
+                continue
+            source.packets_received += 1
+            source.bytes_received += len(data)
+            source.last_sender = addr
+
+            # One bad packet, or a failing logger or checkpoint, must not
+            # stop the thread every source is received on
+            try:
+                self._handle(source, data)
+            except Exception as e:
+                source.processing_errors += 1
+                print(f"Error processing telemetry from {source.name}: {e}")
+
+    def _handle(self, source, data):
+        telemetry = self.packet_parser.parse_telemetry(data)
+        if not telemetry:
+            source.invalid_packets += 1
+            return
+        source.data_store.update_telemetry(telemetry)
+        if self.bus:
+            self.bus.publish(source.index, source.data_store.last_update_time, telemetry)
+        if self.relay:
+            self.relay.publish(source.name, data)
+
+    def _route(self, port, address):
+        routes = self.routes.get(port, {})
+        return routes.get(address) or routes.get(None)
+
+    def stop_receiving(self):
+        self.running = False
+        for sock in self.sockets:
+            try:
+                self.selector.unregister(sock)
+            except Exception:
+                pass
+            sock.close()
+        self.sockets = []
\ No newline at end of file
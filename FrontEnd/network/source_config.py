@@ -0,0 +1,39 @@
+# network/source_config.py
+import argparse
+
+# Used when no --source is given
+DEFAULT_SOURCES = [("vehicle", 5555, None)]
+
+def parse_source(spec):
+    """Parse a NAME:PORT[:ADDRESS] telemetry source specification"""
+    parts = spec.split(":")
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"Invalid source '{spec}', expected NAME:PORT[:ADDRESS]")
+    address = parts[2] if len(parts) == 3 else None
+    return parts[0], int(parts[1]), address
+
+def parse_multicast(spec):
+    group, port = spec.rsplit(":", 1)
+    return group, int(port)
+
+def add_ingest_arguments(parser):
+    """Add the telemetry source, relay and HTTP options shared by main.py and ingest.py"""
+    parser.add_argument("--source", action="append", type=parse_source, dest="sources",
+                        help="Telemetry source NAME:PORT[:ADDRESS], may be repeated (default vehicle:5555)")
+    parser.add_argument("--relay-port", type=int,
+                        help="Republish validated packets to local TCP subscribers on this port")
+    parser.add_argument("--relay-multicast", type=parse_multicast,
+                        help="Also republish packets to a UDP multicast GROUP:PORT")
+    parser.add_argument("--http-port", type=int,
+                        help="Serve latest values, history and stats as JSON over HTTP on this port")
+    parser.add_argument("--http-address", default="127.0.0.1",
+                        help="Address for the HTTP server (default loopback; 0.0.0.0 for the stand network)")
+    parser.add_argument("--bus", help="Name of the shared-memory telemetry bus")
+    parser.add_argument("--sync-ms", type=float, default=250.0,
+                        help="Flush and fsync recordings this often; a crash loses at most about this much (0 disables)")
+
+def finish_ingest_arguments(args):
+    if not args.sources:
+        args.sources = list(DEFAULT_SOURCES)
+    args.sync_interval = args.sync_ms / 1000.0 if args.sync_ms > 0 else None
+    return args
\ No newline at end of file
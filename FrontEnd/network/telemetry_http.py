@@ -0,0 +1,338 @@
+# network/telemetry_http.py
+import json
+import math
+import time
+import socket
+import selectors
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+from data.history_store import HISTORY_CHANNELS
+
+# Largest request head accepted, and most output queued for a client that isn't reading
+MAX_REQUEST_BYTES = 8192
+MAX_PENDING_BYTES = 4 * 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               431: "Request Header Fields Too Large"}
+
+def encode_json(value):
+    """Compact JSON bytes; NaN and infinities become null."""
+    try:
+        return json.dumps(value, separators=(",", ":"), allow_nan=False).encode()
+    except ValueError:
+        return json.dumps(_finite(value), separators=(",", ":")).encode()
+
+def _finite(value):
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+def thin(times, mins, maxs, means, points):
+    """Merge runs of consecutive points so at most `points` remain."""
+    step = -(-len(times) // points)
+    merged = ([], [], [], [])
+    for i in range(0, len(times), step):
+        merged[0].append(times[i])
+        merged[1].append(min(mins[i:i + step]))
+        merged[2].append(max(maxs[i:i + step]))
+        run = means[i:i + step]
+        merged[3].append(sum(run) / len(run))
+    return merged
+
+
+class _Client:
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.buffer = b""
+        self.pending = b""
+        self.close_after = False
+
+
+class TelemetryHTTPServer:
+    """Read-only JSON view of the data stores for other tools on the network.
+
+    GET endpoints:
+        /                 sources and endpoints
+        /latest           latest sample and derived values [?source=NAME]
+        /history          ?channel=NAME[,NAME...][&source=NAME][&start=S][&end=S][&points=N]
+                          min/max/mean from the tiered history; a negative
+                          start is seconds before the newest sample (default -60)
+        /stats            receiver, relay and server counters
+
+    The server runs its own selector thread with non-blocking sockets, and
+    only reads the stores through their lock-free snapshots and history,
+    so slow or stuck clients never hold up the receiver. Each response body
+    is cached with the sequence numbers of the samples it was built from;
+    any number of clients polling the same URL cost one encode per update.
+    """
+
+    def __init__(self, receiver, ip="127.0.0.1", port=8080, relay=None, history_channels=None,
+                 max_clients=64, cache_size=256):
+        self.receiver = receiver
+        self.ip = ip
+        self.port = port
+        self.relay = relay
+        # Channels kept in history for /history; all of them by default
+        self.history_channels = history_channels or [name for names in HISTORY_CHANNELS.values()
+                                                     for name in names]
+        self.max_clients = max_clients
+        self.cache_size = cache_size
+        self.cache = {}  # URL -> (key, body)
+        self.clients = {}
+        self.routes = {"/": self.index, "/latest": self.latest, "/history": self.history, "/stats": self.stats}
+        self.running = False
+        self.server_socket = None
+        self.selector = None
+        self.requests = 0
+        self.encodes = 0
+        self.cache_hits = 0
+
+    def start(self):
+        """Open the listening socket and start the server thread."""
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.ip, self.port))
+        self.server_socket.listen(16)
+        self.server_socket.setblocking(False)
+        self.port = self.server_socket.getsockname()[1]
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server_socket, selectors.EVENT_READ, "accept")
+
+        for store in self.receiver.data_stores().values():
+            store.subscribe("http", self.history_channels, history=True, rate=0)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"Telemetry HTTP server listening on {self.ip}:{self.port}")
+
+    def stop(self):
+        self.running = False
+        for store in self.receiver.data_stores().values():
+            store.unsubscribe("http")
+
+    # Endpoints: each returns (cache key, function building the response value)
+
+    def stores(self, params):
+        stores = self.receiver.data_stores()
+        names = params.get("source")
+        if not names:
+            return stores
+        unknown = [name for name in names if name not in stores]
+        if unknown:
+            raise ValueError(f"Unknown source: {unknown[0]}")
+        return {name: stores[name] for name in names}
+
+    def index(self, params):
+        names = list(self.receiver.data_stores())
+        return tuple(names), lambda: {"sources": names, "endpoints": sorted(self.routes)}
+
+    def latest(self, params):
+        snapshots = {name: (store.snapshot(), store.derived) for name, store in self.stores(params).items()}
+
+        def build():
+            return {name: {"sequence": sequence, "receive_time": receive_time,
+                           "telemetry": telemetry, "derived": derived}
+                    for name, ((sequence, telemetry, receive_time), derived) in snapshots.items()}
+        return tuple(snapshot[0] for snapshot, _ in snapshots.values()), build
+
+    def history(self, params):
+        stores = self.stores(params)
+        if len(stores) != 1:
+            raise ValueError("source is required when there are several sources")
+        name, store = next(iter(stores.items()))
+        channels = [channel for value in params.get("channel", []) for channel in value.split(",") if channel]
+        if not channels:
+            raise ValueError("channel is required")
+        unknown = [channel for channel in channels if channel not in self.history_channels]
+        if unknown:
+            raise ValueError(f"Channel not in history: {unknown[0]}")
+        try:
+            start = float(params.get("start", ["-60"])[0])
+            end = float(params["end"][0]) if "end" in params else None
+            points = min(max(int(params.get("points", ["500"])[0]), 1), 5000)
+        except ValueError:
+            raise ValueError("start, end and points must be numbers")
+
+        def build():
+            oldest, newest = store.history.time_span()
+            if newest is None:
+                return {"source": name, "start": None, "end": None, "channels": {}}
+            t_end = newest if end is None else end
+            # Not before the oldest data, or the history falls back to an empty coarse tier
+            t_start = max(newest + start if start < 0 else start, oldest)
+            result = {"source": name, "start": t_start, "end": t_end, "channels": {}}
+            for channel in channels:
+                times, mins, maxs, means = store.history.query(channel, t_start, t_end, points)
+                if len(times) > points:
+                    times, mins, maxs, means = thin(times, mins, maxs, means, points)
+                result["channels"][channel] = {"times": times, "min": mins, "max": maxs, "mean": means}
+            return result
+        return store.snapshot()[0], build
+
+    def stats(self, params):
+        sequences = tuple(store.snapshot()[0] for store in self.receiver.data_stores().values())
+
+        def build():
+            return {"sources": self.receiver.source_status(),
+                    "relay": self.relay.stats() if self.relay else None,
+                    "http": {"clients": len(self.clients), "requests": self.requests,
+                             "encodes": self.encodes, "cache_hits": self.cache_hits}}
+        # Connection state and counters also move without new packets
+        return (sequences, int(time.time())), build
+
+    def respond(self, target):
+        """Return (status, body) for a request target, from the cache when it is current."""
+        try:
+            url = urlsplit(target)
+            params = parse_qs(url.query)
+        except ValueError:
+            return 400, encode_json({"error": "Malformed request target"})
+        route = self.routes.get(url.path)
+        if route is None:
+            return 404, encode_json({"error": f"No such endpoint: {url.path}"})
+        try:
+            key, build = route(params)
+        except ValueError as e:
+            return 400, encode_json({"error": str(e)})
+
+        cached = self.cache.get(target)
+        if cached and cached[0] == key:
+            self.cache_hits += 1
+            return 200, cached[1]
+        body = encode_json(build())
+        self.encodes += 1
+        self.cache.pop(target, None)
+        if len(self.cache) >= self.cache_size:
+            # Forget the least recently encoded URL
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[target] = (key, body)
+        return 200, body
+
+    # Connection handling
+
+    def _run(self):
+        while self.running:
+            for key, mask in self.selector.select(timeout=0.5):
+                if key.data == "accept":
+                    self._accept()
+                    continue
+                client = key.data
+                try:
+                    if mask & selectors.EVENT_READ:
+                        self._read(client)
+                    if mask & selectors.EVENT_WRITE and client.sock.fileno() in self.clients:
+                        self._flush(client)
+                except Exception as e:
+                    # One bad request drops its own connection, never the server
+                    print(f"Error serving HTTP client {client.address}: {e}")
+                    self._remove(client)
+        self._close_all()
+
+    def _accept(self):
+        try:
+            sock, address = self.server_socket.accept()
+        except BlockingIOError:
+            return
+        if len(self.clients) >= self.max_clients:
+            sock.close()
+            return
+        sock.setblocking(False)
+        client = _Client(sock, address)
+        self.clients[sock.fileno()] = client
+        self.selector.register(sock, selectors.EVENT_READ, client)
+
+    def _read(self, client):
+        try:
+            data = client.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._remove(client)
+            return
+        client.buffer += data
+
+        # Answer every complete request; pipelined ones are answered in order
+        while not client.close_after:
+            head, separator, rest = client.buffer.partition(b"\r\n\r\n")
+            if not separator:
+                if len(client.buffer) > MAX_REQUEST_BYTES:
+                    self._queue(client, 431, encode_json({"error": "Request too large"}), False, True)
+                break
+            client.buffer = rest
+            self._handle(client, head)
+        self._flush(client)
+
+    def _handle(self, client, head):
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3:
+            self._queue(client, 400, encode_json({"error": "Malformed request"}), False, True)
+            return
+        method, target, version = parts
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        connection = headers.get("connection", "")
+        close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+
+        self.requests += 1
+        if method not in ("GET", "HEAD"):
+            self._queue(client, 405, encode_json({"error": "Read-only: GET and HEAD only"}), False, close)
+            return
+        status, body = self.respond(target)
+        self._queue(client, status, body, method == "HEAD", close)
+
+    def _queue(self, client, status, body, head_only, close):
+        header = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                  "Content-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n"
+                  "Cache-Control: no-cache\r\n"
+                  "Access-Control-Allow-Origin: *\r\n"
+                  f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n").encode()
+        client.pending += header if head_only else header + body
+        client.close_after = client.close_after or close
+
+    def _flush(self, client):
+        # Send what the socket accepts; the rest waits for a write event
+        if client.pending:
+            try:
+                sent = client.sock.send(client.pending)
+                client.pending = client.pending[sent:]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self._remove(client)
+                return
+        if (not client.pending and client.close_after) or len(client.pending) > MAX_PENDING_BYTES:
+            self._remove(client)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.pending else 0)
+        try:
+            self.selector.modify(client.sock, events, client)
+        except (KeyError, ValueError):
+            pass
+
+    def _remove(self, client):
+        self.clients.pop(client.sock.fileno(), None)
+        try:
+            self.selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def _close_all(self):
+        for client in list(self.clients.values()):
+            self._remove(client)
+        self.selector.close()
+        self.server_socket.close()
\ No newline at end of file
@@ -0,0 +1,242 @@
+# network/telemetry_relay.py
+import socket
+import selectors
+import struct
+import threading
+from collections import deque
+
+# Frame sent to TCP subscribers: source name length, payload length, name, payload
+FRAME_HEADER = struct.Struct("<BH")
+
+def encode_frame(source_name, packet):
+    name = source_name.encode()
+    return FRAME_HEADER.pack(len(name), len(packet)) + name + packet
+
+
+class _Subscriber:
+    def __init__(self, sock, address, queue_length):
+        self.sock = sock
+        self.address = address
+        self.queue = deque(maxlen=queue_length)
+        self.pending = b""  # partially sent frame
+        self.dropped = 0
+        self.sent = 0
+
+
+class TelemetryRelay:
+    """Republish validated telemetry packets to local subscribers.
+
+    Subscribers connect over TCP (loopback by default) and each gets a
+    bounded queue. When a slow subscriber's queue is full the oldest
+    frame is dropped for that subscriber only, so publish() never blocks
+    the receiver thread. Packets can also be sent to a UDP multicast group.
+    """
+
+    def __init__(self, ip="127.0.0.1", port=5565, queue_length=1000, multicast_group=None):
+        self.ip = ip
+        self.port = port
+        self.queue_length = queue_length
+        self.multicast_group = multicast_group  # (group, port) or None
+        self.subscribers = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.server_socket = None
+        self.multicast_socket = None
+        self.selector = None
+
+        # Wakes the relay thread when new frames are queued
+        self.wake_receive, self.wake_send = socket.socketpair()
+        self.wake_receive.setblocking(False)
+        self.wake_send.setblocking(False)
+        self.wake_pending = False
+
+    def start(self):
+        """Open the sockets and start the relay thread."""
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.ip, self.port))
+        self.server_socket.listen(16)
+        self.server_socket.setblocking(False)
+        self.port = self.server_socket.getsockname()[1]
+
+        if self.multicast_group:
+            self.multicast_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.multicast_socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+            self.multicast_socket.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server_socket, selectors.EVENT_READ, "accept")
+        self.selector.register(self.wake_receive, selectors.EVENT_READ, "wake")
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"Telemetry relay listening on {self.ip}:{self.port}")
+
+    def stop(self):
+        self.running = False
+        self._wake()
+
+    def publish(self, source_name, packet):
+        """Queue a validated packet for every subscriber. Never blocks."""
+        if self.multicast_socket:
+            try:
+                self.multicast_socket.sendto(encode_frame(source_name, packet), self.multicast_group)
+            except OSError:
+                pass  # multicast is best effort
+
+        if not self.subscribers:
+            return
+        frame = encode_frame(source_name, packet)
+        with self.lock:
+            for subscriber in self.subscribers.values():
+                if len(subscriber.queue) == subscriber.queue.maxlen:
+                    subscriber.dropped += 1
+                subscriber.queue.append(frame)
+            wake = not self.wake_pending
+            self.wake_pending = True
+        if wake:
+            self._wake()
+
+    def stats(self):
+        with self.lock:
+            return [{
+                "address": subscriber.address,
+                "queued": len(subscriber.queue),
+                "sent": subscriber.sent,
+                "dropped": subscriber.dropped
+            } for subscriber in self.subscribers.values()]
+
+    def _wake(self):
+        try:
+            self.wake_send.send(b"\x00")
+        except (BlockingIOError, OSError):
+            pass  # a wakeup is already pending
+
+    def _run(self):
+        while self.running:
+            for key, mask in self.selector.select(timeout=0.5):
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    self._drain_wakeups()
+                elif mask & selectors.EVENT_WRITE:
+                    self._flush(key.data)
+                elif mask & selectors.EVENT_READ:
+                    self._check_closed(key.data)
+
+            # Start watching subscribers that have something to send
+            with self.lock:
+                ready = [s for s in self.subscribers.values() if s.queue or s.pending]
+            for subscriber in ready:
+                self._flush(subscriber)
+
+        self._close_all()
+
+    def _accept(self):
+        try:
+            sock, address = self.server_socket.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        subscriber = _Subscriber(sock, address, self.queue_length)
+        with self.lock:
+            self.subscribers[sock.fileno()] = subscriber
+        self.selector.register(sock, selectors.EVENT_READ, subscriber)
+        print(f"Relay subscriber connected from {address}")
+
+    def _drain_wakeups(self):
+        try:
+            while self.wake_receive.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self.lock:
+            self.wake_pending = False
+
+    def _flush(self, subscriber):
+        # Send as much as the socket accepts; keep the rest for the next write event
+        while True:
+            if not subscriber.pending:
+                with self.lock:
+                    if not subscriber.queue:
+                        break
+                    batch = []
+                    while subscriber.queue and len(batch) < 64:
+                        batch.append(subscriber.queue.popleft())
+                subscriber.pending = b"".join(batch)
+                subscriber.sent += len(batch)
+            try:
+                sent = subscriber.sock.send(subscriber.pending)
+            except BlockingIOError:
+                break
+            except OSError:
+                self._remove(subscriber)
+                return
+            subscriber.pending = subscriber.pending[sent:]
+
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if subscriber.pending else 0)
+        try:
+            self.selector.modify(subscriber.sock, events, subscriber)
+        except (KeyError, ValueError):
+            pass
+
+    def _check_closed(self, subscriber):
+        # Subscribers never send anything, so readable means closed
+        try:
+            data = subscriber.sock.recv(1024)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._remove(subscriber)
+
+    def _remove(self, subscriber):
+        with self.lock:
+            self.subscribers.pop(subscriber.sock.fileno(), None)
+        try:
+            self.selector.unregister(subscriber.sock)
+        except (KeyError, ValueError):
+            pass
+        subscriber.sock.close()
+        print(f"Relay subscriber {subscriber.address} disconnected")
+
+    def _close_all(self):
+        for subscriber in list(self.subscribers.values()):
+            self._remove(subscriber)
+        self.selector.close()
+        self.server_socket.close()
+        if self.multicast_socket:
+            self.multicast_socket.close()
+
+
+class RelaySubscriber:
+    """Client for a TelemetryRelay, e.g. from a second console or a notebook."""
+
+    def __init__(self, ip="127.0.0.1", port=5565):
+        self.sock = socket.create_connection((ip, port))
+        self.buffer = b""
+
+    def packets(self):
+        """Yield (source_name, packet) tuples until the relay closes."""
+        while True:
+            position = 0
+            while len(self.buffer) - position >= FRAME_HEADER.size:
+                name_length, packet_length = FRAME_HEADER.unpack_from(self.buffer, position)
+                start = position + FRAME_HEADER.size
+                end = start + name_length + packet_length
+                if len(self.buffer) < end:
+                    break
+                name = self.buffer[start:start + name_length].decode()
+                yield name, self.buffer[start + name_length:end]
+                position = end
+            self.buffer = self.buffer[position:]
+
+            data = self.sock.recv(65536)
+            if not data:
+                return
+            self.buffer += data
+
+    def close(self):
+        self.sock.close()
\ No newline at end of file
@@ -0,0 +1,75 @@
+# recording_bench.py
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+from data.packet_parser import PacketParser
+from data.data_logger import DataLogger
+from scenario import ScenarioRunner, hot_fire_scenario
+
+# (label, sync_interval seconds, sync_rows)
+MODES = [
+    ("buffered", None, None),
+    ("group 250 ms", 0.25, None),
+    ("group 50 ms", 0.05, None),
+    ("group 10 ms", 0.01, None),
+    ("every 100 rows", None, 100),
+    ("every row", None, 1)
+]
+
+def run_mode(samples, sync_interval, sync_rows, rate):
+    """Log samples through a DataLogger; returns (rows per second, logger).
+
+    With rate=None rows are written as fast as possible; otherwise they
+    are paced at rate Hz, as from a live vehicle.
+    """
+    log_directory = tempfile.mkdtemp(prefix="recording_bench_")
+    try:
+        logger = DataLogger(log_directory=log_directory, compression=None,
+                            sync_interval=sync_interval, sync_rows=sync_rows)
+        logger.start_recording()
+        started = time.perf_counter()
+        for n, telemetry in enumerate(samples):
+            if rate:
+                delay = started + n / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            logger.log_telemetry(telemetry)
+        elapsed = time.perf_counter() - started
+        logger.stop_recording()
+        return len(samples) / elapsed, logger
+    finally:
+        shutil.rmtree(log_directory, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput cost of the recording durability modes")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows logged per mode")
+    parser.add_argument("--rate", type=float, default=None, help="Pace rows at this rate in Hz (default: flat out)")
+    args = parser.parse_args()
+
+    packets = []
+    ScenarioRunner(hot_fire_scenario(args.rows / 100.0), seed=1, rate=100).run(
+        lambda packet, t: packets.append(packet), duration=args.rows / 100.0)
+    packet_parser = PacketParser()
+    samples = [packet_parser.parse_telemetry(packet) for packet in packets]
+
+    baseline = None
+    print(f"{'mode':16} {'rows/s':>10} {'cost':>7} {'syncs':>7} {'max fsync':>10} {'loss bound':>14}")
+    for label, sync_interval, sync_rows in MODES:
+        rows_per_second, logger = run_mode(samples, sync_interval, sync_rows, args.rate)
+        baseline = baseline or rows_per_second
+        bound = logger.loss_bound()
+        if bound is None:
+            bound_text = "unbounded"
+        elif bound["seconds"] is not None:
+            bound_text = f"{bound['seconds'] * 1000:.0f} ms"
+        else:
+            bound_text = f"{bound['rows']} rows"
+        print(f"{label:16} {rows_per_second:10,.0f} {1 - rows_per_second / baseline:7.1%} "
+              f"{logger.syncs:7d} {logger.max_sync_seconds * 1000:8.1f} ms {bound_text:>14}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
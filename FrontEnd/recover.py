@@ -0,0 +1,30 @@
+# recover.py
+import os
+import sys
+import argparse
+
+from data.recovery import recover_session, recover_directory
+
+def main():
+    parser = argparse.ArgumentParser(description="Repair recordings left incomplete by a crash or power loss")
+    parser.add_argument("path", nargs="?", default="logs", help="Log directory or session manifest (default logs)")
+    args = parser.parse_args()
+
+    if args.path.endswith(".manifest.json"):
+        report = recover_session(args.path)
+        reports = [report] if report else []
+    elif os.path.isdir(args.path):
+        reports = recover_directory(args.path)
+    else:
+        print(f"Not a log directory or manifest: {args.path}")
+        return 1
+
+    if not reports:
+        print("Nothing to recover")
+    for report in reports:
+        print(f"{report['session']}: {report['segments']} segments, {report['rows']} rows kept, "
+              f"{report['bytes_dropped']} torn bytes dropped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,28 +1,63 @@
-# run.py
-import sys
-import argparse
-import subprocess
-import time
-
-def main():
-    parser = argparse.ArgumentParser(description="Launch Rocket Monitoring System")
-    parser.add_argument("--simulator", action="store_true", help="Run with simulator")
-    args = parser.parse_args()
-    
-    try:
-        if args.simulator:
-            print("Starting simulator...")
-            sim_process = subprocess.Popen([sys.executable, "simulator.py"])
-            time.sleep(1)  # Give simulator time to start
-        
-        print("Starting main application...")
-        subprocess.call([sys.executable, "main.py"])
-    
-    except KeyboardInterrupt:
-        print("Shutting down...")
-    finally:
-        if args.simulator and 'sim_process' in locals():
-            sim_process.terminate()
-
-if __name__ == "__main__":
+# run.py
+import sys
+import argparse
+import subprocess
+import time
+import os
+
+from data.shared_bus import SharedTelemetryBus
+
+# The ingest process waits up to 30 s for segment compression when it stops
+INGEST_STOP_TIMEOUT = 40
+
+def stop_ingest(process, bus_name):
+    """Stop the ingest process so it closes its recording and shared memory; kill it if it hangs"""
+    if process.poll() is not None:
+        return
+    try:
+        # A stop request over the bus works the same on Windows and Linux
+        bus = SharedTelemetryBus(bus_name)
+        bus.request_stop()
+        bus.close()
+    except (FileNotFoundError, ValueError):
+        process.terminate()  # it never created the bus
+    try:
+        process.wait(timeout=INGEST_STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        print("Ingest process did not stop, killing it")
+        process.kill()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Launch Rocket Monitoring System")
+    parser.add_argument("--simulator", action="store_true", help="Run with simulator")
+    parser.add_argument("--ingest-process", action="store_true",
+                        help="Receive and log telemetry in a separate process, shared with the UI over shared memory")
+    # Anything else (e.g. --source NAME:PORT) is passed through to main.py
+    args, app_args = parser.parse_known_args()
+    
+    try:
+        if args.simulator:
+            print("Starting simulator...")
+            sim_process = subprocess.Popen([sys.executable, "simulator.py"])
+            time.sleep(1)  # Give simulator time to start
+        
+        if args.ingest_process:
+            bus_name = f"seds_telemetry_{os.getpid()}"
+            print("Starting ingest process...")
+            ingest_process = subprocess.Popen([sys.executable, "ingest.py", "--bus", bus_name] + app_args)
+            app_args = app_args + ["--bus", bus_name]
+        
+        print("Starting main application...")
+        subprocess.call([sys.executable, "main.py"] + app_args)
+    
+    except KeyboardInterrupt:
+        print("Shutting down...")
+    finally:
+        if args.simulator and 'sim_process' in locals():
+            sim_process.terminate()
+        if args.ingest_process and 'ingest_process' in locals():
+            stop_ingest(ingest_process, bus_name)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
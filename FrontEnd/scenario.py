@@ -0,0 +1,349 @@
+# scenario.py
+import sys
+import json
+import math
+import time
+import random
+import socket
+import hashlib
+import argparse
+
+from simulator import RocketSimulator
+from data.telemetry_schema import TELEMETRY_SCHEMA
+
+# channel name -> telemetry group, for the float channels profiles and faults act on
+CHANNEL_GROUPS = {name: group for group, names in TELEMETRY_SCHEMA.analog_channels().items() for name in names}
+
+# Valve name -> (command type, device id), as the ground station sends them
+VALVES = {
+    "rvv_o": (0x01, 0x01),
+    "mpv_p": (0x01, 0x02),
+    "rvv_f": (0x01, 0x03),
+    "dot_oxidizer": (0x02, 0x04),
+    "mpf_f": (0x02, 0x05),
+    "oxidizer_engine": (0x02, 0x06)
+}
+
+ABORT_DECAY = 1.0  # seconds, time constant of every profile after an abort
+
+
+# Sensor profiles: offsets added to the simulator's baseline, as a function of
+# seconds into the profile. The final values hold after the profile ends.
+def fill_profile(elapsed, duration):
+    p = min(elapsed / duration, 1.0)
+    return {"lc_3": 300.0 * p, "lc_4": 300.0 * p, "pt_o1_3": 80.0 * p, "pt_o2_2": 80.0 * p}
+
+def pressurize_profile(elapsed, duration):
+    p = min(elapsed / duration, 1.0)
+    return {"pt_o1_3": 250.0 * p, "pt_o2_2": 250.0 * p, "pt_f2_4": 250.0 * p,
+            "pt_f1_5": 250.0 * p, "pt_p1_6": -300.0 * p}
+
+def hot_fire_profile(elapsed, duration):
+    # 0.3 s rise, flat burn, 0.5 s tail-off; propellant drains linearly
+    rise = min(elapsed / 0.3, 1.0)
+    tail = min(max((duration - elapsed) / 0.5, 0.0), 1.0)
+    thrust = rise * tail
+    burned = min(elapsed / duration, 1.0)
+    return {"lc_1": 1500.0 * thrust, "lc_2": 1500.0 * thrust,
+            "pt_f2_4_engine": 400.0 * thrust, "tc_1": 500.0 * thrust + 150.0 * burned,
+            "lc_3": -300.0 * burned, "lc_4": -300.0 * burned,
+            "pt_o1_3": -150.0 * burned, "pt_o2_2": -150.0 * burned,
+            "pt_f2_4": -150.0 * burned, "pt_f1_5": -150.0 * burned}
+
+PROFILES = {
+    "fill": fill_profile,
+    "pressurize": pressurize_profile,
+    "hot_fire": hot_fire_profile
+}
+
+
+def hot_fire_scenario(duration=3600.0, burn=8.0, abort_after=None):
+    """A test day - fill, pressurize, arm, fire, vent - scaled to `duration` seconds.
+
+    With abort_after set, the burn is aborted that many seconds after ignition.
+    """
+    ignition = 0.75 * duration
+    events = [
+        {"t": 0.05 * duration, "action": "profile", "name": "fill", "duration": 0.4 * duration},
+        {"t": 0.55 * duration, "action": "valve", "name": "mpv_p", "value": 1},
+        {"t": 0.55 * duration, "action": "profile", "name": "pressurize", "duration": 0.1 * duration},
+        {"t": 0.7 * duration, "action": "arm", "value": 1},
+        {"t": ignition, "action": "valve", "name": "oxidizer_engine", "value": 255},
+        {"t": ignition, "action": "valve", "name": "mpf_f", "value": 255},
+        {"t": ignition, "action": "profile", "name": "hot_fire", "duration": burn}
+    ]
+    if abort_after is not None:
+        events.append({"t": ignition + abort_after, "action": "abort"})
+    else:
+        shutdown = ignition + burn
+        events += [
+            {"t": shutdown, "action": "valve", "name": "mpf_f", "value": 0},
+            {"t": shutdown, "action": "valve", "name": "oxidizer_engine", "value": 0},
+            {"t": shutdown + 5.0, "action": "valve", "name": "mpv_p", "value": 0},
+            {"t": shutdown + 5.0, "action": "valve", "name": "rvv_o", "value": 1},
+            {"t": shutdown + 5.0, "action": "valve", "name": "rvv_f", "value": 1},
+            {"t": shutdown + 10.0, "action": "arm", "value": 0}
+        ]
+    events.append({"t": duration, "action": "end"})
+    return events
+
+SCENARIOS = {
+    "hot_fire": lambda duration: hot_fire_scenario(duration),
+    "abort": lambda duration: hot_fire_scenario(duration, abort_after=3.0)
+}
+
+
+class ScenarioRunner:
+    """Run a scripted scenario against a virtual clock.
+
+    Events are dicts with a time `t` in seconds and an `action`:
+      valve        name, value            set a solenoid (0/1) or servo (0-255)
+      arm          value                  arm (1) or disarm (0)
+      profile      name, duration         start a sensor profile from PROFILES
+      fault        kind, channel, duration, value
+                                          kind is stuck, offset, noise, zero, spike or error
+      packet_loss  rate, duration         drop that fraction of packets
+      abort        -                      decay all profiles, open vents, close the rest, disarm
+      end          -                      stop the run
+    All randomness comes from the seed, so the same script and seed always
+    produce the same packet stream.
+    """
+
+    def __init__(self, events, seed=0, rate=100.0):
+        self.events = sorted(events, key=lambda event: event["t"])
+        self.seed = seed
+        self.rate = rate
+        self.simulator = RocketSimulator(command_port=None, seed=seed, verbose=False)
+        self.simulator.sensor_hooks.append(self.apply_sensors)
+        self.random = random.Random(f"{seed}-faults")
+
+        self.profiles = []
+        self.faults = []
+        self.loss_rate = 0.0
+        self.loss_until = 0.0
+        self.next_event = 0
+        self.packets_generated = 0
+        self.packets_dropped = 0
+        self.digest = hashlib.sha256()
+
+    def duration(self):
+        ends = [event["t"] for event in self.events if event["action"] == "end"]
+        if ends:
+            return ends[0]
+        return (self.events[-1]["t"] if self.events else 0.0) + 10.0
+
+    def run(self, sink, duration=None, speed=0.0):
+        """Generate every packet up to `duration` seconds and pass each to sink(packet, t).
+
+        speed=0 runs as fast as possible; otherwise virtual time runs at
+        `speed` times real time.
+        """
+        duration = self.duration() if duration is None else duration
+        count = int(duration * self.rate)
+        started = time.perf_counter()
+        for n in range(count):
+            t = n / self.rate
+            self.fire_events(t)
+            packet = self.simulator.generate_telemetry(now=t)
+            self.packets_generated += 1
+
+            if t < self.loss_until and self.random.random() < self.loss_rate:
+                self.packets_dropped += 1
+                continue
+            self.digest.update(packet)
+            sink(packet, t)
+
+            if speed:
+                ahead = t / speed - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return time.perf_counter() - started
+
+    def fire_events(self, t):
+        while self.next_event < len(self.events) and self.events[self.next_event]["t"] <= t:
+            self.apply_event(self.events[self.next_event], t)
+            self.next_event += 1
+
+    def apply_event(self, event, t):
+        action = event["action"]
+        if action == "valve":
+            command_type, device_id = VALVES[event["name"]]
+            self.command(command_type, device_id, int(event["value"]))
+        elif action == "arm":
+            self.command(0x04, 0xFF, int(event["value"]))
+        elif action == "profile":
+            self.profiles.append({"function": PROFILES[event["name"]], "start": event["t"],
+                                  "duration": event["duration"], "aborted": None})
+        elif action == "fault":
+            end = event["t"] + event.get("duration", 1.0 / self.rate)
+            self.faults.append({"kind": event["kind"], "channel": event.get("channel"),
+                                "value": event.get("value"), "end": end})
+        elif action == "packet_loss":
+            self.loss_rate = event["rate"]
+            self.loss_until = event["t"] + event["duration"]
+        elif action == "abort":
+            for profile in self.profiles:
+                if profile["aborted"] is None:
+                    profile["aborted"] = t
+            for name, value in (("mpf_f", 0), ("oxidizer_engine", 0), ("dot_oxidizer", 0),
+                                ("mpv_p", 0), ("rvv_o", 1), ("rvv_f", 1)):
+                self.command(*VALVES[name], value)
+            self.command(0x04, 0xFF, 0)
+        elif action != "end":
+            print(f"Unknown scenario action: {action}")
+
+    def command(self, command_type, device_id, value):
+        # Same state change a ground station command would make
+        with self.simulator.state_lock:
+            self.simulator.apply_command(command_type, device_id, value)
+
+    def apply_sensors(self, telemetry, t):
+        offsets = {}
+        for profile in self.profiles:
+            elapsed = t - profile["start"]
+            if elapsed < 0:
+                continue
+            scale = 1.0
+            if profile["aborted"] is not None:
+                elapsed = min(elapsed, profile["aborted"] - profile["start"])
+                scale = math.exp(-(t - profile["aborted"]) / ABORT_DECAY)
+            for channel, value in profile["function"](elapsed, profile["duration"]).items():
+                offsets[channel] = offsets.get(channel, 0.0) + value * scale
+        for channel, value in offsets.items():
+            telemetry[CHANNEL_GROUPS[channel]][channel] += value
+
+        if not self.faults:
+            return
+        self.faults = [fault for fault in self.faults if t < fault["end"]]
+        for fault in self.faults:
+            kind = fault["kind"]
+            if kind == "error":
+                telemetry["system_status"]["error"] = True
+                continue
+            values = telemetry[CHANNEL_GROUPS[fault["channel"]]]
+            channel = fault["channel"]
+            if kind == "stuck":
+                # Hold the reading from when the fault started, unless a value is given
+                if fault["value"] is None:
+                    fault["value"] = values[channel]
+                values[channel] = fault["value"]
+            elif kind == "offset" or kind == "spike":
+                values[channel] += fault["value"]
+            elif kind == "noise":
+                values[channel] += self.random.gauss(0.0, fault["value"])
+            elif kind == "zero":
+                values[channel] = 0.0
+
+
+class UDPSink:
+    """Send packets to a ground station as the real vehicle would."""
+
+    def __init__(self, ip="127.0.0.1", port=5555):
+        self.address = (ip, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, packet, t):
+        self.sock.sendto(packet, self.address)
+
+    def close(self):
+        self.sock.close()
+
+
+class FileSink:
+    """Write raw packets back to back; read them with read_packets()."""
+
+    def __init__(self, path):
+        self.file = open(path, "wb", buffering=1024 * 1024)
+
+    def __call__(self, packet, t):
+        self.file.write(packet)
+
+    def close(self):
+        self.file.close()
+
+
+class GroundStationSink:
+    """Feed packets straight into a PacketParser and DataStore, in process."""
+
+    def __init__(self, data_store):
+        from data.packet_parser import PacketParser
+        self.parser = PacketParser()
+        self.data_store = data_store
+        self.invalid_packets = 0
+
+    def __call__(self, packet, t):
+        telemetry = self.parser.parse_telemetry(packet)
+        if telemetry:
+            self.data_store.update_telemetry(telemetry)
+        else:
+            self.invalid_packets += 1
+
+    def close(self):
+        pass
+
+
+def read_packets(path):
+    """Yield the packets written by a FileSink."""
+    with open(path, "rb") as f:
+        while True:
+            packet = f.read(TELEMETRY_SCHEMA.size)
+            if len(packet) < TELEMETRY_SCHEMA.size:
+                return
+            yield packet
+
+def load_scenario(name_or_path, duration=3600.0):
+    if name_or_path in SCENARIOS:
+        return SCENARIOS[name_or_path](duration)
+    with open(name_or_path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a scripted, reproducible telemetry scenario")
+    parser.add_argument("scenario", help=f"Built-in scenario ({', '.join(SCENARIOS)}) or a JSON event list")
+    parser.add_argument("--duration", type=float, default=3600.0, help="Length of a built-in scenario, seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=100.0, help="Telemetry rate in Hz")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Virtual seconds per real second; 0 runs as fast as possible")
+    parser.add_argument("--out", help="Write raw packets to this file")
+    parser.add_argument("--udp", metavar="HOST:PORT", help="Send packets to a ground station")
+    parser.add_argument("--ingest", action="store_true", help="Feed an in-process DataStore")
+    parser.add_argument("--record", action="store_true", help="With --ingest, record the run with DataLogger")
+    args = parser.parse_args()
+
+    runner = ScenarioRunner(load_scenario(args.scenario, args.duration), seed=args.seed, rate=args.rate)
+    data_store = None
+    if args.out:
+        sink = FileSink(args.out)
+    elif args.udp:
+        host, port = args.udp.rsplit(":", 1)
+        sink = UDPSink(host, int(port))
+    elif args.ingest:
+        from data.data_store import DataStore
+        data_store = DataStore(name="scenario")
+        if args.record:
+            data_store.start_recording()
+        sink = GroundStationSink(data_store)
+    else:
+        sink = lambda packet, t: None
+
+    try:
+        seconds = runner.run(sink, speed=args.speed)
+    finally:
+        sink_close = getattr(sink, "close", None)
+        if sink_close:
+            sink_close()
+        if data_store and args.record:
+            data_store.stop_recording()
+            data_store.data_logger.wait_for_compression()
+
+    virtual = runner.packets_generated / args.rate
+    print(f"{runner.packets_generated} packets ({virtual:.0f} s of telemetry) in {seconds:.2f} s, "
+          f"{virtual / seconds:.0f}x real time")
+    print(f"  dropped by script: {runner.packets_dropped}, stream sha256: {runner.digest.hexdigest()[:16]}")
+    if data_store:
+        print(f"  ground station saw {data_store.packets_lost} lost packets")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
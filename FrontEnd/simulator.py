@@ -1,296 +1,483 @@
-# simulator.py
-import socket
-import struct
-import time
-import math
-import random
-
-class RocketSimulator:
-    def __init__(self, ground_station_ip="127.0.0.1", telemetry_port=5555, command_port=5556):
-        self.ground_station_ip = ground_station_ip
-        self.telemetry_port = telemetry_port
-        self.command_port = command_port
-        
-        # Create UDP socket for telemetry
-        self.telemetry_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        
-        # Create TCP socket for commands
-        self.command_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.command_socket.bind(("0.0.0.0", command_port))
-        self.command_socket.listen(5)
-        
-        # Initial system state
-        self.system_state = {
-            "timestamp": 0,
-            "packet_counter": 0,
-            "armed": False,
-            "recording": False,
-            "error": False,
-            "solenoids": {
-                "rvv_o": False,
-                "mpv_p": False,
-                "rvv_f": False
-            },
-            "servos": {
-                "dot_oxidizer": 0,
-                "mpf_f": 0,
-                "oxidizer_engine": 0
-            },
-            "actuators": {
-                "in_1": 0,
-                "ac_1": 0,
-                "ac_2": 0
-            }
-        }
-        
-        # Start command listener thread
-        import threading
-        self.running = True
-        self.command_thread = threading.Thread(target=self.listen_for_commands)
-        self.command_thread.daemon = True
-        self.command_thread.start()
-    
-    def listen_for_commands(self):
-        while self.running:
-            try:
-                client_socket, address = self.command_socket.accept()
-                print(f"Command connection from {address}")
-                
-                # Receive command
-                command_data = client_socket.recv(16)
-                if len(command_data) == 16:
-                    self.process_command(command_data, client_socket)
-                
-                client_socket.close()
-            except Exception as e:
-                print(f"Command error: {e}")
-    
-    def process_command(self, command_data, client_socket):
-        # Parse command
-        timestamp, command_id, command_type, device_id, command_value, verification_code, checksum = struct.unpack("<IHHBBHI", command_data)
-        
-        print(f"Received command: ID={command_id}, Type={command_type}, Device={device_id}, Value={command_value}")
-        
-        # Process based on command type
-        status_code = 0x00  # Success by default
-        
-        if command_type == 0x01:  # Solenoid valve
-            if device_id == 0x01:  # RVV-O
-                self.system_state["solenoids"]["rvv_o"] = bool(command_value)
-            elif device_id == 0x02:  # MPV-P
-                self.system_state["solenoids"]["mpv_p"] = bool(command_value)
-            elif device_id == 0x03:  # RVV-F
-                self.system_state["solenoids"]["rvv_f"] = bool(command_value)
-            else:
-                status_code = 0x03  # Invalid command
-        
-        elif command_type == 0x02:  # Servo valve
-            if device_id == 0x04:  # DOT-Oxidizer
-                self.system_state["servos"]["dot_oxidizer"] = command_value
-            elif device_id == 0x05:  # MPF-F
-                self.system_state["servos"]["mpf_f"] = command_value
-            elif device_id == 0x06:  # Oxidizer-Engine
-                self.system_state["servos"]["oxidizer_engine"] = command_value
-            else:
-                status_code = 0x03  # Invalid command
-        
-        elif command_type == 0x03:  # Actuator position
-            if device_id == 0x07:  # IN-1
-                self.system_state["actuators"]["in_1"] = command_value
-            elif device_id == 0x08:  # AC-1
-                self.system_state["actuators"]["ac_1"] = command_value
-            elif device_id == 0x09:  # AC-2
-                self.system_state["actuators"]["ac_2"] = command_value
-            else:
-                status_code = 0x03  # Invalid command
-        
-        elif command_type == 0x04:  # System control
-            if device_id == 0xFF:  # System-wide
-                self.system_state["armed"] = bool(command_value)
-            else:
-                status_code = 0x03  # Invalid command
-        
-        elif command_type == 0x05:  # Start sequence
-            print("START SEQUENCE RECEIVED")
-            # Would trigger sequence in real system
-        
-        elif command_type == 0x06:  # Abort sequence
-            print("ABORT SEQUENCE RECEIVED")
-            # Would abort sequence in real system
-        
-        else:
-            status_code = 0x03  # Invalid command
-        
-        # Send acknowledgment
-        ack_timestamp = int(time.time() * 1000)
-        ack_data = struct.pack("<IHHI", ack_timestamp, command_id, status_code, 0)
-        client_socket.sendall(ack_data)
-
-    def generate_telemetry(self):
-         # Use a relative timestamp instead of absolute milliseconds since epoch
-        time_ms = int((time.time() % 3600) * 1000)  # Milliseconds within the last hour
-        self.system_state["timestamp"] = time_ms
-        self.system_state["packet_counter"] = (self.system_state["packet_counter"] + 1) % 65536
-
-        # Get time in seconds for wave generation
-        t = time.time()
-        
-        # Base pressures with oscillating components
-        base_o1_3 = 450.0 + 40.0 * math.sin(t * 0.5)  # Slow wave
-        base_o2_2 = 445.0 + 30.0 * math.sin(t * 0.7)  # Different frequency
-        base_p1_6 = 950.0 + 50.0 * math.sin(t * 0.3)  # Very slow wave
-        base_f2_4 = 420.0 + 35.0 * math.sin(t * 0.6)
-        base_f1_5 = 425.0 + 25.0 * math.sin(t * 0.9)  # Faster wave
-        base_engine = 300.0 + 60.0 * math.sin(t * 1.1)  # Fastest wave
-        
-        # Add noise and variations based on valve states
-        noise_factor = 5.0
-        
-        # Adjust pressures based on valve states
-        if self.system_state["solenoids"]["mpv_p"]:
-            # When pressurant valve is open, pressure increases in tanks
-            base_o1_3 += 50.0
-            base_o2_2 += 50.0
-            base_f2_4 += 50.0
-            base_f1_5 += 50.0
-            base_p1_6 -= 20.0  # Pressurant tank pressure decreases
-        
-        if self.system_state["servos"]["mpf_f"] > 0:
-            # When fuel valve is open, pressure in engine increases
-            valve_factor = self.system_state["servos"]["mpf_f"] / 255.0
-            base_engine += 100.0 * valve_factor
-            base_f2_4 -= 20.0 * valve_factor
-            base_f1_5 -= 20.0 * valve_factor
-        
-        if self.system_state["solenoids"]["rvv_o"]:
-            # When oxidizer vent is open, pressure decreases
-            base_o1_3 -= 30.0
-            base_o2_2 -= 30.0
-        
-        if self.system_state["solenoids"]["rvv_f"]:
-            # When fuel vent is open, pressure decreases
-            base_f2_4 -= 30.0
-            base_f1_5 -= 30.0
-        
-        # Add some noise
-        pt_o1_3 = base_o1_3 + random.uniform(-noise_factor, noise_factor)
-        pt_o2_2 = base_o2_2 + random.uniform(-noise_factor, noise_factor)
-        pt_p1_6 = base_p1_6 + random.uniform(-noise_factor, noise_factor)
-        pt_f2_4 = base_f2_4 + random.uniform(-noise_factor, noise_factor)
-        pt_f1_5 = base_f1_5 + random.uniform(-noise_factor, noise_factor)
-        pt_f2_4_engine = base_engine + random.uniform(-noise_factor, noise_factor)
-        
-        # Load cells
-        lc_1 = 2900.0 + random.uniform(-20, 20)
-        lc_2 = 2950.0 + random.uniform(-20, 20)
-        if self.system_state["servos"]["mpf_f"] > 0:
-            # Thrust increases when fuel valve is open
-            thrust_factor = self.system_state["servos"]["mpf_f"] / 255.0
-            lc_1 += 500.0 * thrust_factor
-            lc_2 += 500.0 * thrust_factor
-        
-        lc_3 = 950.0 + random.uniform(-10, 10)
-        lc_4 = 900.0 + random.uniform(-10, 10)
-        
-        # Temperature
-        tc_1 = 30.0  # Base temperature
-        if self.system_state["servos"]["mpf_f"] > 0:
-            # Engine heats up when fuel valve is open
-            tc_1 += 200.0 * (self.system_state["servos"]["mpf_f"] / 255.0)
-        
-        # Create binary packet
-        solenoid_states = 0
-        if self.system_state["solenoids"]["rvv_o"]:
-            solenoid_states |= 0x01
-        if self.system_state["solenoids"]["mpv_p"]:
-            solenoid_states |= 0x02
-        if self.system_state["solenoids"]["rvv_f"]:
-            solenoid_states |= 0x04
-        
-        system_status = 0
-        if self.system_state["armed"]:
-            system_status |= 0x01
-        if self.system_state["recording"]:
-            system_status |= 0x02
-        if self.system_state["error"]:
-            system_status |= 0x04
-        
-        try:
-            # Format string: "<IH6f4f1fB3B3BBI"
-            packet = struct.pack("<IH",
-                              self.system_state["timestamp"],
-                              self.system_state["packet_counter"])
-            
-            # Add pressure values
-            packet += struct.pack("<6f", pt_o1_3, pt_o2_2, pt_p1_6, pt_f2_4, pt_f1_5, pt_f2_4_engine)
-            
-            # Add load cell values
-            packet += struct.pack("<4f", lc_1, lc_2, lc_3, lc_4)
-            
-            # Add temperature
-            packet += struct.pack("<f", tc_1)
-            
-            # Add solenoid states
-            packet += struct.pack("<B", solenoid_states)
-            
-            # Add servo positions
-            packet += struct.pack("<3B", 
-                              self.system_state["servos"]["dot_oxidizer"],
-                              self.system_state["servos"]["mpf_f"],
-                              self.system_state["servos"]["oxidizer_engine"])
-            
-            # Add actuator positions
-            packet += struct.pack("<3B",
-                              self.system_state["actuators"]["in_1"],
-                              self.system_state["actuators"]["ac_1"],
-                              self.system_state["actuators"]["ac_2"])
-            
-            # Add system status
-            packet += struct.pack("<B", system_status)
-            
-             # Calculate proper checksum - simple sum of all bytes
-            checksum = sum(packet) & 0xFFFFFFFF
-    
-            # Add the checksum
-            packet += struct.pack("<I", checksum)
-    
-            return packet
-            
-        except Exception as e:
-            print(f"ERROR DURING PACKET GENERATION: {e}")
-            import traceback
-            traceback.print_exc()
-            # Return a dummy packet to avoid crashing
-            return b'\x00' * 62  # Return empty packet with correct size
-    
-    
-    def start_telemetry(self, frequency=10):
-        """Start sending telemetry at the specified frequency (Hz)"""
-        interval = 1.0 / frequency
-        
-        while self.running:
-            try:
-                # Generate and send telemetry packet
-                packet = self.generate_telemetry()
-                self.telemetry_socket.sendto(packet, (self.ground_station_ip, self.telemetry_port))
-                
-                # Wait for next interval
-                time.sleep(interval)
-            except Exception as e:
-                print(f"Error sending telemetry: {e}")
-    
-    def stop(self):
-        self.running = False
-
-if __name__ == "__main__":
-    # Create simulator
-    simulator = RocketSimulator()
-    
-    try:
-        print("Starting rocket simulator...")
-        print("Press Ctrl+C to stop")
-        simulator.start_telemetry()
-    except KeyboardInterrupt:
-        print("Stopping simulator...")
-    finally:
+# simulator.py
+import socket
+import struct
+import time
+import math
+import random
+import argparse
+import threading
+
+from data.telemetry_schema import TELEMETRY_SCHEMA, Bitfield
+from data.log_reader import iter_rows
+
+COMMAND_SIZE = 16
+
+class RocketSimulator:
+    def __init__(self, ground_station_ip="127.0.0.1", telemetry_port=5555, command_port=5556,
+                 command_latency=0.0, command_jitter=0.0, failure_rate=0.0, drop_rate=0.0,
+                 seed=None, verbose=True):
+        self.ground_station_ip = ground_station_ip
+        self.telemetry_port = telemetry_port
+        self.command_port = command_port
+        self.verbose = verbose
+        
+        # Artificial command path conditions, for benchmarking the ground station
+        self.command_latency = command_latency  # seconds before each ack
+        self.command_jitter = command_jitter    # +/- seconds, uniform
+        self.failure_rate = failure_rate        # fraction acked as "Device not responding"
+        self.drop_rate = drop_rate              # fraction never acked
+        self.command_random = random.Random(seed)
+        self.commands_processed = 0
+        
+        # Sensor noise; seeding it makes the telemetry reproducible
+        self.random = random.Random(seed)
+        # Callables hook(telemetry, t) that adjust each packet before encoding (see scenario.py)
+        self.sensor_hooks = []
+        
+        # Create UDP socket for telemetry
+        self.telemetry_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        # Create TCP socket for commands; command_port=None runs without a command server
+        self.command_socket = None
+        if command_port is not None:
+            self.command_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.command_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.command_socket.bind(("0.0.0.0", command_port))
+            self.command_socket.listen(128)
+            self.command_socket.settimeout(0.5)  # so the listener notices stop()
+        
+        # Command handlers and the telemetry thread share the system state
+        self.state_lock = threading.Lock()
+        
+        # Initial system state
+        self.system_state = {
+            "timestamp": 0,
+            "packet_counter": 0,
+            "armed": False,
+            "recording": False,
+            "error": False,
+            "solenoids": {
+                "rvv_o": False,
+                "mpv_p": False,
+                "rvv_f": False
+            },
+            "servos": {
+                "dot_oxidizer": 0,
+                "mpf_f": 0,
+                "oxidizer_engine": 0
+            },
+            "actuators": {
+                "in_1": 0,
+                "ac_1": 0,
+                "ac_2": 0
+            }
+        }
+        
+        # Start command listener thread
+        self.running = True
+        if self.command_socket:
+            self.command_thread = threading.Thread(target=self.listen_for_commands)
+            self.command_thread.daemon = True
+            self.command_thread.start()
+    
+    def listen_for_commands(self):
+        # One handler thread per connection, so slow or idle clients don't hold up others
+        while self.running:
+            try:
+                client_socket, address = self.command_socket.accept()
+            except socket.timeout:
+                continue
+            except Exception as e:
+                if self.running:
+                    print(f"Command error: {e}")
+                continue
+            
+            if self.verbose:
+                print(f"Command connection from {address}")
+            client_socket.settimeout(None)
+            threading.Thread(target=self.handle_client, args=(client_socket,), daemon=True).start()
+    
+    def handle_client(self, client_socket):
+        # A connection may carry any number of commands, back to back
+        buffer = b""
+        try:
+            while self.running:
+                data = client_socket.recv(4096)
+                if not data:
+                    break
+                buffer += data
+                while len(buffer) >= COMMAND_SIZE:
+                    command_data, buffer = buffer[:COMMAND_SIZE], buffer[COMMAND_SIZE:]
+                    self.process_command(command_data, client_socket)
+        except Exception as e:
+            print(f"Command error: {e}")
+        finally:
+            client_socket.close()
+    
+    def process_command(self, command_data, client_socket):
+        # Parse command
+        timestamp, command_id, command_type, device_id, command_value, verification_code, checksum = struct.unpack("<IHHBBHI", command_data)
+        
+        if self.verbose:
+            print(f"Received command: ID={command_id}, Type={command_type}, Device={device_id}, Value={command_value}")
+        
+        with self.state_lock:
+            status_code = self.apply_command(command_type, device_id, command_value)
+            self.commands_processed += 1
+        
+        # Simulated link and device behaviour
+        delay = self.command_latency + self.command_random.uniform(-self.command_jitter, self.command_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if self.drop_rate and self.command_random.random() < self.drop_rate:
+            return
+        if self.failure_rate and self.command_random.random() < self.failure_rate:
+            status_code = 0x04  # Device not responding
+        
+        # Send acknowledgment
+        ack_timestamp = int(time.time() * 1000) & 0xFFFFFFFF
+        ack_data = struct.pack("<IHH", ack_timestamp, command_id, status_code)
+        ack_data += struct.pack("<I", sum(ack_data) & 0xFFFFFFFF)
+        client_socket.sendall(ack_data)
+    
+    def apply_command(self, command_type, device_id, command_value):
+        """Update the system state; returns the ack status code. Call with state_lock held."""
+        # Process based on command type
+        status_code = 0x00  # Success by default
+        
+        if command_type == 0x01:  # Solenoid valve
+            if device_id == 0x01:  # RVV-O
+                self.system_state["solenoids"]["rvv_o"] = bool(command_value)
+            elif device_id == 0x02:  # MPV-P
+                self.system_state["solenoids"]["mpv_p"] = bool(command_value)
+            elif device_id == 0x03:  # RVV-F
+                self.system_state["solenoids"]["rvv_f"] = bool(command_value)
+            else:
+                status_code = 0x03  # Invalid command
+        
+        elif command_type == 0x02:  # Servo valve
+            if device_id == 0x04:  # DOT-Oxidizer
+                self.system_state["servos"]["dot_oxidizer"] = command_value
+            elif device_id == 0x05:  # MPF-F
+                self.system_state["servos"]["mpf_f"] = command_value
+            elif device_id == 0x06:  # Oxidizer-Engine
+                self.system_state["servos"]["oxidizer_engine"] = command_value
+            else:
+                status_code = 0x03  # Invalid command
+        
+        elif command_type == 0x03:  # Actuator position
+            if device_id == 0x07:  # IN-1
+                self.system_state["actuators"]["in_1"] = command_value
+            elif device_id == 0x08:  # AC-1
+                self.system_state["actuators"]["ac_1"] = command_value
+            elif device_id == 0x09:  # AC-2
+                self.system_state["actuators"]["ac_2"] = command_value
+            else:
+                status_code = 0x03  # Invalid command
+        
+        elif command_type == 0x04:  # System control
+            if device_id == 0xFF:  # System-wide
+                self.system_state["armed"] = bool(command_value)
+            else:
+                status_code = 0x03  # Invalid command
+        
+        elif command_type == 0x05:  # Start sequence
+            print("START SEQUENCE RECEIVED")
+            # Would trigger sequence in real system
+        
+        elif command_type == 0x06:  # Abort sequence
+            print("ABORT SEQUENCE RECEIVED")
+            # Would abort sequence in real system
+        
+        else:
+            status_code = 0x03  # Invalid command
+        
+        return status_code
+
+    def generate_telemetry(self, now=None):
+        """Build one encoded packet.
+        
+        now is a virtual clock in seconds; when given it also drives the
+        device timestamp, so output depends only on it and the seed.
+        """
+        if now is None:
+            # Use a relative timestamp instead of absolute milliseconds since epoch
+            t = time.time()
+            time_ms = int((t % 3600) * 1000)  # Milliseconds within the last hour
+        else:
+            t = now
+            time_ms = int(now * 1000) & 0xFFFFFFFF
+        
+        # Take a consistent copy of the state; command handlers change it concurrently
+        with self.state_lock:
+            self.system_state["timestamp"] = time_ms
+            self.system_state["packet_counter"] = (self.system_state["packet_counter"] + 1) % 65536
+            state = {
+                "timestamp": self.system_state["timestamp"],
+                "packet_counter": self.system_state["packet_counter"],
+                "armed": self.system_state["armed"],
+                "recording": self.system_state["recording"],
+                "error": self.system_state["error"],
+                "solenoids": dict(self.system_state["solenoids"]),
+                "servos": dict(self.system_state["servos"]),
+                "actuators": dict(self.system_state["actuators"])
+            }
+
+        # Base pressures with oscillating components
+        base_o1_3 = 450.0 + 40.0 * math.sin(t * 0.5)  # Slow wave
+        base_o2_2 = 445.0 + 30.0 * math.sin(t * 0.7)  # Different frequency
+        base_p1_6 = 950.0 + 50.0 * math.sin(t * 0.3)  # Very slow wave
+        base_f2_4 = 420.0 + 35.0 * math.sin(t * 0.6)
+        base_f1_5 = 425.0 + 25.0 * math.sin(t * 0.9)  # Faster wave
+        base_engine = 300.0 + 60.0 * math.sin(t * 1.1)  # Fastest wave
+        
+        # Add noise and variations based on valve states
+        noise_factor = 5.0
+        
+        # Adjust pressures based on valve states
+        if state["solenoids"]["mpv_p"]:
+            # When pressurant valve is open, pressure increases in tanks
+            base_o1_3 += 50.0
+            base_o2_2 += 50.0
+            base_f2_4 += 50.0
+            base_f1_5 += 50.0
+            base_p1_6 -= 20.0  # Pressurant tank pressure decreases
+        
+        if state["servos"]["mpf_f"] > 0:
+            # When fuel valve is open, pressure in engine increases
+            valve_factor = state["servos"]["mpf_f"] / 255.0
+            base_engine += 100.0 * valve_factor
+            base_f2_4 -= 20.0 * valve_factor
+            base_f1_5 -= 20.0 * valve_factor
+        
+        if state["solenoids"]["rvv_o"]:
+            # When oxidizer vent is open, pressure decreases
+            base_o1_3 -= 30.0
+            base_o2_2 -= 30.0
+        
+        if state["solenoids"]["rvv_f"]:
+            # When fuel vent is open, pressure decreases
+            base_f2_4 -= 30.0
+            base_f1_5 -= 30.0
+        
+        # Add some noise
+        pt_o1_3 = base_o1_3 + self.random.uniform(-noise_factor, noise_factor)
+        pt_o2_2 = base_o2_2 + self.random.uniform(-noise_factor, noise_factor)
+        pt_p1_6 = base_p1_6 + self.random.uniform(-noise_factor, noise_factor)
+        pt_f2_4 = base_f2_4 + self.random.uniform(-noise_factor, noise_factor)
+        pt_f1_5 = base_f1_5 + self.random.uniform(-noise_factor, noise_factor)
+        pt_f2_4_engine = base_engine + self.random.uniform(-noise_factor, noise_factor)
+        
+        # Load cells
+        lc_1 = 2900.0 + self.random.uniform(-20, 20)
+        lc_2 = 2950.0 + self.random.uniform(-20, 20)
+        if state["servos"]["mpf_f"] > 0:
+            # Thrust increases when fuel valve is open
+            thrust_factor = state["servos"]["mpf_f"] / 255.0
+            lc_1 += 500.0 * thrust_factor
+            lc_2 += 500.0 * thrust_factor
+        
+        lc_3 = 950.0 + self.random.uniform(-10, 10)
+        lc_4 = 900.0 + self.random.uniform(-10, 10)
+        
+        # Temperature
+        tc_1 = 30.0  # Base temperature
+        if state["servos"]["mpf_f"] > 0:
+            # Engine heats up when fuel valve is open
+            tc_1 += 200.0 * (state["servos"]["mpf_f"] / 255.0)
+        
+        # Create binary packet - layout comes from the telemetry schema
+        telemetry = {
+            "timestamp": state["timestamp"],
+            "packet_counter": state["packet_counter"],
+            "pressure": {
+                "pt_o1_3": pt_o1_3, "pt_o2_2": pt_o2_2, "pt_p1_6": pt_p1_6,
+                "pt_f2_4": pt_f2_4, "pt_f1_5": pt_f1_5, "pt_f2_4_engine": pt_f2_4_engine
+            },
+            "load_cells": {"lc_1": lc_1, "lc_2": lc_2, "lc_3": lc_3, "lc_4": lc_4},
+            "temperature": {"tc_1": tc_1},
+            "solenoid_states": state["solenoids"],
+            "servo_positions": state["servos"],
+            "actuator_positions": state["actuators"],
+            "system_status": {
+                "armed": state["armed"],
+                "recording": state["recording"],
+                "error": state["error"]
+            }
+        }
+        
+        for hook in self.sensor_hooks:
+            hook(telemetry, t)
+        
+        try:
+            # Packs every field and the additive checksum in one pass
+            return TELEMETRY_SCHEMA.encode(telemetry)
+            
+        except Exception as e:
+            print(f"ERROR DURING PACKET GENERATION: {e}")
+            import traceback
+            traceback.print_exc()
+            # Return a dummy packet to avoid crashing
+            return b'\x00' * TELEMETRY_SCHEMA.size  # Return empty packet with correct size
+    
+    
+    def start_telemetry(self, frequency=10):
+        """Start sending telemetry at the specified frequency (Hz)"""
+        interval = 1.0 / frequency
+        
+        while self.running:
+            try:
+                # Generate and send telemetry packet
+                packet = self.generate_telemetry()
+                self.telemetry_socket.sendto(packet, (self.ground_station_ip, self.telemetry_port))
+                
+                # Wait for next interval
+                time.sleep(interval)
+            except Exception as e:
+                print(f"Error sending telemetry: {e}")
+    
+    def stop(self):
+        self.running = False
+
+
+class LogReplay:
+    """Replay a DataLogger recording as live telemetry datagrams.
+    
+    Rows are streamed from the recording and encoded a batch at a time
+    into one buffer, so memory stays constant however long the log is.
+    Packets go out at the recorded elapsed times divided by `speed`
+    (0 sends as fast as possible). Fields the logger doesn't record
+    (packet counter, actuators, the recording flag) are regenerated or
+    zero, and every packet gets a valid checksum.
+    """
+    
+    def __init__(self, path, ground_station_ip="127.0.0.1", telemetry_port=5555, speed=1.0, batch_size=256):
+        self.path = path
+        self.address = (ground_station_ip, telemetry_port)
+        self.speed = speed
+        self.batch_size = batch_size
+        self.telemetry_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.buffer = bytearray(TELEMETRY_SCHEMA.size * batch_size)
+        self.plans = {}
+        self.packets_sent = 0
+        self.running = True
+    
+    def build_plan(self, header):
+        """Return (elapsed_time column, [where each packet field's value comes from]) for this header."""
+        columns = {name: index for index, name in enumerate(header)}
+        plan = []
+        for item in TELEMETRY_SCHEMA.layout:
+            if isinstance(item, Bitfield):
+                plan.append(("bits", [(columns[name], mask) for name, mask in item.bits if name in columns]))
+            elif item.name == "timestamp":
+                # Device clock in ms wrapped to 32 bits; older logs only have the ground write time
+                plan.append(("timestamp", columns.get("device_ms", columns["timestamp"])))
+            elif item.name == "packet_counter":
+                plan.append(("counter", None))
+            elif item.name in columns:
+                plan.append(("float" if item.code == "f" else "int", columns[item.name]))
+            else:
+                plan.append(("zero", None))
+        return columns["elapsed_time"], plan
+    
+    def encode_batch(self, plan, rows):
+        """Encode rows into self.buffer; returns the elapsed time of each packet."""
+        size = TELEMETRY_SCHEMA.size
+        pack_into = TELEMETRY_SCHEMA.packet.pack_into
+        elapsed, fields = plan
+        times = []
+        for n, row in enumerate(rows):
+            values = []
+            for kind, source in fields:
+                if kind == "float":
+                    values.append(float(row[source]))
+                elif kind == "int":
+                    values.append(int(float(row[source])))
+                elif kind == "bits":
+                    values.append(sum(mask for index, mask in source if row[index] not in ("0", "")))
+                elif kind == "timestamp":
+                    values.append(int(float(row[source])) & 0xFFFFFFFF)
+                elif kind == "counter":
+                    values.append((self.packets_sent + n + 1) % 65536)
+                else:
+                    values.append(0)
+            offset = n * size
+            pack_into(self.buffer, offset, *values, 0)
+            checksum = TELEMETRY_SCHEMA.calculate_checksum(memoryview(self.buffer)[offset:offset + TELEMETRY_SCHEMA.checksum_offset])
+            TELEMETRY_SCHEMA.checksum.pack_into(self.buffer, offset + TELEMETRY_SCHEMA.checksum_offset, checksum)
+            times.append(float(row[elapsed]))
+        return times
+    
+    def send_batch(self, times, started):
+        size = TELEMETRY_SCHEMA.size
+        view = memoryview(self.buffer)
+        for n, elapsed in enumerate(times):
+            if self.speed:
+                wait = elapsed / self.speed - (time.perf_counter() - started)
+                if wait > 0:
+                    time.sleep(wait)
+            self.telemetry_socket.sendto(view[n * size:(n + 1) * size], self.address)
+        self.packets_sent += len(times)
+    
+    def run(self):
+        started = time.perf_counter()
+        batch = []
+        plan = None
+        for header, row in iter_rows(self.path):
+            if not self.running:
+                break
+            key = tuple(header)
+            if key not in self.plans:
+                self.plans[key] = self.build_plan(header)
+            if self.plans[key] is not plan and batch:
+                self.send_batch(self.encode_batch(plan, batch), started)
+                batch = []
+            plan = self.plans[key]
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                self.send_batch(self.encode_batch(plan, batch), started)
+                batch = []
+        if batch:
+            self.send_batch(self.encode_batch(plan, batch), started)
+        return time.perf_counter() - started
+    
+    def stop(self):
+        self.running = False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rocket telemetry and command simulator")
+    parser.add_argument("--frequency", type=float, default=10, help="Telemetry rate in Hz")
+    parser.add_argument("--command-latency", type=float, default=0.0, help="Delay before each ack, in ms")
+    parser.add_argument("--command-jitter", type=float, default=0.0, help="Uniform +/- jitter on the ack delay, in ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of commands acked as failed")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of commands never acked")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for sensor noise and command latency and failures")
+    parser.add_argument("--quiet", action="store_true", help="Don't print every command")
+    parser.add_argument("--replay", metavar="LOG", help="Replay a recording (CSV or manifest) instead of simulating")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor; 0 sends as fast as possible")
+    args = parser.parse_args()
+    
+    if args.replay:
+        replay = LogReplay(args.replay, speed=args.speed)
+        print(f"Replaying {args.replay} at {args.speed}x")
+        try:
+            seconds = replay.run()
+            print(f"Sent {replay.packets_sent} packets in {seconds:.1f} s")
+        except KeyboardInterrupt:
+            print(f"Stopped after {replay.packets_sent} packets")
+        raise SystemExit(0)
+    
+    # Create simulator
+    simulator = RocketSimulator(command_latency=args.command_latency / 1000.0,
+                                command_jitter=args.command_jitter / 1000.0,
+                                failure_rate=args.failure_rate, drop_rate=args.drop_rate,
+                                seed=args.seed, verbose=not args.quiet)
+    
+    try:
+        print("Starting rocket simulator...")
+        print("Press Ctrl+C to stop")
+        simulator.start_telemetry(args.frequency)
+    except KeyboardInterrupt:
+        print("Stopping simulator...")
+    finally:
         simulator.stop()
\ No newline at end of file
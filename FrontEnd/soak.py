@@ -0,0 +1,220 @@
+# soak.py
+import os
+import sys
+import csv
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+
+# The window is real but never shown on a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+
+from ui.main_window import MainWindow
+from network.multi_receiver import MultiSourceReceiver, TelemetrySource
+from network.command_sender import CommandSender
+from data.packet_parser import PacketParser
+from data.data_store import DataStore
+from data.data_logger import DataLogger
+from scenario import ScenarioRunner, UDPSink, hot_fire_scenario
+
+# Allowed growth per virtual hour after warm-up, by metric
+LIMITS = {
+    "rss_mb": 10.0,
+    "threads": 1.0,
+    "open_files": 2.0,
+    "ring_pending": 100.0,
+    "compress_queue": 1.0,
+    "update_ui_ms": 10.0
+}
+
+def free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+def slope(xs, ys):
+    """Least-squares slope of ys against xs."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if not var:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+
+class SoakTest:
+    """Run the whole ground station against a compressed synthetic test day.
+
+    A ScenarioRunner sends UDP at `speed` times real time into a
+    MultiSourceReceiver, whose DataStore records with a DataLogger and
+    feeds an offscreen MainWindow driven by its own frame scheduler.
+    Process and pipeline health is sampled every `interval` wall seconds.
+    """
+
+    def __init__(self, hours, speed, rate, interval, log_directory):
+        self.hours = hours
+        self.speed = speed
+        self.rate = rate
+        self.interval = interval
+        self.samples = []
+        self.done = False
+
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        port = free_port()
+        self.store = DataStore(name="soak", data_logger=DataLogger(log_directory=log_directory,
+                                                                   rotate_bytes=8 * 1024 * 1024))
+        self.source = TelemetrySource("soak", port, data_store=self.store)
+        self.receiver = MultiSourceReceiver(PacketParser(), [self.source], ip="127.0.0.1")
+        self.window = MainWindow(CommandSender(), self.store, data_stores={"soak": self.store},
+                                 telemetry_receiver=self.receiver)
+
+        # Time every update_ui call the frame scheduler makes
+        self.ui_times = []
+        update_ui = self.window.update_ui
+        def timed_update_ui(level=None):
+            started = time.perf_counter()
+            update_ui(level)
+            self.ui_times.append((time.perf_counter() - started) * 1000)
+        self.window.frame_scheduler.render = timed_update_ui
+
+        self.runner = ScenarioRunner(hot_fire_scenario(hours * 3600), seed=1, rate=rate)
+        self.sink = UDPSink("127.0.0.1", port)
+
+    def run(self):
+        threading.Thread(target=self.receiver.start_receiving, daemon=True).start()
+        time.sleep(0.2)
+        self.store.start_recording()
+
+        def feed():
+            self.runner.run(self.sink, speed=self.speed)
+            self.done = True
+        threading.Thread(target=feed, daemon=True).start()
+
+        self.started = time.perf_counter()
+        self.last_cpu = time.process_time()
+        self.last_wall = self.started
+        timer = QTimer()
+        timer.timeout.connect(self.sample)
+        timer.start(int(self.interval * 1000))
+        self.app.exec_()
+
+        self.store.stop_recording()
+        self.store.data_logger.wait_for_compression()
+        self.receiver.stop_receiving()
+        self.sink.close()
+
+    def sample(self):
+        now = time.perf_counter()
+        cpu = time.process_time()
+        ui_times, self.ui_times = self.ui_times, []
+        status = self.source.status()
+        self.samples.append({
+            "wall_s": round(now - self.started, 2),
+            "virtual_h": round(self.runner.packets_generated / self.rate / 3600.0, 4),
+            "rss_mb": round(rss_mb(), 2),
+            "cpu_percent": round(100.0 * (cpu - self.last_cpu) / (now - self.last_wall), 1),
+            "threads": threading.active_count(),
+            "open_files": len(os.listdir("/proc/self/fd")),
+            "ring_pending": self.store.samples.pending(),
+            "ring_dropped": self.store.samples.dropped,
+            "compress_queue": self.store.data_logger.compress_queue.qsize(),
+            "packets_received": status["packets_received"],
+            "packets_lost": status["packets_lost"],
+            "frames": len(ui_times),
+            "update_ui_ms": round(sum(ui_times) / len(ui_times), 3) if ui_times else 0.0,
+            "update_ui_max_ms": round(max(ui_times), 3) if ui_times else 0.0
+        })
+        self.last_cpu, self.last_wall = cpu, now
+        if self.done:
+            self.app.quit()
+
+    def evaluate(self, warmup=0.25):
+        """Growth per virtual hour of each limited metric after warm-up; returns (ok, trends)."""
+        steady = self.samples[int(len(self.samples) * warmup):]
+        if len(steady) > 2 and steady[-1]["frames"] < steady[-2]["frames"] / 2:
+            steady = steady[:-1]  # the last interval was cut short when the feed ended
+        hours = [sample["virtual_h"] for sample in steady]
+        trends = {}
+        ok = True
+        for name, limit in LIMITS.items():
+            values = [sample[name] for sample in steady]
+            growth = slope(hours, values)
+            passed = growth <= limit
+            ok = ok and passed
+            trends[name] = {"growth_per_hour": round(growth, 3), "limit": limit,
+                            "first": values[0] if values else None,
+                            "last": values[-1] if values else None, "pass": passed}
+        return ok, trends
+
+def write_report(directory, samples, trends, ok, settings):
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    series_path = os.path.join(directory, f"soak_{stamp}.csv")
+    with open(series_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(samples[0].keys()))
+        writer.writeheader()
+        writer.writerows(samples)
+    summary_path = os.path.join(directory, f"soak_{stamp}.json")
+    with open(summary_path, "w") as f:
+        json.dump({"settings": settings, "pass": ok, "trends": trends, "series": os.path.basename(series_path)},
+                  f, indent=2)
+    return series_path, summary_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Accelerated soak test of the full ground station pipeline")
+    parser.add_argument("--hours", type=float, default=2.0, help="Virtual test length")
+    parser.add_argument("--speed", type=float, default=30.0, help="Virtual seconds per real second")
+    parser.add_argument("--rate", type=float, default=100.0, help="Telemetry rate in Hz")
+    parser.add_argument("--interval", type=float, default=5.0, help="Wall seconds between samples")
+    parser.add_argument("--report", default="soak_reports", help="Directory for the time series and summary")
+    parser.add_argument("--compare", help="Summary JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    log_directory = tempfile.mkdtemp(prefix="soak_logs_")
+    soak = SoakTest(args.hours, args.speed, args.rate, args.interval, log_directory)
+    print(f"Soaking {args.hours} h of telemetry at {args.rate} Hz, {args.speed}x real time "
+          f"(~{args.hours * 3600 / args.speed / 60:.0f} min)...")
+    soak.run()
+
+    ok, trends = soak.evaluate()
+    settings = {"hours": args.hours, "speed": args.speed, "rate": args.rate, "interval": args.interval}
+    series_path, summary_path = write_report(args.report, soak.samples, trends, ok, settings)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["trends"]
+    for name, trend in trends.items():
+        line = (f"  {name:16} {trend['first']!s:>10} -> {trend['last']!s:>10}  "
+                f"{trend['growth_per_hour']:+10.3f}/h (limit {trend['limit']})  "
+                f"{'PASS' if trend['pass'] else 'FAIL'}")
+        if name in previous:
+            line += f"  was {previous[name]['growth_per_hour']:+.3f}/h"
+        print(line)
+    last = soak.samples[-1]
+    print(f"  {last['packets_received']} packets received, {last['packets_lost']} lost, "
+          f"{last['ring_dropped']} dropped by the UI ring")
+    print(f"Report: {series_path}, {summary_path}")
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,68 @@
+# tests/test_data_store.py
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.data_store import DataStore
+from data.packet_parser import PacketParser
+from simulator import RocketSimulator
+
+def make_telemetry(count):
+    simulator = RocketSimulator(command_port=None)
+    parser = PacketParser()
+    return [parser.parse_telemetry(simulator.generate_telemetry(now=n * 0.01)) for n in range(count)]
+
+def test_snapshot_is_consistent_under_a_concurrent_writer():
+    """Every snapshot pairs the sequence with the sample that made it, and never goes back."""
+    samples = make_telemetry(5000)
+    store = DataStore()
+    store.subscribe("test", ["pt_o1_3"], rate=None)
+    done = threading.Event()
+    state = {"reads": 0, "writes": 0, "errors": []}
+
+    def writer():
+        end = time.time() + 1.0
+        while time.time() < end:
+            for telemetry in samples:
+                store.update_telemetry(telemetry)
+            state["writes"] += len(samples)
+        done.set()
+
+    def reader():
+        last_sequence, last_time = 0, 0
+        while not done.is_set():
+            sequence, telemetry, receive_time = store.snapshot()
+            state["reads"] += 1
+            if sequence == 0:
+                if telemetry is not None:
+                    state["errors"].append(("telemetry before the first update", sequence))
+                continue
+            # Update n stores samples[(n - 1) % len(samples)]
+            if telemetry is not samples[(sequence - 1) % len(samples)]:
+                state["errors"].append(("sample from another update", sequence))
+            if sequence < last_sequence or receive_time < last_time:
+                state["errors"].append(("went back", sequence))
+            last_sequence, last_time = sequence, receive_time
+            # The consumer side may run at the same time without locking the writer
+            store.consume_samples()
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert state["errors"] == []
+    assert state["reads"] > 0
+    sequence, telemetry, _ = store.snapshot()
+    assert sequence == state["writes"]
+    assert telemetry is samples[-1]
+    assert store.latest_telemetry is samples[-1]
\ No newline at end of file
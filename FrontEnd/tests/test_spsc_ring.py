@@ -0,0 +1,88 @@
+# tests/test_spsc_ring.py
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.spsc_ring import SPSCRing
+
+def test_consume_returns_items_in_order():
+    ring = SPSCRing(8)
+    for n in range(5):
+        ring.publish(n)
+    assert ring.consume() == [0, 1, 2, 3, 4]
+    assert ring.consume() == []
+    assert ring.pending() == 0
+
+def test_lapped_consumer_counts_dropped():
+    ring = SPSCRing(4)
+    for n in range(10):
+        ring.publish(n)
+    assert ring.consume() == [7, 8, 9]
+    assert ring.dropped == 7
+
+def test_slot_written_before_published_advances():
+    # The producer has stored item 6 in slot 6 % 4 == 2 but not yet
+    # advanced published; the consumer, a full ring behind, must not
+    # return it in place of item 2
+    ring = SPSCRing(4)
+    ring.publish(0)
+    ring.publish(1)
+    assert ring.consume() == [0, 1]
+    for n in range(2, 6):
+        ring.publish(n)
+    ring.slots[6 % ring.capacity] = 6
+    items = ring.consume()
+    assert items == [3, 4, 5]
+    assert ring.dropped == 1
+
+def test_concurrent_publish_and_consume():
+    """Producer/consumer pairs flat out: strictly increasing, and seen + dropped == published."""
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # frequent thread switches shake out races
+    try:
+        results = []
+
+        def run_pair():
+            ring = SPSCRing(1024)
+            done = threading.Event()
+            state = {"seen": 0, "errors": 0}
+
+            def producer():
+                n = 0
+                end = time.time() + 1.0
+                while time.time() < end:
+                    for _ in range(1000):
+                        ring.publish(n)
+                        n += 1
+                done.set()
+
+            def consumer():
+                last = -1
+                while not done.is_set() or ring.pending():
+                    for value in ring.consume():
+                        if value <= last:
+                            state["errors"] += 1
+                        last = value
+                        state["seen"] += 1
+
+            threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results.append((ring.published, state["seen"], ring.dropped, state["errors"]))
+
+        pairs = [threading.Thread(target=run_pair) for _ in range(4)]
+        for thread in pairs:
+            thread.start()
+        for thread in pairs:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    for published, seen, dropped, errors in results:
+        assert errors == 0
+        assert seen + dropped == published
\ No newline at end of file
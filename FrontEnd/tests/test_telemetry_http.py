@@ -0,0 +1,109 @@
+# tests/test_telemetry_http.py
+import os
+import sys
+import json
+import socket
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.data_store import DataStore
+from data.packet_parser import PacketParser
+from network.telemetry_http import TelemetryHTTPServer
+from simulator import RocketSimulator
+
+class FakeReceiver:
+    """The two calls the server makes on a MultiSourceReceiver."""
+
+    def __init__(self, stores):
+        self.stores = stores
+
+    def data_stores(self):
+        return self.stores
+
+    def source_status(self):
+        return [{"name": name} for name in self.stores]
+
+def request(port, target, method="GET"):
+    """Send one request and return (status, parsed JSON body or None)."""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(f"{method} {target} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+        response = b""
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            response += data
+    if not response:
+        return None, None
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, json.loads(body) if body else None
+
+def feed(store, count, start=0):
+    simulator = RocketSimulator(command_port=None)
+    parser = PacketParser()
+    for n in range(start, start + count):
+        store.update_telemetry(parser.parse_telemetry(simulator.generate_telemetry(now=n * 0.01)))
+
+def start_server():
+    store = DataStore(name="vehicle")
+    server = TelemetryHTTPServer(FakeReceiver({"vehicle": store}), port=0)
+    server.start()
+    return server, store
+
+def test_latest_is_encoded_once_per_sequence():
+    server, store = start_server()
+    try:
+        feed(store, 5)
+        status, first = request(server.port, "/latest")
+        assert status == 200
+        assert first["vehicle"]["sequence"] == 5
+        status, second = request(server.port, "/latest")
+        assert second == first
+        assert (server.encodes, server.cache_hits) == (1, 1)
+
+        feed(store, 1, start=5)
+        status, third = request(server.port, "/latest")
+        assert third["vehicle"]["sequence"] == 6
+        assert (server.encodes, server.cache_hits) == (2, 1)
+    finally:
+        server.stop()
+
+def test_history_returns_requested_channel():
+    server, store = start_server()
+    try:
+        feed(store, 200)
+        status, body = request(server.port, "/history?channel=pt_o1_3&points=50")
+        assert status == 200
+        channel = body["channels"]["pt_o1_3"]
+        assert 0 < len(channel["times"]) <= 50
+        assert len(channel["min"]) == len(channel["max"]) == len(channel["mean"]) == len(channel["times"])
+        assert request(server.port, "/history?channel=nope")[0] == 400
+    finally:
+        server.stop()
+
+def test_bad_requests_get_errors_and_the_server_stays_up():
+    server, store = start_server()
+    try:
+        feed(store, 1)
+        assert request(server.port, "//[x")[0] == 400
+        assert request(server.port, "/missing")[0] == 404
+        assert request(server.port, "/latest", method="POST")[0] == 405
+        assert request(server.port, "/latest?source=other")[0] == 400
+        assert request(server.port, "/latest")[0] == 200
+        assert server.thread.is_alive()
+    finally:
+        server.stop()
+
+def test_client_error_drops_only_that_connection():
+    server, store = start_server()
+    try:
+        def broken(params):
+            raise KeyError("boom")
+        server.routes["/broken"] = broken
+        assert request(server.port, "/broken") == (None, None)
+        assert request(server.port, "/") == (200, {"sources": ["vehicle"],
+                                                   "endpoints": ["/", "/broken", "/history", "/latest", "/stats"]})
+        assert server.thread.is_alive()
+    finally:
+        server.stop()
\ No newline at end of file
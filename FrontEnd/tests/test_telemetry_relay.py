@@ -0,0 +1,98 @@
+# tests/test_telemetry_relay.py
+import os
+import sys
+import time
+import socket
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.telemetry_relay import TelemetryRelay, RelaySubscriber
+
+def wait_for(condition, timeout=5.0):
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, "timed out"
+        time.sleep(0.01)
+
+def collect(subscriber, count, received):
+    for name, packet in subscriber.packets():
+        received.append((name, packet))
+        if len(received) == count:
+            return
+
+def start_relay(queue_length=1000):
+    relay = TelemetryRelay(port=0, queue_length=queue_length)
+    relay.start()
+    return relay
+
+def test_every_subscriber_gets_every_packet_in_order():
+    relay = start_relay()
+    subscribers = [RelaySubscriber(port=relay.port) for _ in range(3)]
+    try:
+        wait_for(lambda: len(relay.stats()) == 3)
+        packets = [(f"source{n % 2}", n.to_bytes(4, "little") * 16) for n in range(500)]
+        received = [[] for _ in subscribers]
+        readers = [threading.Thread(target=collect, args=(subscriber, len(packets), out))
+                   for subscriber, out in zip(subscribers, received)]
+        for reader in readers:
+            reader.start()
+        for name, packet in packets:
+            relay.publish(name, packet)
+        for reader in readers:
+            reader.join(timeout=10)
+        for out in received:
+            assert out == packets
+        assert all(stats["dropped"] == 0 for stats in relay.stats())
+    finally:
+        for subscriber in subscribers:
+            subscriber.close()
+        relay.stop()
+
+def test_slow_subscriber_drops_alone_and_publish_never_blocks():
+    relay = start_relay(queue_length=100)
+    fast = RelaySubscriber(port=relay.port)
+    # Never reads, with a small receive buffer so its queue fills quickly
+    slow = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    slow.connect(("127.0.0.1", relay.port))
+    try:
+        wait_for(lambda: len(relay.stats()) == 2)
+        fast_address = fast.sock.getsockname()
+        count = 5000
+        received = []
+        reader = threading.Thread(target=collect, args=(fast, count, received))
+        reader.start()
+
+        packet = b"\x55" * 1000
+        slowest = 0.0
+        for n in range(count):
+            start = time.perf_counter()
+            relay.publish("vehicle", packet)
+            slowest = max(slowest, time.perf_counter() - start)
+            if n % 50 == 49:
+                time.sleep(0.002)  # roughly a telemetry rate the fast reader keeps up with
+        reader.join(timeout=10)
+
+        stats = {tuple(entry["address"]): entry for entry in relay.stats()}
+        slow_stats = stats[slow.getsockname()]
+        assert len(received) == count
+        assert stats[fast_address]["dropped"] == 0
+        assert slow_stats["dropped"] > 0
+        assert slow_stats["queued"] <= 100
+        assert slowest < 0.05
+    finally:
+        fast.close()
+        slow.close()
+        relay.stop()
+
+def test_disconnected_subscriber_is_removed():
+    relay = start_relay()
+    subscriber = RelaySubscriber(port=relay.port)
+    try:
+        wait_for(lambda: len(relay.stats()) == 1)
+        subscriber.close()
+        wait_for(lambda: not relay.stats())
+        relay.publish("vehicle", b"\x00" * 10)  # nobody left to queue for
+    finally:
+        relay.stop()
\ No newline at end of file
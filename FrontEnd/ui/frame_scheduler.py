@@ -0,0 +1,120 @@
+# ui/frame_scheduler.py
+import time
+from PyQt5.QtCore import QTimer
+
+class FrameScheduler:
+    """Drive UI refreshes from data arrival and render cost.
+
+    Every frame is scheduled with a single-shot timer after the previous one
+    finishes, so a slow frame delays the next one instead of queueing ticks
+    behind it. A tick with nothing new to draw is skipped and the check
+    interval backs off towards idle_interval. When data is arriving the
+    interval follows the data rate, bounded below by min_interval and by
+    keeping rendering under `budget` of each frame. If even max_interval
+    can't hold that, optional panels are dropped from the end of the
+    priority list and restored once rendering has been cheap for a while.
+    """
+
+    def __init__(self, render, pending, panel_count, min_interval=0.033, max_interval=0.25,
+                 idle_interval=0.25, budget=0.5):
+        self.render = render        # render(level) draws the first `level` optional panels
+        self.pending = pending      # pending() -> number of new samples to draw
+        self.panel_count = panel_count
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.budget = budget
+
+        self.level = panel_count
+        self.interval = min_interval
+        self.render_cost = 0.0   # smoothed seconds per frame
+        self.data_rate = 0.0     # smoothed samples per second
+        self.cheap_frames = 0
+        self.frames = 0
+        self.skipped = 0
+        self.forced = False
+        self.last_check = time.perf_counter()
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.last_check = time.perf_counter()
+        self.timer.start(0)
+
+    def stop(self):
+        self.timer.stop()
+
+    def set_panel_count(self, panel_count):
+        """Start over with a new set of optional panels, e.g. after a tab switch."""
+        self.panel_count = panel_count
+        self.level = panel_count
+        self.render_cost = 0.0  # measured for the old panels
+        self.cheap_frames = 0
+
+    def request_frame(self):
+        """Draw as soon as possible, e.g. after the user changed the view."""
+        self.forced = True
+        self.timer.start(0)
+
+    def tick(self):
+        pending = self.pending()
+        forced, self.forced = self.forced, False
+        if not pending and not forced:
+            # Nothing new: skip the frame and check less often
+            self.skipped += 1
+            self.interval = min(self.interval * 1.5, self.idle_interval)
+            self.timer.start(int(self.interval * 1000))
+            return
+
+        # Pending samples accumulated since the last drawn frame
+        now = time.perf_counter()
+        elapsed = now - self.last_check
+        self.last_check = now
+        if pending and elapsed > 0:
+            rate = pending / elapsed
+            self.data_rate = rate if not self.data_rate else 0.8 * self.data_rate + 0.2 * rate
+
+        start = time.perf_counter()
+        try:
+            self.render(self.level)
+        except Exception as e:
+            print(f"Error rendering frame: {e}")
+        cost = time.perf_counter() - start
+        self.render_cost = cost if not self.render_cost else 0.8 * self.render_cost + 0.2 * cost
+        self.frames += 1
+
+        self.adjust()
+        # The frame itself already used part of the interval
+        self.timer.start(max(0, int((self.interval - cost) * 1000)))
+
+    def adjust(self):
+        # No point refreshing faster than data arrives
+        wanted = max(self.min_interval, 1.0 / self.data_rate if self.data_rate else self.min_interval)
+        needed = self.render_cost / self.budget
+        self.interval = min(max(wanted, needed), self.max_interval)
+
+        if needed > self.max_interval and self.level > 0:
+            # Over budget even at the slowest rate: shed the least important panel
+            self.level -= 1
+            self.render_cost = 0.0  # re-measure at the new level
+            self.cheap_frames = 0
+        elif self.level < self.panel_count and needed < self.max_interval / 2:
+            # Restore panels one at a time after a sustained run of cheap frames
+            self.cheap_frames += 1
+            if self.cheap_frames >= 50:
+                self.level += 1
+                self.cheap_frames = 0
+        else:
+            self.cheap_frames = 0
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "interval": self.interval,
+            "render_cost": self.render_cost,
+            "data_rate": self.data_rate,
+            "level": self.level
+        }
\ No newline at end of file
@@ -1,786 +1,1257 @@
-# ui/main_window.py
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QLabel, QPushButton, QTabWidget, QGridLayout,
-                            QGroupBox, QProgressBar, QSlider, QSpinBox)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor, QPalette
-
-import pyqtgraph as pg
-import numpy as np
-import time
-import threading
-
-class MainWindow(QMainWindow):
-    def __init__(self, command_sender, data_store):
-        super().__init__()
-        self.command_sender = command_sender
-        self.data_store = data_store
-        
-        # Window properties
-        self.setWindowTitle("Rocket Monitoring System")
-        self.setMinimumSize(1200, 800)
-        
-        # Create main widget and layout
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        
-        self.main_layout = QVBoxLayout(self.central_widget)
-        
-        # Create status bar at top
-        self.setup_status_bar()
-        
-        # Create tab widget for different views
-        self.tabs = QTabWidget()
-        self.main_layout.addWidget(self.tabs)
-        
-        # Initialize data structures for plots
-        self.time_data = []
-        self.pressure_data = {
-            "pt_o1_3": [], "pt_o2_2": [], "pt_p1_6": [], 
-            "pt_f2_4": [], "pt_f1_5": [], "pt_f2_4_engine": []
-        }
-        
-        # Add tabs
-        self.setup_overview_tab()
-        self.setup_oxidizer_tab()
-        self.setup_fuel_tab()
-        self.setup_engine_tab()
-        self.setup_control_tab()
-        
-        # Setup plots
-        
-        # Start a timer to regularly update connection status
-        self.connection_timer = QTimer()
-        self.connection_timer.timeout.connect(self.update_connection_status)
-        self.connection_timer.start(500)  # Check every 500ms
-    
-    def setup_status_bar(self):
-        status_layout = QHBoxLayout()
-        self.main_layout.addLayout(status_layout)
-        
-        # System status indicators
-        self.connection_status = QLabel("NOT CONNECTED")
-        self.connection_status.setStyleSheet("background-color: red; padding: 5px; border-radius: 5px;")
-        status_layout.addWidget(self.connection_status)
-        
-        self.armed_status = QLabel("SAFE")
-        self.armed_status.setStyleSheet("background-color: green; padding: 5px; border-radius: 5px;")
-        status_layout.addWidget(self.armed_status)
-        
-        # Spacer
-        status_layout.addStretch()
-        
-        # Recording button
-        self.record_button = QPushButton("Start Recording")
-        self.record_button.setCheckable(True)
-        self.record_button.toggled.connect(self.toggle_recording)
-        status_layout.addWidget(self.record_button)
-        
-        # Emergency stop button
-        self.estop_button = QPushButton("EMERGENCY STOP")
-        self.estop_button.setStyleSheet("background-color: red; color: white; font-weight: bold; min-height: 40px;")
-        self.estop_button.clicked.connect(self.emergency_stop)
-        status_layout.addWidget(self.estop_button)
-    
-    def setup_overview_tab(self):
-        overview_widget = QWidget()
-        overview_layout = QVBoxLayout(overview_widget)
-        
-        # Pressure graphs
-        pressure_plot = pg.PlotWidget(title="Pressure Readings")
-        pressure_plot.setBackground('w')  # Set white background
-        pressure_plot.addLegend()
-        pressure_plot.setLabel('left', "Pressure", units='PSI')
-        pressure_plot.setLabel('bottom', "Time", units='s')
-        pressure_plot.getAxis('left').setPen('k')  # Black axis lines
-        pressure_plot.getAxis('bottom').setPen('k')
-        pressure_plot.getAxis('left').setTextPen('k')  # Black text
-        pressure_plot.getAxis('bottom').setTextPen('k')
-        self.pressure_plot = pressure_plot
-        
-        # Create plot lines with different colors
-        self.pressure_curves = {}
-        colors = ['r', 'g', 'b', 'c', 'm', 'k']
-        for i, name in enumerate(self.pressure_data.keys()):
-            pen = pg.mkPen(color=colors[i % len(colors)], width=2)
-            self.pressure_curves[name] = pressure_plot.plot(
-                [], [], name=name, pen=pen
-            )
-        
-        overview_layout.addWidget(pressure_plot)
-        
-        # System status grid
-        status_group = QGroupBox("System Status")
-        status_layout = QGridLayout(status_group)
-        
-        # Add status indicators for each component
-        self.status_indicators = {}
-        
-        # Oxidizer system indicators
-        status_layout.addWidget(QLabel("Oxidizer System:"), 0, 0)
-        self.status_indicators["oxidizer"] = QLabel("Unknown")
-        status_layout.addWidget(self.status_indicators["oxidizer"], 0, 1)
-        
-        # Fuel system indicators
-        status_layout.addWidget(QLabel("Fuel System:"), 1, 0)
-        self.status_indicators["fuel"] = QLabel("Unknown")
-        status_layout.addWidget(self.status_indicators["fuel"], 1, 1)
-        
-        # Engine indicators
-        status_layout.addWidget(QLabel("Engine:"), 2, 0)
-        self.status_indicators["engine"] = QLabel("Unknown")
-        status_layout.addWidget(self.status_indicators["engine"], 2, 1)
-        
-        overview_layout.addWidget(status_group)
-        
-        self.tabs.addTab(overview_widget, "Overview")
-    
-    def setup_oxidizer_tab(self):
-        """Set up the tank systems tab with monitoring for all tanks"""
-        # Rename to reflect broader focus
-        tank_widget = QWidget()
-        layout = QGridLayout(tank_widget)
-        
-        # Create data display panel at the top
-        data_group = QGroupBox("Tank Readings")
-        data_layout = QGridLayout(data_group)
-        
-        # --- Oxidizer Tank Section ---
-        data_layout.addWidget(QLabel("Oxidizer Tank:", styleSheet="font-weight: bold;"), 0, 0)
-        
-        # Pressure readings
-        data_layout.addWidget(QLabel("Pressure (PSI):"), 1, 0)
-        self.ox_pressure_value = QLabel("0.0")
-        self.ox_pressure_value.setStyleSheet("font-size: 18px; font-weight: bold;")
-        data_layout.addWidget(self.ox_pressure_value, 1, 1)
-        
-        # Load cell readings
-        data_layout.addWidget(QLabel("Load (N):"), 2, 0)
-        self.ox_load_value = QLabel("0.0")
-        self.ox_load_value.setStyleSheet("font-size: 18px; font-weight: bold;")
-        data_layout.addWidget(self.ox_load_value, 2, 1)
-        
-        # --- Fuel Tank Section ---
-        data_layout.addWidget(QLabel("Fuel Tank:", styleSheet="font-weight: bold;"), 0, 2)
-        
-        # Pressure readings
-        data_layout.addWidget(QLabel("Pressure (PSI):"), 1, 2)
-        self.fuel_pressure_value = QLabel("0.0")
-        self.fuel_pressure_value.setStyleSheet("font-size: 18px; font-weight: bold;")
-        data_layout.addWidget(self.fuel_pressure_value, 1, 3)
-        
-        # --- Pressurant Tank Section ---
-        data_layout.addWidget(QLabel("Pressurant Tank:", styleSheet="font-weight: bold;"), 0, 4)
-        
-        # Pressure readings
-        data_layout.addWidget(QLabel("Pressure (PSI):"), 1, 4)
-        self.press_pressure_value = QLabel("0.0")
-        self.press_pressure_value.setStyleSheet("font-size: 18px; font-weight: bold;")
-        data_layout.addWidget(self.press_pressure_value, 1, 5)
-        
-        # Add data group to main layout
-        layout.addWidget(data_group, 0, 0, 1, 2)
-        
-        # Create plots
-        # 1. Oxidizer Tank Pressure
-        ox_pressure_plot = pg.PlotWidget(title="Oxidizer Tank Pressure")
-        ox_pressure_plot.setBackground('w')  # Set white background
-        ox_pressure_plot.setLabel('left', "Pressure", units='PSI')
-        ox_pressure_plot.setLabel('bottom', "Time", units='s')
-        ox_pressure_plot.getAxis('left').setPen('k')  # Black axis lines
-        ox_pressure_plot.getAxis('bottom').setPen('k')
-        ox_pressure_plot.getAxis('left').setTextPen('k')  # Black text
-        ox_pressure_plot.getAxis('bottom').setTextPen('k')
-        ox_pressure_plot.setMinimumHeight(200)
-        self.ox_pressure_plot = ox_pressure_plot
-        self.ox_pressure_curve = ox_pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
-        
-        # 2. Oxidizer Tank Load
-        ox_load_plot = pg.PlotWidget(title="Oxidizer Tank Weight")
-        ox_load_plot.setBackground('w')  # Set white background
-        ox_load_plot.setLabel('left', "Mass", units='kg')
-        ox_load_plot.setLabel('bottom', "Time", units='s')
-        ox_load_plot.getAxis('left').setPen('k')  # Black axis lines
-        ox_load_plot.getAxis('bottom').setPen('k')
-        ox_load_plot.getAxis('left').setTextPen('k')  # Black text
-        ox_load_plot.getAxis('bottom').setTextPen('k')
-        ox_load_plot.setMinimumHeight(200)
-        self.ox_load_plot = ox_load_plot
-        self.ox_load_curve = ox_load_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
-        
-        # 3. Fuel Tank Pressure
-        fuel_pressure_plot = pg.PlotWidget(title="Fuel Tank Pressure")
-        fuel_pressure_plot.setBackground('w')  # Set white background
-        fuel_pressure_plot.setLabel('left', "Pressure", units='PSI')
-        fuel_pressure_plot.setLabel('bottom', "Time", units='s')
-        fuel_pressure_plot.getAxis('left').setPen('k')  # Black axis lines
-        fuel_pressure_plot.getAxis('bottom').setPen('k')
-        fuel_pressure_plot.getAxis('left').setTextPen('k')  # Black text
-        fuel_pressure_plot.getAxis('bottom').setTextPen('k')
-        fuel_pressure_plot.setMinimumHeight(200)
-        self.fuel_pressure_plot = fuel_pressure_plot
-        self.fuel_pressure_curve = fuel_pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
-        
-        # 4. Pressurant Tank Pressure
-        press_pressure_plot = pg.PlotWidget(title="Pressurant Tank Pressure")
-        press_pressure_plot.setBackground('w')  # Set white background
-        press_pressure_plot.setLabel('left', "Pressure", units='PSI')
-        press_pressure_plot.setLabel('bottom', "Time", units='s')
-        press_pressure_plot.getAxis('left').setPen('k')  # Black axis lines
-        press_pressure_plot.getAxis('bottom').setPen('k')
-        press_pressure_plot.getAxis('left').setTextPen('k')  # Black text
-        press_pressure_plot.getAxis('bottom').setTextPen('k')
-        press_pressure_plot.setMinimumHeight(200)
-        self.press_pressure_plot = press_pressure_plot
-        self.press_pressure_curve = press_pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
-        
-        # Add plots to layout
-        layout.addWidget(ox_pressure_plot, 1, 0)
-        layout.addWidget(ox_load_plot, 1, 1)
-        layout.addWidget(fuel_pressure_plot, 2, 0)
-        layout.addWidget(press_pressure_plot, 2, 1)
-        
-        # Initialize data arrays for tank tab plots
-        self.tank_data = {
-            "ox_pressure": [],
-            "ox_load": [],
-            "fuel_pressure": [],
-            "press_pressure": []
-        }
-        
-        # Rename the tab
-        self.tabs.addTab(tank_widget, "Tank Systems")
-    
-    def setup_fuel_tab(self):
-        # Placeholder - you would expand this with specific fuel system widgets
-        fuel_widget = QWidget()
-        layout = QVBoxLayout(fuel_widget)
-        layout.addWidget(QLabel("Fuel System Details"))
-        
-        self.tabs.addTab(fuel_widget, "Fuel System")
-    
-    def setup_engine_tab(self):
-        engine_widget = QWidget()
-        layout = QVBoxLayout(engine_widget)
-        
-        # Create top section with live numerical data
-        data_group = QGroupBox("Engine Sensor Readings")
-        data_layout = QGridLayout(data_group)
-        
-        # Pressure sensors section
-        data_layout.addWidget(QLabel("Pressure Sensors (PSI):", styleSheet="font-weight: bold;"), 0, 0)
-        self.pressure_labels = {}
-        
-        # Create labels for each pressure sensor
-        pressure_sensors = ["pt_f2_4_engine"]
-        for i, sensor in enumerate(pressure_sensors):
-            data_layout.addWidget(QLabel(f"{sensor.upper()}:"), 1, i)
-            self.pressure_labels[sensor] = QLabel("0.0")
-            self.pressure_labels[sensor].setStyleSheet("font-size: 18px; font-weight: bold;")
-            data_layout.addWidget(self.pressure_labels[sensor], 2, i)
-        
-        # Add average pressure label
-        data_layout.addWidget(QLabel("Average:"), 1, len(pressure_sensors))
-        self.avg_pressure_label = QLabel("0.0")
-        self.avg_pressure_label.setStyleSheet("font-size: 18px; font-weight: bold; color: blue;")
-        data_layout.addWidget(self.avg_pressure_label, 2, len(pressure_sensors))
-        
-        # Load cell sensors section
-        data_layout.addWidget(QLabel("Load Cells (N):", styleSheet="font-weight: bold;"), 3, 0)
-        self.load_labels = {}
-        
-        # Create labels for each load cell
-        load_sensors = ["lc_1", "lc_2"]
-        for i, sensor in enumerate(load_sensors):
-            data_layout.addWidget(QLabel(f"{sensor.upper()}:"), 4, i)
-            self.load_labels[sensor] = QLabel("0.0")
-            self.load_labels[sensor].setStyleSheet("font-size: 18px; font-weight: bold;")
-            data_layout.addWidget(self.load_labels[sensor], 5, i)
-        
-        # Add average load label
-        data_layout.addWidget(QLabel("Average:"), 4, len(load_sensors))
-        self.avg_load_label = QLabel("0.0")
-        self.avg_load_label.setStyleSheet("font-size: 18px; font-weight: bold; color: blue;")
-        data_layout.addWidget(self.avg_load_label, 5, len(load_sensors))
-        
-        # Temperature sensors section
-        data_layout.addWidget(QLabel("Temperature Sensors (°C):", styleSheet="font-weight: bold;"), 6, 0)
-        self.temp_labels = {}
-        
-        # Create labels for each temperature sensor
-        temp_sensors = ["tc_1"]
-        for i, sensor in enumerate(temp_sensors):
-            data_layout.addWidget(QLabel(f"{sensor.upper()}:"), 7, i)
-            self.temp_labels[sensor] = QLabel("0.0")
-            self.temp_labels[sensor].setStyleSheet("font-size: 18px; font-weight: bold;")
-            data_layout.addWidget(self.temp_labels[sensor], 8, i)
-        
-        # Add average temperature label (just for consistency in this case)
-        data_layout.addWidget(QLabel("Average:"), 7, len(temp_sensors))
-        self.avg_temp_label = QLabel("0.0")
-        self.avg_temp_label.setStyleSheet("font-size: 18px; font-weight: bold; color: blue;")
-        data_layout.addWidget(self.avg_temp_label, 8, len(temp_sensors))
-        
-        # Add the data group to the main layout
-        layout.addWidget(data_group)
-        
-        # Create the three graph sections
-        # 1. Pressure Graph
-        pressure_plot = pg.PlotWidget(title="Engine Pressure")
-        pressure_plot.setBackground('w')  # Set white background
-        pressure_plot.setLabel('left', "Pressure", units='PSI')
-        pressure_plot.setLabel('bottom', "Time", units='s')
-        pressure_plot.getAxis('left').setPen('k')  # Black axis lines
-        pressure_plot.getAxis('bottom').setPen('k')
-        pressure_plot.getAxis('left').setTextPen('k')  # Black text
-        pressure_plot.getAxis('bottom').setTextPen('k')
-        self.engine_pressure_plot = pressure_plot
-        self.engine_pressure_curve = pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
-        
-        # 2. Load Cell Graph
-        load_plot = pg.PlotWidget(title="Engine Thrust")
-        load_plot.setBackground('w')  # Set white background
-        load_plot.setLabel('left', "Force", units='N')
-        load_plot.setLabel('bottom', "Time", units='s')
-        load_plot.getAxis('left').setPen('k')  # Black axis lines
-        load_plot.getAxis('bottom').setPen('k')
-        load_plot.getAxis('left').setTextPen('k')  # Black text
-        load_plot.getAxis('bottom').setTextPen('k')
-        self.engine_load_plot = load_plot
-        self.engine_load_curves = {}
-        for i, sensor in enumerate(load_sensors):
-            pen = pg.mkPen(color=['b', 'g'][i % 2], width=2)
-            self.engine_load_curves[sensor] = load_plot.plot([], [], name=sensor, pen=pen)
-        
-        # 3. Temperature Graph
-        temp_plot = pg.PlotWidget(title="Engine Temperature")
-        temp_plot.setBackground('w')  # Set white background
-        temp_plot.setLabel('left', "Temperature", units='°C')
-        temp_plot.setLabel('bottom', "Time", units='s')
-        temp_plot.getAxis('left').setPen('k')  # Black axis lines
-        temp_plot.getAxis('bottom').setPen('k')
-        temp_plot.getAxis('left').setTextPen('k')  # Black text
-        temp_plot.getAxis('bottom').setTextPen('k')
-        self.engine_temp_plot = temp_plot
-        self.engine_temp_curve = temp_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
-        
-        # Add plots to main layout
-        layout.addWidget(pressure_plot)
-        layout.addWidget(load_plot)
-        layout.addWidget(temp_plot)
-        
-        # Initialize data structures for engine tab plots
-        self.engine_data = {
-            "pressure": [],
-            "load": {sensor: [] for sensor in load_sensors},
-            "temp": []
-        }
-        
-        self.tabs.addTab(engine_widget, "Engine")
-    
-    def setup_control_tab(self):
-        control_widget = QWidget()
-        layout = QGridLayout(control_widget)
-        
-        # Solenoid valve controls
-        solenoid_group = QGroupBox("Solenoid Valves")
-        solenoid_layout = QGridLayout(solenoid_group)
-        
-        # RVV-O valve
-        solenoid_layout.addWidget(QLabel("RVV-O:"), 0, 0)
-        self.rvv_o_button = QPushButton("CLOSED")
-        self.rvv_o_button.setCheckable(True)
-        self.rvv_o_button.toggled.connect(lambda checked: self.toggle_solenoid(1, 0x01, checked))
-        solenoid_layout.addWidget(self.rvv_o_button, 0, 1)
-        
-        # MPV-P valve
-        solenoid_layout.addWidget(QLabel("MPV-P:"), 1, 0)
-        self.mpv_p_button = QPushButton("CLOSED")
-        self.mpv_p_button.setCheckable(True)
-        self.mpv_p_button.toggled.connect(lambda checked: self.toggle_solenoid(2, 0x02, checked))
-        solenoid_layout.addWidget(self.mpv_p_button, 1, 1)
-        
-        # RVV-F valve
-        solenoid_layout.addWidget(QLabel("RVV-F:"), 2, 0)
-        self.rvv_f_button = QPushButton("CLOSED")
-        self.rvv_f_button.setCheckable(True)
-        self.rvv_f_button.toggled.connect(lambda checked: self.toggle_solenoid(3, 0x03, checked))
-        solenoid_layout.addWidget(self.rvv_f_button, 2, 1)
-        
-        layout.addWidget(solenoid_group, 0, 0)
-        
-        # Servo valve controls
-        servo_group = QGroupBox("Servo Valves")
-        servo_layout = QGridLayout(servo_group)
-        
-        # DOT-to-Oxidizer Servo
-        servo_layout.addWidget(QLabel("DOT-to-Oxidizer:"), 0, 0)
-        self.dot_ox_slider = QSlider(Qt.Horizontal)
-        self.dot_ox_slider.setMinimum(0)
-        self.dot_ox_slider.setMaximum(255)
-        self.dot_ox_slider.valueChanged.connect(lambda val: self.update_servo_value(4, val))
-        servo_layout.addWidget(self.dot_ox_slider, 0, 1)
-        self.dot_ox_value = QSpinBox()
-        self.dot_ox_value.setMinimum(0)
-        self.dot_ox_value.setMaximum(255)
-        self.dot_ox_value.valueChanged.connect(self.dot_ox_slider.setValue)
-        servo_layout.addWidget(self.dot_ox_value, 0, 2)
-        
-        # MPF-F Servo
-        servo_layout.addWidget(QLabel("MPF-F:"), 1, 0)
-        self.mpf_f_slider = QSlider(Qt.Horizontal)
-        self.mpf_f_slider.setMinimum(0)
-        self.mpf_f_slider.setMaximum(255)
-        self.mpf_f_slider.valueChanged.connect(lambda val: self.update_servo_value(5, val))
-        servo_layout.addWidget(self.mpf_f_slider, 1, 1)
-        self.mpf_f_value = QSpinBox()
-        self.mpf_f_value.setMinimum(0)
-        self.mpf_f_value.setMaximum(255)
-        self.mpf_f_value.valueChanged.connect(self.mpf_f_slider.setValue)
-        servo_layout.addWidget(self.mpf_f_value, 1, 2)
-        
-        # Oxidizer-to-Engine Servo
-        servo_layout.addWidget(QLabel("Oxidizer-to-Engine:"), 2, 0)
-        self.ox_engine_slider = QSlider(Qt.Horizontal)
-        self.ox_engine_slider.setMinimum(0)
-        self.ox_engine_slider.setMaximum(255)
-        self.ox_engine_slider.valueChanged.connect(lambda val: self.update_servo_value(6, val))
-        servo_layout.addWidget(self.ox_engine_slider, 2, 1)
-        self.ox_engine_value = QSpinBox()
-        self.ox_engine_value.setMinimum(0)
-        self.ox_engine_value.setMaximum(255)
-        self.ox_engine_value.valueChanged.connect(self.ox_engine_slider.setValue)
-        servo_layout.addWidget(self.ox_engine_value, 2, 2)
-        
-        layout.addWidget(servo_group, 0, 1)
-        
-        # Actuator controls
-        actuator_group = QGroupBox("Actuators & Injectors")
-        actuator_layout = QGridLayout(actuator_group)
-        
-        # Setup similar sliders for actuators...
-        
-        layout.addWidget(actuator_group, 1, 0, 1, 2)
-        
-        # System control buttons
-        system_group = QGroupBox("System Control")
-        system_layout = QHBoxLayout(system_group)
-        
-        # Arm button
-        self.arm_button = QPushButton("ARM SYSTEM")
-        self.arm_button.setCheckable(True)
-        self.arm_button.toggled.connect(self.toggle_arm)
-        system_layout.addWidget(self.arm_button)
-        
-        # Start sequence button
-        self.start_button = QPushButton("START SEQUENCE")
-        self.start_button.clicked.connect(self.start_sequence)
-        self.start_button.setEnabled(False)  # Disabled until armed
-        system_layout.addWidget(self.start_button)
-        
-        # Abort button
-        self.abort_button = QPushButton("ABORT")
-        self.abort_button.clicked.connect(self.abort_sequence)
-        system_layout.addWidget(self.abort_button)
-        
-        layout.addWidget(system_group, 2, 0, 1, 2)
-        
-        self.tabs.addTab(control_widget, "Control Panel")
-    
-    def update_ui(self):
-        """Update UI with latest telemetry data"""
-        if not self.data_store.latest_telemetry:
-            print("No telemetry received.")
-            return
-        
-        # Prevent plotting until UI is fully ready
-        if not hasattr(self, 'engine_data'):
-            return
-        
-        telemetry = self.data_store.latest_telemetry
-        
-        # Update time data for plots
-        current_time = time.time()
-        
-        # Set the max data points to keep
-        MAX_POINTS = 500
-        
-        if not hasattr(self, 'start_time'):
-            # First point, initialize start time
-            self.start_time = current_time
-            self.time_data = [0]
-            
-            # Initialize all data arrays with the first point
-            for key in self.pressure_data:
-                self.pressure_data[key] = [telemetry["pressure"][key]]
-                
-            # Initialize engine data arrays
-            self.engine_data["pressure"] = [telemetry["pressure"]["pt_f2_4_engine"]]
-            for sensor in ["lc_1", "lc_2"]:
-                self.engine_data["load"][sensor] = [telemetry["load_cells"][sensor]]
-            self.engine_data["temp"] = [telemetry["temperature"]["tc_1"]]
-            
-            # Initialize tank data arrays
-            if hasattr(self, 'tank_data'):
-                ox_pressure = (telemetry["pressure"]["pt_o1_3"] + telemetry["pressure"]["pt_o2_2"]) / 2
-                ox_load = (telemetry["load_cells"]["lc_3"] + telemetry["load_cells"]["lc_4"]) / 2
-                fuel_pressure = (telemetry["pressure"]["pt_f2_4"] + telemetry["pressure"]["pt_f1_5"]) / 2
-                press_pressure = telemetry["pressure"]["pt_p1_6"]
-                
-                self.tank_data["ox_pressure"] = [ox_pressure]
-                self.tank_data["ox_load"] = [ox_load]
-                self.tank_data["fuel_pressure"] = [fuel_pressure]
-                self.tank_data["press_pressure"] = [press_pressure]
-        else:
-            # Add new data point
-            elapsed_seconds = current_time - self.start_time
-            self.time_data.append(elapsed_seconds)
-            
-            # Add new data to all arrays
-            for key in self.pressure_data:
-                self.pressure_data[key].append(telemetry["pressure"][key])
-                
-            self.engine_data["pressure"].append(telemetry["pressure"]["pt_f2_4_engine"])
-            for sensor in ["lc_1", "lc_2"]:
-                self.engine_data["load"][sensor].append(telemetry["load_cells"][sensor])
-            self.engine_data["temp"].append(telemetry["temperature"]["tc_1"])
-            
-            # Add new data to tank data arrays
-            if hasattr(self, 'tank_data'):
-                ox_pressure = (telemetry["pressure"]["pt_o1_3"] + telemetry["pressure"]["pt_o2_2"]) / 2
-                ox_load = (telemetry["load_cells"]["lc_3"] + telemetry["load_cells"]["lc_4"]) / 2
-                fuel_pressure = (telemetry["pressure"]["pt_f2_4"] + telemetry["pressure"]["pt_f1_5"]) / 2
-                press_pressure = telemetry["pressure"]["pt_p1_6"]
-                
-                self.tank_data["ox_pressure"].append(ox_pressure)
-                self.tank_data["ox_load"].append(ox_load)
-                self.tank_data["fuel_pressure"].append(fuel_pressure)
-                self.tank_data["press_pressure"].append(press_pressure)
-        
-        # Trim all arrays to MAX_POINTS
-        if len(self.time_data) > MAX_POINTS:
-            self.time_data = self.time_data[-MAX_POINTS:]
-            
-            for key in self.pressure_data:
-                self.pressure_data[key] = self.pressure_data[key][-MAX_POINTS:]
-                
-            self.engine_data["pressure"] = self.engine_data["pressure"][-MAX_POINTS:]
-            for sensor in ["lc_1", "lc_2"]:
-                self.engine_data["load"][sensor] = self.engine_data["load"][sensor][-MAX_POINTS:]
-            self.engine_data["temp"] = self.engine_data["temp"][-MAX_POINTS:]
-            
-            # Trim tank data arrays
-            if hasattr(self, 'tank_data'):
-                self.tank_data["ox_pressure"] = self.tank_data["ox_pressure"][-MAX_POINTS:]
-                self.tank_data["ox_load"] = self.tank_data["ox_load"][-MAX_POINTS:]
-                self.tank_data["fuel_pressure"] = self.tank_data["fuel_pressure"][-MAX_POINTS:]
-                self.tank_data["press_pressure"] = self.tank_data["press_pressure"][-MAX_POINTS:]
-        
-        # Update overview pressure plots
-        for key, curve in self.pressure_curves.items():
-            curve.setData(self.time_data, self.pressure_data[key])
-        
-        # Update engine plots
-        try:
-            self.engine_pressure_curve.setData(self.time_data, self.engine_data["pressure"])
-            
-            for sensor in ["lc_1", "lc_2"]:
-                self.engine_load_curves[sensor].setData(self.time_data, self.engine_data["load"][sensor])
-            
-            self.engine_temp_curve.setData(self.time_data, self.engine_data["temp"])
-        except Exception as e:
-            print(f"Engine plot error: {e}")
-        
-        # Update tank systems tab data and plots
-        if hasattr(self, 'tank_data'):
-            # Update numerical displays
-            ox_pressure = (telemetry["pressure"]["pt_o1_3"] + telemetry["pressure"]["pt_o2_2"]) / 2
-            self.ox_pressure_value.setText(f"{ox_pressure:.1f}")
-            
-            ox_load = (telemetry["load_cells"]["lc_3"] + telemetry["load_cells"]["lc_4"]) / 2
-            self.ox_load_value.setText(f"{ox_load:.1f}")
-            
-            fuel_pressure = (telemetry["pressure"]["pt_f2_4"] + telemetry["pressure"]["pt_f1_5"]) / 2
-            self.fuel_pressure_value.setText(f"{fuel_pressure:.1f}")
-            
-            press_pressure = telemetry["pressure"]["pt_p1_6"]
-            self.press_pressure_value.setText(f"{press_pressure:.1f}")
-            
-            # Update plots
-            try:
-                # Make sure we're using the same time array for all plots
-                self.ox_pressure_curve.setData(self.time_data, self.tank_data["ox_pressure"])
-                self.ox_load_curve.setData(self.time_data, self.tank_data["ox_load"])
-                self.fuel_pressure_curve.setData(self.time_data, self.tank_data["fuel_pressure"])
-                self.press_pressure_curve.setData(self.time_data, self.tank_data["press_pressure"])
-            except Exception as e:
-                print(f"Tank plot error: {e}")
-            
-            # Set x-axis range for all tank plots
-            if len(self.time_data) > 1:
-                current_end = self.time_data[-1]
-                x_min = current_end - 30
-                x_max = current_end
-                self.ox_pressure_plot.setXRange(x_min, x_max)
-                self.ox_load_plot.setXRange(x_min, x_max)
-                self.fuel_pressure_plot.setXRange(x_min, x_max)
-                self.press_pressure_plot.setXRange(x_min, x_max)
-        
-        # Update X-axis range for all other plots
-        if len(self.time_data) > 1:
-            current_end = self.time_data[-1]
-            x_min = current_end - 30
-            x_max = current_end
-            
-            self.pressure_plot.setXRange(x_min, x_max)
-            self.engine_pressure_plot.setXRange(x_min, x_max)
-            self.engine_load_plot.setXRange(x_min, x_max)
-            self.engine_temp_plot.setXRange(x_min, x_max)
-        
-        # Update sensor readings display
-        if hasattr(self, 'pressure_labels'):
-            engine_pressure = telemetry["pressure"]["pt_f2_4_engine"]
-            self.pressure_labels["pt_f2_4_engine"].setText(f"{engine_pressure:.1f}")
-            self.avg_pressure_label.setText(f"{engine_pressure:.1f}")
-            
-            load_values = []
-            for sensor in ["lc_1", "lc_2"]:
-                value = telemetry["load_cells"][sensor]
-                self.load_labels[sensor].setText(f"{value:.1f}")
-                load_values.append(value)
-                
-            avg_load = sum(load_values) / len(load_values) if load_values else 0
-            self.avg_load_label.setText(f"{avg_load:.1f}")
-            
-            engine_temp = telemetry["temperature"]["tc_1"]
-            self.temp_labels["tc_1"].setText(f"{engine_temp:.1f}")
-            self.avg_temp_label.setText(f"{engine_temp:.1f}")
-        
-        # Update status indicators and other UI elements
-        if telemetry["system_status"]["armed"]:
-            self.armed_status.setText("ARMED")
-            self.armed_status.setStyleSheet("background-color: red; padding: 5px; border-radius: 5px;")
-            self.arm_button.setChecked(True)
-            self.start_button.setEnabled(True)
-        else:
-            self.armed_status.setText("SAFE")
-            self.armed_status.setStyleSheet("background-color: green; padding: 5px; border-radius: 5px;")
-            self.arm_button.setChecked(False)
-            self.start_button.setEnabled(False)
-        
-        # Update valve state indicators
-        self.rvv_o_button.setChecked(telemetry["solenoid_states"]["rvv_o"])
-        self.mpv_p_button.setChecked(telemetry["solenoid_states"]["mpv_p"])
-        self.rvv_f_button.setChecked(telemetry["solenoid_states"]["rvv_f"])
-        
-        # Update servo position indicators
-        self.dot_ox_value.setValue(telemetry["servo_positions"]["dot_oxidizer"])
-        self.mpf_f_value.setValue(telemetry["servo_positions"]["mpf_f"])
-        self.ox_engine_value.setValue(telemetry["servo_positions"]["oxidizer_engine"])
-        
-        # Update system status text
-        ox_pressure = telemetry["pressure"]["pt_o1_3"]
-        if ox_pressure < 100:
-            self.status_indicators["oxidizer"].setText("LOW PRESSURE")
-            self.status_indicators["oxidizer"].setStyleSheet("color: red;")
-        elif ox_pressure > 700:
-            self.status_indicators["oxidizer"].setText("HIGH PRESSURE")
-            self.status_indicators["oxidizer"].setStyleSheet("color: red;")
-        else:
-            self.status_indicators["oxidizer"].setText("NOMINAL")
-            self.status_indicators["oxidizer"].setStyleSheet("color: green;")
-    
-    def update_connection_status(self):
-        connected = self.data_store.check_connection()
-        if connected:
-            self.connection_status.setText("CONNECTED")
-            self.connection_status.setStyleSheet("background-color: green; padding: 5px; border-radius: 5px;")
-        else:
-            self.connection_status.setText("NOT CONNECTED")
-            self.connection_status.setStyleSheet("background-color: red; padding: 5px; border-radius: 5px;")
-    
-    def toggle_recording(self, checked):
-        """Handle recording button toggle"""
-        if checked:
-            success = self.data_store.start_recording()
-            if success:
-                self.record_button.setText("Stop Recording")
-                print("Recording started")
-            else:
-                # If it fails, revert the button state
-                self.record_button.setChecked(False)
-                print("Failed to start recording")
-        else:
-            success = self.data_store.stop_recording()
-            if success:
-                self.record_button.setText("Start Recording")
-                print("Recording stopped")
-            else:
-                # If it fails, revert the button state
-                self.record_button.setChecked(True)
-                print("Failed to stop recording")
-    
-    def emergency_stop(self):
-        # Implement emergency stop procedure
-        # This should close all valves and safe the system
-        print("EMERGENCY STOP ACTIVATED")
-        # Close all valves
-        self.command_sender.send_command(0x01, 0x01, 0)  # Close RVV-O
-        self.command_sender.send_command(0x01, 0x02, 0)  # Close MPV-P
-        self.command_sender.send_command(0x01, 0x03, 0)  # Close RVV-F
-        # Set servos to safe position
-        self.command_sender.send_command(0x02, 0x04, 0)  # Close DOT-Oxidizer Servo
-        self.command_sender.send_command(0x02, 0x05, 0)  # Close MPF-F Servo
-        self.command_sender.send_command(0x02, 0x06, 0)  # Close Oxidizer-Engine Servo
-        # Disarm system
-        self.command_sender.send_command(0x04, 0xFF, 0)  # Disarm system
-    
-    def toggle_solenoid(self, device_id, bit_mask, state):
-        # Send command to toggle solenoid valve in a separate thread
-        command_value = 1 if state else 0
-        
-        # Update button text immediately - don't wait for response
-        button = self.sender()
-        if button:
-            button.setText("OPEN" if state else "CLOSED")
-            button.setStyleSheet("background-color: green;" if state else "")
-        
-        # Send command in background thread to prevent UI freezing
-        threading.Thread(
-            target=lambda: self.command_sender.send_command(0x01, device_id, command_value),
-            daemon=True
-        ).start()
-    
-    def update_servo_value(self, device_id, value):
-        # Send command to update servo position
-        # Don't send on every value change - only when user releases slider
-        sender = self.sender()
-        if isinstance(sender, QSlider) and sender.isSliderDown():
-            return
-        
-        response = self.command_sender.send_command(0x02, device_id, value)
-        print(f"Servo {device_id} command sent: {value}, Response: {response}")
-    
-    def toggle_arm(self, armed):
-        # Send arm/disarm command
-        command_value = 1 if armed else 0
-        response = self.command_sender.send_command(0x04, 0xFF, command_value)
-        
-        if armed:
-            self.arm_button.setText("DISARM SYSTEM")
-            self.start_button.setEnabled(True)
-        else:
-            self.arm_button.setText("ARM SYSTEM")
-            self.start_button.setEnabled(False)
-        
-        print(f"Arm command sent: {command_value}, Response: {response}")
-    
-    def start_sequence(self):
-        # Send start sequence command
-        response = self.command_sender.send_command(0x05, 0xFF, 1)
-        print(f"Start sequence command sent, Response: {response}")
-    
-    def abort_sequence(self):
-        # Send abort sequence command
-        response = self.command_sender.send_command(0x06, 0xFF, 1)
-        print(f"Abort sequence command sent, Response: {response}")
\ No newline at end of file
+# ui/main_window.py
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                            QLabel, QPushButton, QTabWidget, QGridLayout,
+                            QGroupBox, QProgressBar, QSlider, QSpinBox, QComboBox, QCheckBox)
+from PyQt5.QtCore import Qt, QTimer, QRectF
+from PyQt5.QtGui import QFont, QColor, QPalette
+
+import pyqtgraph as pg
+import numpy as np
+import time
+import threading
+
+from data.telemetry_schema import TELEMETRY_SCHEMA
+from data.spectral import SPECTRAL_CHANNELS, SPECTRAL_OUTPUTS
+from data.filters import FilterBank
+from data.performance import BURN_PHASES
+from ui.frame_scheduler import FrameScheduler
+from network.command_tracker import CommandTracker, describe_result
+
+# Seconds shown by the live plots, and the most points each series keeps
+PLOT_WINDOW = 30.0
+PLOT_POINTS = 500
+
+# Channels drawn by each tab's plots; only the visible tab's are subscribed live
+TAB_CHANNELS = {
+    "Overview": TELEMETRY_SCHEMA.channels("pressure"),
+    "Tank Systems": ["pt_o1_3", "pt_o2_2", "lc_3", "lc_4", "pt_f2_4", "pt_f1_5", "pt_p1_6"],
+    "Engine": ["pt_f2_4_engine", "lc_1", "lc_2", "tc_1"] + SPECTRAL_OUTPUTS
+}
+
+class MainWindow(QMainWindow):
+    def __init__(self, command_sender, data_store, data_stores=None, telemetry_receiver=None):
+        super().__init__()
+        self.command_sender = command_sender
+        self.data_store = data_store
+        self.data_stores = data_stores or {"default": data_store}
+        # Commands go through the tracker for ack checks, retries and latency stats
+        self.command_tracker = CommandTracker(command_sender, event_sink=self.record_event)
+        self.telemetry_receiver = telemetry_receiver
+        # Which sample time the plots use: 0 = ground receive time, 2 = device sample time
+        self.time_axis = 0
+        # Display filters run on each batch of new samples; both the raw and
+        # filtered series are kept so the toggle just picks one
+        self.filters = FilterBank()
+        self.filtered_data = {}
+        self.show_filtered = False
+        # Tab whose series are kept and drawn
+        self.live_tab = None
+        
+        # Window properties
+        self.setWindowTitle("Rocket Monitoring System")
+        self.setMinimumSize(1200, 800)
+        
+        # Create main widget and layout
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        
+        self.main_layout = QVBoxLayout(self.central_widget)
+        
+        # Create status bar at top
+        self.setup_status_bar()
+        
+        # Create tab widget for different views
+        self.tabs = QTabWidget()
+        self.main_layout.addWidget(self.tabs)
+        
+        # Initialize data structures for plots
+        self.time_data = []
+        # Channel lists come from the telemetry schema
+        self.pressure_data = {name: [] for name in TELEMETRY_SCHEMA.channels("pressure")}
+        
+        # Add tabs
+        self.setup_overview_tab()
+        self.setup_oxidizer_tab()
+        self.setup_fuel_tab()
+        self.setup_engine_tab()
+        self.setup_control_tab()
+        
+        # Setup plots
+        
+        # Start a timer to regularly update connection status
+        self.connection_timer = QTimer()
+        self.connection_timer.timeout.connect(self.update_connection_status)
+        self.connection_timer.start(500)  # Check every 500ms
+        
+        # Redraw when data arrives, at a rate the render cost allows
+        self.frame_scheduler = FrameScheduler(self.update_ui, self.pending_samples, len(self.plot_panels()))
+        
+        # Every source keeps the plotted channels in its history, for the long
+        # overview windows and to refill the plots on a tab or source switch
+        history_channels = set(self.filters.channels)
+        for channels in TAB_CHANNELS.values():
+            history_channels.update(channels)
+        history_channels -= set(SPECTRAL_OUTPUTS)
+        for store in self.data_stores.values():
+            store.subscribe("history", history_channels, history=True, rate=0)
+        self.subscribe_display()
+        self.tabs.currentChanged.connect(self.select_tab)
+        self.overview_window_select.currentTextChanged.connect(lambda text: self.frame_scheduler.request_frame())
+        self.frame_scheduler.start()
+    
+    def setup_status_bar(self):
+        status_layout = QHBoxLayout()
+        self.main_layout.addLayout(status_layout)
+        
+        # System status indicators
+        self.connection_status = QLabel("NOT CONNECTED")
+        self.connection_status.setStyleSheet("background-color: red; padding: 5px; border-radius: 5px;")
+        status_layout.addWidget(self.connection_status)
+        
+        self.armed_status = QLabel("SAFE")
+        self.armed_status.setStyleSheet("background-color: green; padding: 5px; border-radius: 5px;")
+        status_layout.addWidget(self.armed_status)
+        
+        # Telemetry source selector (only useful with more than one source)
+        self.source_select = QComboBox()
+        self.source_select.addItems(list(self.data_stores.keys()))
+        self.source_select.currentTextChanged.connect(self.select_source)
+        self.source_select.setVisible(len(self.data_stores) > 1)
+        status_layout.addWidget(self.source_select)
+        
+        # Per-source link quality
+        self.link_status = QLabel("")
+        status_layout.addWidget(self.link_status)
+        
+        # Device clock alignment of the selected source
+        self.clock_status = QLabel("")
+        status_layout.addWidget(self.clock_status)
+        
+        # Plot against ground receive time or the device's own sample time
+        self.time_axis_select = QComboBox()
+        self.time_axis_select.addItems(["Receive time", "Device time"])
+        self.time_axis_select.currentTextChanged.connect(self.select_time_axis)
+        status_layout.addWidget(self.time_axis_select)
+        
+        # Plot the filtered traces instead of the raw ones
+        self.filtered_check = QCheckBox("Filtered")
+        self.filtered_check.toggled.connect(self.select_filtered)
+        status_layout.addWidget(self.filtered_check)
+        
+        # Spacer
+        status_layout.addStretch()
+        
+        # Recording button
+        self.record_button = QPushButton("Start Recording")
+        self.record_button.setCheckable(True)
+        self.record_button.toggled.connect(self.toggle_recording)
+        status_layout.addWidget(self.record_button)
+        
+        # Emergency stop button
+        self.estop_button = QPushButton("EMERGENCY STOP")
+        self.estop_button.setStyleSheet("background-color: red; color: white; font-weight: bold; min-height: 40px;")
+        self.estop_button.clicked.connect(self.emergency_stop)
+        status_layout.addWidget(self.estop_button)
+    
+    def setup_overview_tab(self):
+        overview_widget = QWidget()
+        overview_layout = QVBoxLayout(overview_widget)
+        
+        # Time window selector - longer windows are served from the tiered history
+        window_layout = QHBoxLayout()
+        window_layout.addWidget(QLabel("Time Window:"))
+        self.overview_window_select = QComboBox()
+        self.overview_windows = {"30 s": 30, "5 min": 300, "1 h": 3600, "Whole Test": None}
+        self.overview_window_select.addItems(list(self.overview_windows.keys()))
+        window_layout.addWidget(self.overview_window_select)
+        window_layout.addStretch()
+        overview_layout.addLayout(window_layout)
+        
+        # Pressure graphs
+        pressure_plot = pg.PlotWidget(title="Pressure Readings")
+        pressure_plot.setBackground('w')  # Set white background
+        pressure_plot.addLegend()
+        pressure_plot.setLabel('left', "Pressure", units='PSI')
+        pressure_plot.setLabel('bottom', "Time", units='s')
+        pressure_plot.getAxis('left').setPen('k')  # Black axis lines
+        pressure_plot.getAxis('bottom').setPen('k')
+        pressure_plot.getAxis('left').setTextPen('k')  # Black text
+        pressure_plot.getAxis('bottom').setTextPen('k')
+        self.pressure_plot = pressure_plot
+        
+        # Create plot lines with different colors
+        self.pressure_curves = {}
+        colors = ['r', 'g', 'b', 'c', 'm', 'k']
+        for i, name in enumerate(self.pressure_data.keys()):
+            pen = pg.mkPen(color=colors[i % len(colors)], width=2)
+            self.pressure_curves[name] = pressure_plot.plot(
+                [], [], name=name, pen=pen
+            )
+        
+        overview_layout.addWidget(pressure_plot)
+        
+        # System status grid
+        status_group = QGroupBox("System Status")
+        status_layout = QGridLayout(status_group)
+        
+        # Add status indicators for each component
+        self.status_indicators = {}
+        
+        # Oxidizer system indicators
+        status_layout.addWidget(QLabel("Oxidizer System:"), 0, 0)
+        self.status_indicators["oxidizer"] = QLabel("Unknown")
+        status_layout.addWidget(self.status_indicators["oxidizer"], 0, 1)
+        
+        # Fuel system indicators
+        status_layout.addWidget(QLabel("Fuel System:"), 1, 0)
+        self.status_indicators["fuel"] = QLabel("Unknown")
+        status_layout.addWidget(self.status_indicators["fuel"], 1, 1)
+        
+        # Engine indicators
+        status_layout.addWidget(QLabel("Engine:"), 2, 0)
+        self.status_indicators["engine"] = QLabel("Unknown")
+        status_layout.addWidget(self.status_indicators["engine"], 2, 1)
+        
+        overview_layout.addWidget(status_group)
+        
+        self.tabs.addTab(overview_widget, "Overview")
+    
+    def setup_oxidizer_tab(self):
+        """Set up the tank systems tab with monitoring for all tanks"""
+        # Rename to reflect broader focus
+        tank_widget = QWidget()
+        layout = QGridLayout(tank_widget)
+        
+        # Create data display panel at the top
+        data_group = QGroupBox("Tank Readings")
+        data_layout = QGridLayout(data_group)
+        
+        # --- Oxidizer Tank Section ---
+        data_layout.addWidget(QLabel("Oxidizer Tank:", styleSheet="font-weight: bold;"), 0, 0)
+        
+        # Pressure readings
+        data_layout.addWidget(QLabel("Pressure (PSI):"), 1, 0)
+        self.ox_pressure_value = QLabel("0.0")
+        self.ox_pressure_value.setStyleSheet("font-size: 18px; font-weight: bold;")
+        data_layout.addWidget(self.ox_pressure_value, 1, 1)
+        
+        # Load cell readings
+        data_layout.addWidget(QLabel("Load (N):"), 2, 0)
+        self.ox_load_value = QLabel("0.0")
+        self.ox_load_value.setStyleSheet("font-size: 18px; font-weight: bold;")
+        data_layout.addWidget(self.ox_load_value, 2, 1)
+        
+        # --- Fuel Tank Section ---
+        data_layout.addWidget(QLabel("Fuel Tank:", styleSheet="font-weight: bold;"), 0, 2)
+        
+        # Pressure readings
+        data_layout.addWidget(QLabel("Pressure (PSI):"), 1, 2)
+        self.fuel_pressure_value = QLabel("0.0")
+        self.fuel_pressure_value.setStyleSheet("font-size: 18px; font-weight: bold;")
+        data_layout.addWidget(self.fuel_pressure_value, 1, 3)
+        
+        # --- Pressurant Tank Section ---
+        data_layout.addWidget(QLabel("Pressurant Tank:", styleSheet="font-weight: bold;"), 0, 4)
+        
+        # Pressure readings
+        data_layout.addWidget(QLabel("Pressure (PSI):"), 1, 4)
+        self.press_pressure_value = QLabel("0.0")
+        self.press_pressure_value.setStyleSheet("font-size: 18px; font-weight: bold;")
+        data_layout.addWidget(self.press_pressure_value, 1, 5)
+        
+        # Add data group to main layout
+        layout.addWidget(data_group, 0, 0, 1, 2)
+        
+        # Create plots
+        # 1. Oxidizer Tank Pressure
+        ox_pressure_plot = pg.PlotWidget(title="Oxidizer Tank Pressure")
+        ox_pressure_plot.setBackground('w')  # Set white background
+        ox_pressure_plot.setLabel('left', "Pressure", units='PSI')
+        ox_pressure_plot.setLabel('bottom', "Time", units='s')
+        ox_pressure_plot.getAxis('left').setPen('k')  # Black axis lines
+        ox_pressure_plot.getAxis('bottom').setPen('k')
+        ox_pressure_plot.getAxis('left').setTextPen('k')  # Black text
+        ox_pressure_plot.getAxis('bottom').setTextPen('k')
+        ox_pressure_plot.setMinimumHeight(200)
+        self.ox_pressure_plot = ox_pressure_plot
+        self.ox_pressure_curve = ox_pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
+        
+        # 2. Oxidizer Tank Load
+        ox_load_plot = pg.PlotWidget(title="Oxidizer Tank Weight")
+        ox_load_plot.setBackground('w')  # Set white background
+        ox_load_plot.setLabel('left', "Mass", units='kg')
+        ox_load_plot.setLabel('bottom', "Time", units='s')
+        ox_load_plot.getAxis('left').setPen('k')  # Black axis lines
+        ox_load_plot.getAxis('bottom').setPen('k')
+        ox_load_plot.getAxis('left').setTextPen('k')  # Black text
+        ox_load_plot.getAxis('bottom').setTextPen('k')
+        ox_load_plot.setMinimumHeight(200)
+        self.ox_load_plot = ox_load_plot
+        self.ox_load_curve = ox_load_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
+        
+        # 3. Fuel Tank Pressure
+        fuel_pressure_plot = pg.PlotWidget(title="Fuel Tank Pressure")
+        fuel_pressure_plot.setBackground('w')  # Set white background
+        fuel_pressure_plot.setLabel('left', "Pressure", units='PSI')
+        fuel_pressure_plot.setLabel('bottom', "Time", units='s')
+        fuel_pressure_plot.getAxis('left').setPen('k')  # Black axis lines
+        fuel_pressure_plot.getAxis('bottom').setPen('k')
+        fuel_pressure_plot.getAxis('left').setTextPen('k')  # Black text
+        fuel_pressure_plot.getAxis('bottom').setTextPen('k')
+        fuel_pressure_plot.setMinimumHeight(200)
+        self.fuel_pressure_plot = fuel_pressure_plot
+        self.fuel_pressure_curve = fuel_pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
+        
+        # 4. Pressurant Tank Pressure
+        press_pressure_plot = pg.PlotWidget(title="Pressurant Tank Pressure")
+        press_pressure_plot.setBackground('w')  # Set white background
+        press_pressure_plot.setLabel('left', "Pressure", units='PSI')
+        press_pressure_plot.setLabel('bottom', "Time", units='s')
+        press_pressure_plot.getAxis('left').setPen('k')  # Black axis lines
+        press_pressure_plot.getAxis('bottom').setPen('k')
+        press_pressure_plot.getAxis('left').setTextPen('k')  # Black text
+        press_pressure_plot.getAxis('bottom').setTextPen('k')
+        press_pressure_plot.setMinimumHeight(200)
+        self.press_pressure_plot = press_pressure_plot
+        self.press_pressure_curve = press_pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
+        
+        # Add plots to layout
+        layout.addWidget(ox_pressure_plot, 1, 0)
+        layout.addWidget(ox_load_plot, 1, 1)
+        layout.addWidget(fuel_pressure_plot, 2, 0)
+        layout.addWidget(press_pressure_plot, 2, 1)
+        
+        # Initialize data arrays for tank tab plots
+        self.tank_data = {
+            "ox_pressure": [],
+            "ox_load": [],
+            "fuel_pressure": [],
+            "press_pressure": []
+        }
+        
+        # Rename the tab
+        self.tabs.addTab(tank_widget, "Tank Systems")
+    
+    def setup_fuel_tab(self):
+        # Placeholder - you would expand this with specific fuel system widgets
+        fuel_widget = QWidget()
+        layout = QVBoxLayout(fuel_widget)
+        layout.addWidget(QLabel("Fuel System Details"))
+        
+        self.tabs.addTab(fuel_widget, "Fuel System")
+    
+    def setup_engine_tab(self):
+        engine_widget = QWidget()
+        layout = QVBoxLayout(engine_widget)
+        
+        # Create top section with live numerical data
+        data_group = QGroupBox("Engine Sensor Readings")
+        data_layout = QGridLayout(data_group)
+        
+        # Pressure sensors section
+        data_layout.addWidget(QLabel("Pressure Sensors (PSI):", styleSheet="font-weight: bold;"), 0, 0)
+        self.pressure_labels = {}
+        
+        # Create labels for each pressure sensor
+        pressure_sensors = ["pt_f2_4_engine"]
+        for i, sensor in enumerate(pressure_sensors):
+            data_layout.addWidget(QLabel(f"{sensor.upper()}:"), 1, i)
+            self.pressure_labels[sensor] = QLabel("0.0")
+            self.pressure_labels[sensor].setStyleSheet("font-size: 18px; font-weight: bold;")
+            data_layout.addWidget(self.pressure_labels[sensor], 2, i)
+        
+        # Add average pressure label
+        data_layout.addWidget(QLabel("Average:"), 1, len(pressure_sensors))
+        self.avg_pressure_label = QLabel("0.0")
+        self.avg_pressure_label.setStyleSheet("font-size: 18px; font-weight: bold; color: blue;")
+        data_layout.addWidget(self.avg_pressure_label, 2, len(pressure_sensors))
+        
+        # Load cell sensors section
+        data_layout.addWidget(QLabel("Load Cells (N):", styleSheet="font-weight: bold;"), 3, 0)
+        self.load_labels = {}
+        
+        # Create labels for each load cell
+        load_sensors = ["lc_1", "lc_2"]
+        for i, sensor in enumerate(load_sensors):
+            data_layout.addWidget(QLabel(f"{sensor.upper()}:"), 4, i)
+            self.load_labels[sensor] = QLabel("0.0")
+            self.load_labels[sensor].setStyleSheet("font-size: 18px; font-weight: bold;")
+            data_layout.addWidget(self.load_labels[sensor], 5, i)
+        
+        # Add average load label
+        data_layout.addWidget(QLabel("Average:"), 4, len(load_sensors))
+        self.avg_load_label = QLabel("0.0")
+        self.avg_load_label.setStyleSheet("font-size: 18px; font-weight: bold; color: blue;")
+        data_layout.addWidget(self.avg_load_label, 5, len(load_sensors))
+        
+        # Temperature sensors section
+        data_layout.addWidget(QLabel("Temperature Sensors (°C):", styleSheet="font-weight: bold;"), 6, 0)
+        self.temp_labels = {}
+        
+        # Create labels for each temperature sensor
+        temp_sensors = ["tc_1"]
+        for i, sensor in enumerate(temp_sensors):
+            data_layout.addWidget(QLabel(f"{sensor.upper()}:"), 7, i)
+            self.temp_labels[sensor] = QLabel("0.0")
+            self.temp_labels[sensor].setStyleSheet("font-size: 18px; font-weight: bold;")
+            data_layout.addWidget(self.temp_labels[sensor], 8, i)
+        
+        # Add average temperature label (just for consistency in this case)
+        data_layout.addWidget(QLabel("Average:"), 7, len(temp_sensors))
+        self.avg_temp_label = QLabel("0.0")
+        self.avg_temp_label.setStyleSheet("font-size: 18px; font-weight: bold; color: blue;")
+        data_layout.addWidget(self.avg_temp_label, 8, len(temp_sensors))
+        
+        # Running performance from the data store's calculator
+        data_layout.addWidget(QLabel("Performance:", styleSheet="font-weight: bold;"), 9, 0)
+        self.performance_labels = {}
+        performance_fields = [("burn_phase", "Phase"), ("thrust_n", "Thrust (N)"),
+                              ("total_impulse_ns", "Impulse (N*s)"), ("burn_time_s", "Burn Time (s)"),
+                              ("mass_flow_kg_s", "Mass Flow (kg/s)"), ("propellant_used_kg", "Propellant (kg)"),
+                              ("isp_s", "Isp (s)")]
+        for i, (key, title) in enumerate(performance_fields):
+            data_layout.addWidget(QLabel(f"{title}:"), 10, i)
+            self.performance_labels[key] = QLabel("--")
+            self.performance_labels[key].setStyleSheet("font-size: 18px; font-weight: bold;")
+            data_layout.addWidget(self.performance_labels[key], 11, i)
+        
+        # Add the data group to the main layout
+        layout.addWidget(data_group)
+        
+        # Create the three graph sections
+        # 1. Pressure Graph
+        pressure_plot = pg.PlotWidget(title="Engine Pressure")
+        pressure_plot.setBackground('w')  # Set white background
+        pressure_plot.setLabel('left', "Pressure", units='PSI')
+        pressure_plot.setLabel('bottom', "Time", units='s')
+        pressure_plot.getAxis('left').setPen('k')  # Black axis lines
+        pressure_plot.getAxis('bottom').setPen('k')
+        pressure_plot.getAxis('left').setTextPen('k')  # Black text
+        pressure_plot.getAxis('bottom').setTextPen('k')
+        self.engine_pressure_plot = pressure_plot
+        self.engine_pressure_curve = pressure_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
+        
+        # 2. Load Cell Graph
+        load_plot = pg.PlotWidget(title="Engine Thrust")
+        load_plot.setBackground('w')  # Set white background
+        load_plot.setLabel('left', "Force", units='N')
+        load_plot.setLabel('bottom', "Time", units='s')
+        load_plot.getAxis('left').setPen('k')  # Black axis lines
+        load_plot.getAxis('bottom').setPen('k')
+        load_plot.getAxis('left').setTextPen('k')  # Black text
+        load_plot.getAxis('bottom').setTextPen('k')
+        self.engine_load_plot = load_plot
+        self.engine_load_curves = {}
+        for i, sensor in enumerate(load_sensors):
+            pen = pg.mkPen(color=['b', 'g'][i % 2], width=2)
+            self.engine_load_curves[sensor] = load_plot.plot([], [], name=sensor, pen=pen)
+        
+        # 3. Temperature Graph
+        temp_plot = pg.PlotWidget(title="Engine Temperature")
+        temp_plot.setBackground('w')  # Set white background
+        temp_plot.setLabel('left', "Temperature", units='°C')
+        temp_plot.setLabel('bottom', "Time", units='s')
+        temp_plot.getAxis('left').setPen('k')  # Black axis lines
+        temp_plot.getAxis('bottom').setPen('k')
+        temp_plot.getAxis('left').setTextPen('k')  # Black text
+        temp_plot.getAxis('bottom').setTextPen('k')
+        self.engine_temp_plot = temp_plot
+        self.engine_temp_curve = temp_plot.plot([], [], pen=pg.mkPen(color='k', width=2))
+        
+        # 4. Spectrum waterfall, drawn from the frames the data store computes
+        spectrum_group = QGroupBox("Pressure Spectrum")
+        spectrum_layout = QVBoxLayout(spectrum_group)
+        spectrum_controls = QHBoxLayout()
+        self.spectrum_channel_select = QComboBox()
+        self.spectrum_channel_select.addItems(SPECTRAL_CHANNELS)
+        self.spectrum_channel_select.currentTextChanged.connect(lambda text: self.frame_scheduler.request_frame())
+        spectrum_controls.addWidget(self.spectrum_channel_select)
+        self.spectrum_peak_label = QLabel("Peak: --")
+        self.spectrum_peak_label.setStyleSheet("font-weight: bold;")
+        spectrum_controls.addWidget(self.spectrum_peak_label)
+        spectrum_controls.addStretch()
+        spectrum_layout.addLayout(spectrum_controls)
+        
+        spectrum_plot = pg.PlotWidget()
+        spectrum_plot.setBackground('w')
+        spectrum_plot.setLabel('left', "Frequency", units='Hz')
+        spectrum_plot.setLabel('bottom', "Time", units='s')
+        spectrum_plot.getAxis('left').setPen('k')
+        spectrum_plot.getAxis('bottom').setPen('k')
+        spectrum_plot.getAxis('left').setTextPen('k')
+        spectrum_plot.getAxis('bottom').setTextPen('k')
+        self.spectrum_image = pg.ImageItem()
+        self.spectrum_image.setLookupTable(pg.colormap.get('viridis').getLookupTable())
+        spectrum_plot.addItem(self.spectrum_image)
+        spectrum_layout.addWidget(spectrum_plot)
+        self.reset_waterfall()
+        
+        # Add plots to main layout
+        layout.addWidget(pressure_plot)
+        layout.addWidget(load_plot)
+        layout.addWidget(temp_plot)
+        layout.addWidget(spectrum_group)
+        
+        # Initialize data structures for engine tab plots
+        self.engine_data = {
+            "pressure": [],
+            "load": {sensor: [] for sensor in load_sensors},
+            "temp": []
+        }
+        
+        self.tabs.addTab(engine_widget, "Engine")
+    
+    def setup_control_tab(self):
+        control_widget = QWidget()
+        layout = QGridLayout(control_widget)
+        
+        # Solenoid valve controls
+        solenoid_group = QGroupBox("Solenoid Valves")
+        solenoid_layout = QGridLayout(solenoid_group)
+        
+        # RVV-O valve
+        solenoid_layout.addWidget(QLabel("RVV-O:"), 0, 0)
+        self.rvv_o_button = QPushButton("CLOSED")
+        self.rvv_o_button.setCheckable(True)
+        self.rvv_o_button.toggled.connect(lambda checked: self.toggle_solenoid(1, 0x01, checked))
+        solenoid_layout.addWidget(self.rvv_o_button, 0, 1)
+        
+        # MPV-P valve
+        solenoid_layout.addWidget(QLabel("MPV-P:"), 1, 0)
+        self.mpv_p_button = QPushButton("CLOSED")
+        self.mpv_p_button.setCheckable(True)
+        self.mpv_p_button.toggled.connect(lambda checked: self.toggle_solenoid(2, 0x02, checked))
+        solenoid_layout.addWidget(self.mpv_p_button, 1, 1)
+        
+        # RVV-F valve
+        solenoid_layout.addWidget(QLabel("RVV-F:"), 2, 0)
+        self.rvv_f_button = QPushButton("CLOSED")
+        self.rvv_f_button.setCheckable(True)
+        self.rvv_f_button.toggled.connect(lambda checked: self.toggle_solenoid(3, 0x03, checked))
+        solenoid_layout.addWidget(self.rvv_f_button, 2, 1)
+        
+        layout.addWidget(solenoid_group, 0, 0)
+        
+        # Servo valve controls
+        servo_group = QGroupBox("Servo Valves")
+        servo_layout = QGridLayout(servo_group)
+        
+        # DOT-to-Oxidizer Servo
+        servo_layout.addWidget(QLabel("DOT-to-Oxidizer:"), 0, 0)
+        self.dot_ox_slider = QSlider(Qt.Horizontal)
+        self.dot_ox_slider.setMinimum(0)
+        self.dot_ox_slider.setMaximum(255)
+        self.dot_ox_slider.valueChanged.connect(lambda val: self.update_servo_value(4, val))
+        servo_layout.addWidget(self.dot_ox_slider, 0, 1)
+        self.dot_ox_value = QSpinBox()
+        self.dot_ox_value.setMinimum(0)
+        self.dot_ox_value.setMaximum(255)
+        self.dot_ox_value.valueChanged.connect(self.dot_ox_slider.setValue)
+        servo_layout.addWidget(self.dot_ox_value, 0, 2)
+        
+        # MPF-F Servo
+        servo_layout.addWidget(QLabel("MPF-F:"), 1, 0)
+        self.mpf_f_slider = QSlider(Qt.Horizontal)
+        self.mpf_f_slider.setMinimum(0)
+        self.mpf_f_slider.setMaximum(255)
+        self.mpf_f_slider.valueChanged.connect(lambda val: self.update_servo_value(5, val))
+        servo_layout.addWidget(self.mpf_f_slider, 1, 1)
+        self.mpf_f_value = QSpinBox()
+        self.mpf_f_value.setMinimum(0)
+        self.mpf_f_value.setMaximum(255)
+        self.mpf_f_value.valueChanged.connect(self.mpf_f_slider.setValue)
+        servo_layout.addWidget(self.mpf_f_value, 1, 2)
+        
+        # Oxidizer-to-Engine Servo
+        servo_layout.addWidget(QLabel("Oxidizer-to-Engine:"), 2, 0)
+        self.ox_engine_slider = QSlider(Qt.Horizontal)
+        self.ox_engine_slider.setMinimum(0)
+        self.ox_engine_slider.setMaximum(255)
+        self.ox_engine_slider.valueChanged.connect(lambda val: self.update_servo_value(6, val))
+        servo_layout.addWidget(self.ox_engine_slider, 2, 1)
+        self.ox_engine_value = QSpinBox()
+        self.ox_engine_value.setMinimum(0)
+        self.ox_engine_value.setMaximum(255)
+        self.ox_engine_value.valueChanged.connect(self.ox_engine_slider.setValue)
+        servo_layout.addWidget(self.ox_engine_value, 2, 2)
+        
+        layout.addWidget(servo_group, 0, 1)
+        
+        # Actuator controls
+        actuator_group = QGroupBox("Actuators & Injectors")
+        actuator_layout = QGridLayout(actuator_group)
+        
+        # Setup similar sliders for actuators...
+        
+        layout.addWidget(actuator_group, 1, 0, 1, 2)
+        
+        # System control buttons
+        system_group = QGroupBox("System Control")
+        system_layout = QHBoxLayout(system_group)
+        
+        # Arm button
+        self.arm_button = QPushButton("ARM SYSTEM")
+        self.arm_button.setCheckable(True)
+        self.arm_button.toggled.connect(self.toggle_arm)
+        system_layout.addWidget(self.arm_button)
+        
+        # Start sequence button
+        self.start_button = QPushButton("START SEQUENCE")
+        self.start_button.clicked.connect(self.start_sequence)
+        self.start_button.setEnabled(False)  # Disabled until armed
+        system_layout.addWidget(self.start_button)
+        
+        # Abort button
+        self.abort_button = QPushButton("ABORT")
+        self.abort_button.clicked.connect(self.abort_sequence)
+        system_layout.addWidget(self.abort_button)
+        
+        layout.addWidget(system_group, 2, 0, 1, 2)
+        
+        # Command results and round-trip latency
+        command_group = QGroupBox("Command Status")
+        command_layout = QGridLayout(command_group)
+        
+        command_layout.addWidget(QLabel("Last command:"), 0, 0)
+        self.last_command_label = QLabel("None sent")
+        command_layout.addWidget(self.last_command_label, 0, 1, 1, 2)
+        
+        command_layout.addWidget(QLabel("Latency for:"), 1, 0)
+        self.command_type_select = QComboBox()
+        self.command_type_select.addItems(list(self.command_tracker.histograms.keys()))
+        self.command_type_select.currentTextChanged.connect(lambda text: self.update_command_status(force=True))
+        command_layout.addWidget(self.command_type_select, 1, 1)
+        self.command_summary_label = QLabel("")
+        command_layout.addWidget(self.command_summary_label, 1, 2)
+        
+        self.rtt_plot = pg.PlotWidget(title="Round Trip Time")
+        self.rtt_plot.setLabel('left', 'Commands')
+        self.rtt_plot.setLabel('bottom', 'RTT (ms)')
+        self.rtt_plot.setMaximumHeight(200)
+        self.rtt_bars = None
+        command_layout.addWidget(self.rtt_plot, 2, 0, 1, 3)
+        
+        layout.addWidget(command_group, 3, 0, 1, 2)
+        self.command_status_version = -1
+        
+        self.tabs.addTab(control_widget, "Control Panel")
+    
+    def update_ui(self, level=None):
+        """Update UI with latest telemetry data
+        
+        level limits how many plot panels are redrawn, in plot_panels()
+        order; None redraws them all. Labels and indicators always update.
+        """
+        # One consistent view of the store for the labels and indicators
+        sequence, telemetry, update_time = self.data_store.snapshot()
+        if not telemetry:
+            print("No telemetry received.")
+            return
+        
+        # Prevent plotting until UI is fully ready
+        if not hasattr(self, 'engine_data'):
+            return
+        
+        # Every sample received since the last frame, oldest first
+        samples = self.data_store.consume_samples()
+        if not hasattr(self, 'start_time'):
+            seed = self.history_samples()
+            if seed:
+                samples = seed + [sample for sample in samples if sample[0] > seed[-1][0]]
+            if not samples:
+                samples = [(update_time, telemetry, update_time)]
+            self.start_time = samples[0][self.time_axis]
+            self.time_data = []
+            for key in self.pressure_data:
+                self.pressure_data[key] = []
+            self.engine_data["pressure"] = []
+            for sensor in ["lc_1", "lc_2"]:
+                self.engine_data["load"][sensor] = []
+            self.engine_data["temp"] = []
+            if hasattr(self, 'tank_data'):
+                for key in self.tank_data:
+                    self.tank_data[key] = []
+            self.filtered_data = {name: [] for name in TAB_CHANNELS.get(self.live_tab, [])
+                                  if name in self.filters.channels}
+            self.filters.reset()
+            self.last_plotted = None
+        
+        # Filters run on every sample, at the rate they were designed for;
+        # measurement times give that rate. Only then thin to what the plots keep.
+        filtered = self.filters.process([sample[1] for sample in samples], [sample[2] for sample in samples])
+        kept = self.plot_indices([sample[self.time_axis] for sample in samples])
+        for index in kept:
+            self.append_sample(samples[index][self.time_axis], samples[index][1])
+        for key, values in filtered.items():
+            if key in self.filtered_data:
+                self.filtered_data[key].extend(values[kept].tolist())
+        
+        # Set the max data points to keep
+        MAX_POINTS = PLOT_POINTS
+        
+        # Trim all arrays to MAX_POINTS
+        if len(self.time_data) > MAX_POINTS:
+            self.time_data = self.time_data[-MAX_POINTS:]
+            
+            for key in self.pressure_data:
+                self.pressure_data[key] = self.pressure_data[key][-MAX_POINTS:]
+                
+            self.engine_data["pressure"] = self.engine_data["pressure"][-MAX_POINTS:]
+            for sensor in ["lc_1", "lc_2"]:
+                self.engine_data["load"][sensor] = self.engine_data["load"][sensor][-MAX_POINTS:]
+            self.engine_data["temp"] = self.engine_data["temp"][-MAX_POINTS:]
+            
+            # Trim tank data arrays
+            if hasattr(self, 'tank_data'):
+                self.tank_data["ox_pressure"] = self.tank_data["ox_pressure"][-MAX_POINTS:]
+                self.tank_data["ox_load"] = self.tank_data["ox_load"][-MAX_POINTS:]
+                self.tank_data["fuel_pressure"] = self.tank_data["fuel_pressure"][-MAX_POINTS:]
+                self.tank_data["press_pressure"] = self.tank_data["press_pressure"][-MAX_POINTS:]
+            
+            for key in self.filtered_data:
+                self.filtered_data[key] = self.filtered_data[key][-MAX_POINTS:]
+        
+        # Redraw the plot panels, dropping from the end of the list when the
+        # frame scheduler is over budget
+        for name, update_panel in self.plot_panels()[:level]:
+            update_panel()
+        
+        # Update tank systems numerical displays
+        if hasattr(self, 'tank_data'):
+            ox_pressure = (telemetry["pressure"]["pt_o1_3"] + telemetry["pressure"]["pt_o2_2"]) / 2
+            self.ox_pressure_value.setText(f"{ox_pressure:.1f}")
+            
+            ox_load = (telemetry["load_cells"]["lc_3"] + telemetry["load_cells"]["lc_4"]) / 2
+            self.ox_load_value.setText(f"{ox_load:.1f}")
+            
+            fuel_pressure = (telemetry["pressure"]["pt_f2_4"] + telemetry["pressure"]["pt_f1_5"]) / 2
+            self.fuel_pressure_value.setText(f"{fuel_pressure:.1f}")
+            
+            press_pressure = telemetry["pressure"]["pt_p1_6"]
+            self.press_pressure_value.setText(f"{press_pressure:.1f}")
+        
+        # Update sensor readings display
+        if hasattr(self, 'pressure_labels'):
+            engine_pressure = telemetry["pressure"]["pt_f2_4_engine"]
+            self.pressure_labels["pt_f2_4_engine"].setText(f"{engine_pressure:.1f}")
+            self.avg_pressure_label.setText(f"{engine_pressure:.1f}")
+            
+            load_values = []
+            for sensor in ["lc_1", "lc_2"]:
+                value = telemetry["load_cells"][sensor]
+                self.load_labels[sensor].setText(f"{value:.1f}")
+                load_values.append(value)
+                
+            avg_load = sum(load_values) / len(load_values) if load_values else 0
+            self.avg_load_label.setText(f"{avg_load:.1f}")
+            
+            engine_temp = telemetry["temperature"]["tc_1"]
+            self.temp_labels["tc_1"].setText(f"{engine_temp:.1f}")
+            self.avg_temp_label.setText(f"{engine_temp:.1f}")
+            
+            derived = self.data_store.derived
+            if "burn_phase" in derived:
+                phase = BURN_PHASES[derived["burn_phase"]]
+                self.performance_labels["burn_phase"].setText(phase.replace("_", "-").upper())
+                for key, label in self.performance_labels.items():
+                    if key != "burn_phase":
+                        label.setText(f"{derived[key]:.1f}")
+        
+        # Update status indicators and other UI elements
+        if telemetry["system_status"]["armed"]:
+            self.armed_status.setText("ARMED")
+            self.armed_status.setStyleSheet("background-color: red; padding: 5px; border-radius: 5px;")
+            self.show_control_state(self.arm_button, True, "DISARM SYSTEM")
+            self.start_button.setEnabled(True)
+        else:
+            self.armed_status.setText("SAFE")
+            self.armed_status.setStyleSheet("background-color: green; padding: 5px; border-radius: 5px;")
+            self.show_control_state(self.arm_button, False, "ARM SYSTEM")
+            self.start_button.setEnabled(False)
+        
+        # Update valve state indicators
+        for name, button in (("rvv_o", self.rvv_o_button), ("mpv_p", self.mpv_p_button), ("rvv_f", self.rvv_f_button)):
+            state = telemetry["solenoid_states"][name]
+            if self.show_control_state(button, state, "OPEN" if state else "CLOSED"):
+                button.setStyleSheet("background-color: green;" if state else "")
+        
+        # Update servo position indicators
+        self.show_servo_position(self.dot_ox_value, self.dot_ox_slider, telemetry["servo_positions"]["dot_oxidizer"])
+        self.show_servo_position(self.mpf_f_value, self.mpf_f_slider, telemetry["servo_positions"]["mpf_f"])
+        self.show_servo_position(self.ox_engine_value, self.ox_engine_slider, telemetry["servo_positions"]["oxidizer_engine"])
+        
+        # Update system status text
+        ox_pressure = telemetry["pressure"]["pt_o1_3"]
+        if ox_pressure < 100:
+            self.status_indicators["oxidizer"].setText("LOW PRESSURE")
+            self.status_indicators["oxidizer"].setStyleSheet("color: red;")
+        elif ox_pressure > 700:
+            self.status_indicators["oxidizer"].setText("HIGH PRESSURE")
+            self.status_indicators["oxidizer"].setStyleSheet("color: red;")
+        else:
+            self.status_indicators["oxidizer"].setText("NOMINAL")
+            self.status_indicators["oxidizer"].setStyleSheet("color: green;")
+    
+    def show_control_state(self, button, checked, text):
+        """Reflect telemetry in a control button without sending a command; True if it changed"""
+        if button.isChecked() == checked:
+            return False
+        button.blockSignals(True)
+        button.setChecked(checked)
+        button.blockSignals(False)
+        button.setText(text)
+        return True
+    
+    def show_servo_position(self, spin_box, slider, value):
+        """Reflect telemetry in a servo's spin box and slider without sending a command"""
+        if slider.isSliderDown():
+            return  # the operator is dragging it
+        for widget in (spin_box, slider):
+            widget.blockSignals(True)
+            widget.setValue(value)
+            widget.blockSignals(False)
+    
+    def plot_indices(self, times):
+        """Indices of the samples to plot: a series keeps PLOT_POINTS over PLOT_WINDOW, no more"""
+        spacing = PLOT_WINDOW / PLOT_POINTS
+        kept = []
+        for index, t in enumerate(times):
+            if self.last_plotted is not None and 0 <= t - self.last_plotted < spacing:
+                continue
+            kept.append(index)
+            # Step on a fixed grid so jitter doesn't stretch the spacing; a gap
+            # or a jump back (time axis or source switch) starts it over
+            if self.last_plotted is not None and 0 <= t - self.last_plotted < 2 * spacing:
+                self.last_plotted += spacing
+            else:
+                self.last_plotted = t
+        return kept
+    
+    def append_sample(self, sample_time, telemetry):
+        """Add one received sample to the visible tab's plotted series"""
+        self.time_data.append(sample_time - self.start_time)
+        
+        if self.live_tab == "Overview":
+            for key in self.pressure_data:
+                self.pressure_data[key].append(telemetry["pressure"][key])
+        
+        elif self.live_tab == "Engine":
+            self.engine_data["pressure"].append(telemetry["pressure"]["pt_f2_4_engine"])
+            for sensor in ["lc_1", "lc_2"]:
+                self.engine_data["load"][sensor].append(telemetry["load_cells"][sensor])
+            self.engine_data["temp"].append(telemetry["temperature"]["tc_1"])
+        
+        elif self.live_tab == "Tank Systems" and hasattr(self, 'tank_data'):
+            ox_pressure = (telemetry["pressure"]["pt_o1_3"] + telemetry["pressure"]["pt_o2_2"]) / 2
+            ox_load = (telemetry["load_cells"]["lc_3"] + telemetry["load_cells"]["lc_4"]) / 2
+            fuel_pressure = (telemetry["pressure"]["pt_f2_4"] + telemetry["pressure"]["pt_f1_5"]) / 2
+            press_pressure = telemetry["pressure"]["pt_p1_6"]
+            
+            self.tank_data["ox_pressure"].append(ox_pressure)
+            self.tank_data["ox_load"].append(ox_load)
+            self.tank_data["fuel_pressure"].append(fuel_pressure)
+            self.tank_data["press_pressure"].append(press_pressure)
+    
+    def trace(self, channel, raw):
+        """The series to plot for a channel: filtered when selected, else raw"""
+        if self.show_filtered and channel in self.filtered_data:
+            return self.filtered_data[channel]
+        return raw
+    
+    def tank_trace(self, key, channels):
+        """A tank series, the mean of its channels' filtered series when selected"""
+        if self.show_filtered and all(channel in self.filtered_data for channel in channels):
+            return np.mean([self.filtered_data[channel] for channel in channels], axis=0)
+        return self.tank_data[key]
+    
+    def plot_panels(self):
+        """Plot panels of the visible tab, in priority order; hidden tabs keep no series"""
+        panels = [("Overview", self.update_overview_plot),
+                  ("Engine", self.update_engine_plots),
+                  ("Engine", self.update_spectrum_plot),
+                  ("Tank Systems", self.update_tank_plots)]
+        visible = self.tabs.tabText(self.tabs.currentIndex())
+        return [panel for panel in panels if panel[0] == visible]
+    
+    def history_samples(self):
+        """The last PLOT_WINDOW seconds from the store's history, as (receive time, telemetry, measured time) samples
+        
+        Used to refill the plots after a tab or source switch. Empty if the
+        history lacks any channel the plots or filters read.
+        """
+        history = self.data_store.history
+        channels = history.channels
+        raw = list(history.raw)
+        layout = [(group, name) for group, names in channels.items() for name in names]
+        needed = set(self.filters.channels) | set(TAB_CHANNELS.get(self.live_tab, []))
+        needed -= set(SPECTRAL_OUTPUTS)
+        if not raw or not needed <= {name for _, name in layout}:
+            return []
+        start = raw[-1][0] - PLOT_WINDOW
+        # History keeps receive times; measured times follow them by the link latency
+        shift = self.data_store.clock.latency or 0.0
+        # Every sample, as the filters need; update_ui thins them for the plots
+        samples = []
+        for t, values in raw:
+            if t < start:
+                continue
+            # Skip rows from before a channel was kept, or from a layout change mid-copy
+            if len(values) != len(layout) or any(value != value for value in values):
+                continue
+            telemetry = {group: {} for group in channels}
+            for (group, name), value in zip(layout, values):
+                telemetry[group][name] = value
+            samples.append((t, telemetry, t - shift))
+        return samples
+    
+    def subscribe_display(self):
+        """Subscribe the selected source to the visible tab's channels; other sources feed no plots"""
+        self.live_tab = self.tabs.tabText(self.tabs.currentIndex())
+        channels = TAB_CHANNELS.get(self.live_tab, [])
+        for store in self.data_stores.values():
+            if store is self.data_store:
+                # Every sample: the display filters need the full rate, the plots thin after them
+                store.subscribe("display", channels, rate=None)
+            else:
+                store.subscribe("display", [], rate=0)
+    
+    def select_tab(self, index):
+        """Switch the live subscription and plotted series to the newly visible tab"""
+        self.subscribe_display()
+        if hasattr(self, 'start_time'):
+            del self.start_time
+        self.reset_waterfall()
+        # Each tab has its own panels; the level shed for the old one doesn't apply
+        self.frame_scheduler.set_panel_count(len(self.plot_panels()))
+        self.frame_scheduler.request_frame()
+    
+    def pending_samples(self):
+        """Number of samples not drawn yet; the frame scheduler skips frames at zero"""
+        if not hasattr(self, 'start_time') and self.data_store.latest_telemetry:
+            return 1  # source just switched, draw its latest state
+        return self.data_store.samples.pending()
+    
+    def update_overview_plot(self):
+        window = self.overview_windows[self.overview_window_select.currentText()]
+        if window != 30:
+            self.update_overview_history(window)
+            return
+        
+        for key, curve in self.pressure_curves.items():
+            curve.setData(self.time_data, self.trace(key, self.pressure_data[key]))
+        if len(self.time_data) > 1:
+            current_end = self.time_data[-1]
+            self.pressure_plot.setXRange(current_end - 30, current_end)
+    
+    def update_engine_plots(self):
+        try:
+            self.engine_pressure_curve.setData(self.time_data, self.trace("pt_f2_4_engine", self.engine_data["pressure"]))
+            
+            for sensor in ["lc_1", "lc_2"]:
+                self.engine_load_curves[sensor].setData(self.time_data,
+                                                       self.trace(sensor, self.engine_data["load"][sensor]))
+            
+            self.engine_temp_curve.setData(self.time_data, self.trace("tc_1", self.engine_data["temp"]))
+        except Exception as e:
+            print(f"Engine plot error: {e}")
+        
+        if len(self.time_data) > 1:
+            current_end = self.time_data[-1]
+            x_min = current_end - 30
+            x_max = current_end
+            self.engine_pressure_plot.setXRange(x_min, x_max)
+            self.engine_load_plot.setXRange(x_min, x_max)
+            self.engine_temp_plot.setXRange(x_min, x_max)
+    
+    def reset_waterfall(self, history=200):
+        """Clear the waterfall; it holds the last `history` spectrum frames of every channel"""
+        monitor = self.data_store.spectral
+        self.waterfall = np.zeros((history, len(monitor.channels), monitor.bins), dtype=np.float32)
+        self.waterfall_span = 0.0
+    
+    def update_spectrum_plot(self):
+        monitor = self.data_store.spectral
+        frames = monitor.frames.consume()
+        if frames:
+            # Scroll the new frames in from the right
+            count = min(len(frames), len(self.waterfall))
+            self.waterfall = np.roll(self.waterfall, -count, axis=0)
+            self.waterfall[-count:] = [amplitudes for _, _, amplitudes in frames[-count:]]
+            device_time, rate, _ = frames[-1]
+            if rate:
+                self.waterfall_span = len(self.waterfall) * monitor.hop / rate
+                self.waterfall_bin_hz = rate / monitor.window
+        if not self.waterfall_span:
+            return
+        
+        channel = self.spectrum_channel_select.currentText()
+        index = monitor.channels.index(channel)
+        # Amplitude in dB so small oscillations show beside the large DC level
+        image = 20 * np.log10(self.waterfall[:, index, 1:] + 1e-3)
+        self.spectrum_image.setImage(image, autoLevels=False, levels=(-20, max(float(image.max()), 0.0)))
+        # The DC bin is left out, so the image starts one bin up
+        self.spectrum_image.setRect(QRectF(-self.waterfall_span, self.waterfall_bin_hz, self.waterfall_span,
+                                           self.waterfall_bin_hz * (monitor.bins - 1)))
+        
+        derived = monitor.derived
+        if derived:
+            self.spectrum_peak_label.setText(f"Peak: {derived[channel + '_peak_hz']:.1f} Hz, "
+                                             f"{derived[channel + '_peak_amp']:.2f} PSI")
+    
+    def update_tank_plots(self):
+        if not hasattr(self, 'tank_data'):
+            return
+        try:
+            # Make sure we're using the same time array for all plots
+            self.ox_pressure_curve.setData(self.time_data, self.tank_trace("ox_pressure", ["pt_o1_3", "pt_o2_2"]))
+            self.ox_load_curve.setData(self.time_data, self.tank_trace("ox_load", ["lc_3", "lc_4"]))
+            self.fuel_pressure_curve.setData(self.time_data, self.tank_trace("fuel_pressure", ["pt_f2_4", "pt_f1_5"]))
+            self.press_pressure_curve.setData(self.time_data, self.tank_trace("press_pressure", ["pt_p1_6"]))
+        except Exception as e:
+            print(f"Tank plot error: {e}")
+        
+        # Set x-axis range for all tank plots
+        if len(self.time_data) > 1:
+            current_end = self.time_data[-1]
+            x_min = current_end - 30
+            x_max = current_end
+            self.ox_pressure_plot.setXRange(x_min, x_max)
+            self.ox_load_plot.setXRange(x_min, x_max)
+            self.fuel_pressure_plot.setXRange(x_min, x_max)
+            self.press_pressure_plot.setXRange(x_min, x_max)
+    
+    def update_overview_history(self, window):
+        """Plot the overview pressures from the tiered history store"""
+        history = self.data_store.history
+        oldest, newest = history.time_span()
+        if newest is None:
+            return
+        
+        t_start = oldest if window is None else newest - window
+        # Query only what is held, or a window longer than the session picks the coarsest tier
+        t_first = max(t_start, oldest)
+        width = max(self.pressure_plot.width(), 100)
+        series = {key: history.query(key, t_first, newest, width) for key in self.pressure_curves}
+        if self.show_filtered and history.select_tier(t_first, newest, width) is None:
+            # Rollup means already average over a second or more, far below
+            # the filter cutoffs; only raw samples need the display filters
+            series = self.filter_history(series)
+        # History is kept on receive time; move it onto the live plots' axis
+        origin = self.start_time + self.history_time_shift()
+        for key, curve in self.pressure_curves.items():
+            times, mins, maxs, means = series[key]
+            curve.setData([t - origin for t in times], means)
+        
+        self.pressure_plot.setXRange(t_start - origin, newest - origin)
+    
+    def history_time_shift(self):
+        """Seconds from a history (receive) time back to the plotted time axis
+        
+        Receive time minus device measurement time is the link latency, so
+        on the device axis history shifts by the current latency estimate.
+        """
+        if self.time_axis == 0:
+            return 0.0
+        return self.data_store.clock.latency or 0.0
+    
+    def filter_history(self, series):
+        """Run history queries of raw samples through fresh copies of the display filters"""
+        bank = FilterBank(rate=self.filters.rate)
+        series = dict(series)
+        for index, (group, names, _) in enumerate(bank.groups):
+            if not all(name in series for name in names):
+                continue
+            # The receiver may have appended between queries
+            length = min(len(series[name][0]) for name in names)
+            if not length:
+                continue
+            block = np.array([series[name][3][:length] for name in names])
+            for name, values in zip(names, bank.process_block(index, block)):
+                times, mins, maxs, means = series[name]
+                series[name] = (times[:length], mins[:length], maxs[:length], values)
+        return series
+    
+    def update_connection_status(self):
+        connected = self.data_store.check_connection()
+        if connected:
+            self.connection_status.setText("CONNECTED")
+            self.connection_status.setStyleSheet("background-color: green; padding: 5px; border-radius: 5px;")
+        else:
+            self.connection_status.setText("NOT CONNECTED")
+            self.connection_status.setStyleSheet("background-color: red; padding: 5px; border-radius: 5px;")
+        
+        # Summarize every source so problems on unselected ones are still visible
+        if self.telemetry_receiver:
+            parts = []
+            for status in self.telemetry_receiver.source_status():
+                state = "OK" if status["connected"] else "DOWN"
+                part = f"{status['name']}: {state}, {status['packets_received']} pkts, {status['packets_lost']} lost"
+                if status["latency_ms"] is not None:
+                    part += f", {status['latency_ms']:.1f} ms"
+                parts.append(part)
+            self.link_status.setText(" | ".join(parts))
+        
+        clock = self.data_store.clock.stats()
+        if clock:
+            self.clock_status.setText(f"Latency {clock['latency_ms']:.1f} ms, jitter {clock['jitter_ms']:.1f} ms, "
+                                      f"drift {clock['drift_ppm']:+.0f} ppm")
+            self.clock_status.setToolTip(f"Device clock offset {clock['offset_ms'] / 1000:.3f} s, "
+                                         f"{clock['wraps']} wraps, {clock['samples']} packets")
+        
+        self.update_command_status()
+    
+    def update_command_status(self, force=False):
+        """Show the latest command result and the latency histogram of the selected type"""
+        version, recent, histograms = self.command_tracker.snapshot()
+        if version == self.command_status_version and not force:
+            return
+        self.command_status_version = version
+        
+        if recent:
+            result = recent[-1]
+            ok = result["status"] == "OK"
+            sent_id = f" (#{result['command_id']})" if result["command_id"] is not None else ""
+            self.last_command_label.setText(
+                f"{result['type']} device {result['device_id']} = {result['value']}"
+                f"{sent_id}: {describe_result(result)}")
+            self.last_command_label.setStyleSheet("color: green;" if ok else "color: red;")
+        
+        name = self.command_type_select.currentText()
+        if name not in histograms:
+            return
+        labels, counts, summary = histograms[name]
+        if summary["count"]:
+            self.command_summary_label.setText(
+                f"{summary['count']} acked, mean {summary['mean_ms']:.1f} ms, "
+                f"p95 <= {summary['p95_ms']:.0f} ms, max {summary['max_ms']:.1f} ms, "
+                f"{summary['timeouts']} timeouts, {summary['failures']} failed")
+        else:
+            self.command_summary_label.setText(
+                f"No acks, {summary['timeouts']} timeouts, {summary['failures']} failed")
+        
+        if self.rtt_bars is not None:
+            self.rtt_plot.removeItem(self.rtt_bars)
+        self.rtt_bars = pg.BarGraphItem(x=list(range(len(counts))), height=counts, width=0.8, brush='b')
+        self.rtt_plot.addItem(self.rtt_bars)
+        self.rtt_plot.getAxis('bottom').setTicks([list(enumerate(labels))])
+    
+    def select_source(self, name):
+        """Switch the display to another telemetry source"""
+        if name not in self.data_stores:
+            return
+        self.data_store = self.data_stores[name]
+        self.subscribe_display()
+        
+        # Drop the plotted series so update_ui starts fresh from the new source
+        if hasattr(self, 'start_time'):
+            del self.start_time
+        self.reset_waterfall()
+        self.update_connection_status()
+    
+    def record_event(self, kind, name, detail=None):
+        """Add an event to every source's recording (safe from any thread)"""
+        for store in self.data_stores.values():
+            store.log_event(kind, name, detail)
+    
+    def select_time_axis(self, text):
+        """Switch plots between receive time and device sample time"""
+        # Index into the (receive time, telemetry, measured time) samples
+        self.time_axis = 2 if text == "Device time" else 0
+        if hasattr(self, 'start_time'):
+            del self.start_time
+        self.frame_scheduler.request_frame()
+    
+    def select_filtered(self, checked):
+        """Switch plots between raw and filtered traces; both are already stored"""
+        self.show_filtered = checked
+        self.frame_scheduler.request_frame()
+    
+    def toggle_recording(self, checked):
+        """Handle recording button toggle"""
+        # Recording covers every source, each into its own session files
+        if checked:
+            results = [store.start_recording() for store in self.data_stores.values()]
+            success = any(results)
+            if success:
+                self.record_button.setText("Stop Recording")
+                print("Recording started")
+            else:
+                # If it fails, revert the button state
+                self.record_button.setChecked(False)
+                print("Failed to start recording")
+        else:
+            results = [store.stop_recording() for store in self.data_stores.values()]
+            success = any(results)
+            if success:
+                self.record_button.setText("Start Recording")
+                print("Recording stopped")
+            else:
+                # If it fails, revert the button state
+                self.record_button.setChecked(True)
+                print("Failed to stop recording")
+    
+    def emergency_stop(self):
+        # Implement emergency stop procedure
+        # This should close all valves and safe the system
+        print("EMERGENCY STOP ACTIVATED")
+        self.record_event("operator", "emergency_stop")
+        # Sent at once, in order, ahead of (and dropping) any queued commands
+        self.command_tracker.submit_safety([
+            # Close all valves
+            (0x01, 0x01, 0),  # Close RVV-O
+            (0x01, 0x02, 0),  # Close MPV-P
+            (0x01, 0x03, 0),  # Close RVV-F
+            # Set servos to safe position
+            (0x02, 0x04, 0),  # Close DOT-Oxidizer Servo
+            (0x02, 0x05, 0),  # Close MPF-F Servo
+            (0x02, 0x06, 0),  # Close Oxidizer-Engine Servo
+            # Disarm system
+            (0x04, 0xFF, 0)
+        ], "emergency stop")
+    
+    def toggle_solenoid(self, device_id, bit_mask, state):
+        # Send command to toggle solenoid valve in a separate thread
+        command_value = 1 if state else 0
+        
+        # Update button text immediately - don't wait for response
+        button = self.sender()
+        if button:
+            button.setText("OPEN" if state else "CLOSED")
+            button.setStyleSheet("background-color: green;" if state else "")
+        
+        # Sent on the tracker's worker thread to prevent UI freezing
+        self.command_tracker.submit(0x01, device_id, command_value)
+    
+    def update_servo_value(self, device_id, value):
+        # Send command to update servo position
+        # Don't send on every value change - only when user releases slider
+        sender = self.sender()
+        if isinstance(sender, QSlider) and sender.isSliderDown():
+            return
+        
+        self.command_tracker.submit(0x02, device_id, value)
+    
+    def toggle_arm(self, armed):
+        # Send arm/disarm command
+        command_value = 1 if armed else 0
+        self.record_event("operator", "arm" if armed else "disarm")
+        self.command_tracker.submit(0x04, 0xFF, command_value)
+        
+        if armed:
+            self.arm_button.setText("DISARM SYSTEM")
+            self.start_button.setEnabled(True)
+        else:
+            self.arm_button.setText("ARM SYSTEM")
+            self.start_button.setEnabled(False)
+
+    
+    def start_sequence(self):
+        # Send start sequence command
+        self.record_event("operator", "start")
+        self.command_tracker.submit(0x05, 0xFF, 1)
+    
+    def abort_sequence(self):
+        # Send abort sequence command
+        self.record_event("operator", "abort")
+        # Never waits behind queued commands or an emergency stop in progress
+        self.command_tracker.submit_safety([(0x06, 0xFF, 1)], "abort")
\ No newline at end of file